@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark scripti - Performans ölçümleri
+"""
+import os
+import sys
+import time
+import subprocess
+import json
+import random
+import tempfile
+import statistics
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+
+# Her ölçüm kaç kez tekrarlanacak
+REPEAT = 5
+
+# Başlangıçta yüklenmemesi gereken ağır bağımlılıklar
+HEAVY_MODULES = ["pandas", "selenium", "requests", "bs4", "openpyxl"]
+
+def bench_cold_start(module_name):
+    """
+    Modülün yeni bir Python sürecinde import süresini ölçer
+    Import sonrası hangi ağır bağımlılıkların yüklendiğini de raporlar
+    """
+    code = (
+        "import sys, time\n"
+        "t = time.perf_counter()\n"
+        f"import {module_name}\n"
+        "elapsed = time.perf_counter() - t\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(elapsed, ','.join(heavy))\n"
+    )
+
+    timings = []
+    heavy = ""
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=SRC_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        total = time.perf_counter() - start
+        timings.append((float(output[0]), total))
+        heavy = output[1] if len(output) > 1 else ""
+
+    import_ms = statistics.median(t[0] for t in timings) * 1000
+    process_ms = statistics.median(t[1] for t in timings) * 1000
+    print(f"{module_name:<28} import: {import_ms:7.1f} ms   süreç: {process_ms:7.1f} ms   "
+          f"ağır modüller: {heavy or '-'}")
+
+def _synthetic_snapshot(path, count, seed):
+    """Benchmark için sentetik snapshot dosyası yazar"""
+    rng = random.Random(seed)
+    sizes = ["20x30", "30x40", "40x60", "50x70", "60x90"]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("[\n")
+        for i in range(count):
+            images = [f"https://cdn.dsmcdn.com/ty{i}/prod/{j}_org_zoom.jpg" for j in range(rng.randint(2, 6))]
+            variations = rng.sample(sizes, rng.randint(1, 5))
+            item = {
+                "url": f"https://www.trendyol.com/satici/urun-p-{i}",
+                "title": f"Ürün {i}",
+                "sku": f"SKU{i}",
+                "images": images,
+                "variations": variations,
+                "mockup_images": images[:rng.randint(0, 1)],
+                "missing_sizes": [s for s in sizes if s not in variations],
+                "image_count": len(images),
+            }
+            f.write(("," if i else "") + json.dumps(item, ensure_ascii=False, indent=2) + "\n")
+        f.write("]\n")
+
+def bench_snapshot_diff(count=100000):
+    """İki sentetik snapshot arasındaki diff süresini ölçer"""
+    sys.path.insert(0, SRC_DIR)
+    from snapshot_diff import diff_snapshots, iter_snapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path = os.path.join(tmp, "old.json")
+        new_path = os.path.join(tmp, "new.json")
+        _synthetic_snapshot(old_path, count, seed=1)
+        _synthetic_snapshot(new_path, count, seed=2)
+
+        start = time.perf_counter()
+        changes = sum(1 for _ in diff_snapshots(iter_snapshot(old_path), iter_snapshot(new_path)))
+        elapsed = time.perf_counter() - start
+
+    print(f"{'snapshot diff':<28} {count} ürün x2: {elapsed:6.2f} s   "
+          f"({count * 2 / elapsed:,.0f} ürün/s, {changes} değişiklik)")
+
+def bench_record_memory(count=100000):
+    """Sözlük ve kompakt ProductRecord ile ürün listesinin bellek kullanımını karşılaştırır"""
+    import tracemalloc
+
+    sys.path.insert(0, SRC_DIR)
+    from product_record import ProductRecord, PrefixTable
+
+    def make_item(i):
+        prefix = f"https://cdn.dsmcdn.com/mnresize/1200/1800/ty{i % 300}/prod/QC/2024{i % 12 + 1:02d}20/10/"
+        folder = f"{i * 2654435761 % 2**32:08x}-{i:06d}-4f1b-9c2e-{i * 40503 % 2**16:04x}"
+        images = [f"{prefix}{folder}/{j}_org_zoom.jpg" for j in range(8)]
+        return {
+            "url": f"https://www.trendyol.com/satici/urun-p-{i}",
+            "title": f"Ürün {i}",
+            "sku": f"SKU{i}",
+            "images": images,
+            "variations": ["30x40", "40x60", "50x70"],
+            "mockup_images": images[:2],
+            "missing_sizes": ["20x30", "60x90"],
+            "image_count": len(images),
+        }
+
+    for label, build in [
+        ("dict", lambda: [make_item(i) for i in range(count)]),
+        ("ProductRecord", lambda: [ProductRecord.from_dict(make_item(i), prefix_table) for i in range(count)]),
+    ]:
+        prefix_table = PrefixTable()
+        tracemalloc.start()
+        data = build()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del data
+        print(f"{'bellek: ' + label:<28} {count} ürün: {current / 1024 / 1024:7.1f} MB")
+
+class _SimulatedBackend:
+    """
+    Model maliyetini taklit eden arka uç: çağrı başına sabit ek yük + görsel
+    başına süre (gerçek modellerde gruplamanın kazancı sabit ek yükten gelir)
+    """
+    name = "benchmark-simulated"
+
+    def __init__(self, call_overhead=0.02, per_image=0.002, dim=64):
+        self.call_overhead = call_overhead
+        self.per_image = per_image
+        self.dim = dim
+
+    def embed(self, images):
+        import numpy as np
+        time.sleep(self.call_overhead + self.per_image * len(images))
+        seeds = [int.from_bytes(data[:8].ljust(8, b"\0"), "little") for data in images]
+        return np.stack([np.random.default_rng(seed).standard_normal(self.dim) for seed in seeds])
+
+def _benchmark_images(count):
+    """MOCKUP_MODEL ayarlıysa gerçek görseller, değilse rastgele baytlar"""
+    if not os.environ.get("MOCKUP_MODEL"):
+        return [os.urandom(256) for _ in range(count)]
+    import io
+    from PIL import Image
+    images = []
+    for _ in range(count):
+        buffer = io.BytesIO()
+        Image.frombytes("RGB", (320, 320), os.urandom(320 * 320 * 3)).save(buffer, "PNG")
+        images.append(buffer.getvalue())
+    return images
+
+def bench_mockup_classifier(count=400):
+    """
+    Mockup sınıflandırıcının gruplu ve tekil çıkarımda verim ve gecikmesini ölçer
+    MOCKUP_MODEL ortam değişkeni bir ONNX modeli gösteriyorsa gerçek model,
+    aksi halde sabit maliyetli simülasyon kullanılır
+    """
+    sys.path.insert(0, SRC_DIR)
+    try:
+        import numpy as np
+        from mockup_classifier import MockupClassifier, OnnxEmbeddingBackend
+    except ImportError as e:
+        print(f"{'mockup sınıflandırıcı':<28} atlandı ({e})")
+        return
+
+    model_path = os.environ.get("MOCKUP_MODEL")
+    backend = OnnxEmbeddingBackend(model_path) if model_path else _SimulatedBackend()
+    images = _benchmark_images(count)
+    dim = backend.embed(images[:1]).shape[1]
+    rng = np.random.default_rng(0)
+    prototypes = {"mockup": rng.standard_normal((4, dim)), "regular": rng.standard_normal((4, dim))}
+    print(f"{'model':<28} {backend.name}")
+
+    def run(label, classifier):
+        latencies = []
+        start = time.perf_counter()
+        futures = []
+        for i, data in enumerate(images):
+            submitted = time.perf_counter()
+            future = classifier.submit(f"https://cdn.dsmcdn.com/bench/{i}.jpg", data)
+            future.add_done_callback(lambda _, t=submitted: latencies.append(time.perf_counter() - t))
+            futures.append(future)
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000
+        p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+        stats = classifier.stats()
+        print(f"{label:<28} {count / elapsed:8.1f} görsel/s   p50: {p50:7.1f} ms   p95: {p95:7.1f} ms   "
+              f"ort. grup: {stats['mean_batch_size']}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, batch_size in [("tekil (batch=1)", 1), ("dinamik grup (batch=16)", 16)]:
+            classifier = MockupClassifier(backend, prototypes, cache_dir=None, batch_size=batch_size)
+            run(label, classifier)
+            classifier.close()
+
+        classifier = MockupClassifier(backend, prototypes, cache_dir=tmp)
+        run("önbellek soğuk", classifier)
+        run("önbellek sıcak", classifier)
+        classifier.close()
+
+def main():
+    print("=" * 60)
+    print("BENCHMARK: Soğuk başlangıç (medyan, {} tekrar)".format(REPEAT))
+    print("=" * 60)
+    for module_name in ["image_analyzer", "report_generator", "scraper_selenium_to_excel"]:
+        bench_cold_start(module_name)
+
+    print("=" * 60)
+    print("BENCHMARK: Snapshot diff")
+    print("=" * 60)
+    bench_snapshot_diff()
+
+    print("=" * 60)
+    print("BENCHMARK: Ürün kaydı bellek kullanımı")
+    print("=" * 60)
+    bench_record_memory()
+
+    print("=" * 60)
+    print("BENCHMARK: Mockup sınıflandırıcı (verim ve gecikme)")
+    print("=" * 60)
+    bench_mockup_classifier()
+
+if __name__ == "__main__":
+    main()
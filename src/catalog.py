@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Catalog - İndeksli SQLite Ürün Kataloğu
+=======================================
+
+Taranan ürünler indeksli bir SQLite veritabanında tutulur; "50x70 ölçüsü
+olmayan ama mockup'ı olan ürünler" gibi sorular rapor açmadan veya JSON
+taramadan milisaniyeler içinde cevaplanır.
+
+Tablolar:
+    products       Ürün başına bir satır (ürün anahtarı, sayaçlar, mockup bayrağı, tam kayıt)
+    products_fts   Ürün adları üzerinde FTS5 tam metin indeksi
+    sizes          Ürünün varyasyonlarındaki normalize ölçüler (50 x 70 cm -> 50x70)
+    images         Ürün görselleri, varlık anahtarı ve mockup bayrağı
+
+Ürünler içerik ID'sine göre güncellenir (upsert), katalog çalışmalar boyunca
+birikir. Sorgu sonuçları scraped_products.json şemasındadır ve doğrudan
+generate_excel_report() ile dışa aktarılabilir.
+
+KULLANIM:
+from catalog import Catalog
+
+with Catalog("katalog.db") as catalog:
+    catalog.upsert(results)
+    products = catalog.find(missing_sizes=["50x70"], mockup=True)
+
+python catalog.py katalog.db --missing 50x70 --mockup
+python catalog.py katalog.db --search "kanvas tablo" --has 30x40 -o sonuc.xlsx
+python catalog.py katalog.db --import scraped_products.json
+python catalog.py katalog.db --sql "SELECT size, COUNT(*) AS urun FROM sizes GROUP BY size"
+python catalog.py    # Testler
+"""
+
+import re
+import sys
+import json
+import time
+import sqlite3
+import argparse
+
+try:
+    from .url_utils import product_key, image_asset_key
+except ImportError:
+    from url_utils import product_key, image_asset_key
+
+SCHEMA_VERSION = 1
+
+# Terminal çıktısında gösterilen en fazla satır
+PRINT_LIMIT = 50
+
+# Varyasyon metnindeki ölçü: "50x70", "50 X 70 cm", "50×70", "50*70"
+_SIZE_PATTERN = re.compile(r"(\d+)\s*[x×*]\s*(\d+)", re.IGNORECASE)
+
+# FTS sorgusu için kelimeler
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    product_key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    sku TEXT NOT NULL DEFAULT '',
+    image_count INTEGER NOT NULL DEFAULT 0,
+    mockup_count INTEGER NOT NULL DEFAULT 0,
+    has_mockup INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_has_mockup ON products (has_mockup, id);
+
+CREATE TABLE IF NOT EXISTS sizes (
+    size TEXT NOT NULL,
+    product_id INTEGER NOT NULL,
+    PRIMARY KEY (size, product_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sizes_product ON sizes (product_id);
+
+CREATE TABLE IF NOT EXISTS images (
+    product_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    asset_key TEXT NOT NULL,
+    is_mockup INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (product_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS images_asset ON images (asset_key);
+CREATE INDEX IF NOT EXISTS images_mockup ON images (product_id) WHERE is_mockup;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+    title, tokenize = "unicode61 remove_diacritics 2"
+);
+"""
+
+def normalize_size(text):
+    """
+    Ölçü metnini katalog anahtarına çevirir
+    "50 X 70 cm" -> "50x70"; ölçü kalıbı yoksa küçük harfli metin ("S", "M" gibi)
+    """
+    match = _SIZE_PATTERN.search(str(text))
+    if match:
+        return f"{match.group(1)}x{match.group(2)}"
+    return " ".join(str(text).lower().split())
+
+def variation_sizes(variations):
+    """Varyasyon listesindeki tüm normalize ölçüler"""
+    sizes = set()
+    for variation in variations or ():
+        matches = _SIZE_PATTERN.findall(str(variation))
+        if matches:
+            sizes.update(f"{w}x{h}" for w, h in matches)
+        elif str(variation).strip():
+            sizes.add(normalize_size(variation))
+    return sizes
+
+def fts_query(text):
+    """Serbest metni güvenli FTS5 sorgusuna çevirir (tüm kelimeler, önek eşleşmesi)"""
+    words = _WORD.findall(text or "")
+    return " ".join(f'"{word}"*' for word in words)
+
+class Catalog:
+    """İndeksli SQLite ürün kataloğu"""
+
+    def __init__(self, path="katalog.db"):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    # -------------------------------------------------------------------------
+    # Yazma
+    # -------------------------------------------------------------------------
+
+    def upsert(self, results):
+        """
+        Ürünleri kataloğa ekler veya günceller (tek transaction)
+        Aynı ürün (içerik ID'si) tekrar gelirse satırları yenilenir
+
+        Returns:
+            int: Yazılan ürün sayısı
+        """
+        now = time.time()
+        count = 0
+        with self._conn:
+            for item in results:
+                item = item.to_dict() if hasattr(item, "to_dict") else dict(item)
+                url = item.get("url", "")
+                if not url:
+                    continue
+                images = item.get("images", []) or []
+                mockups = set(item.get("mockup_images", []) or ())
+                mockup_count = len(item.get("mockup_images", []) or ())
+                key = product_key(url)
+
+                self._conn.execute(
+                    "INSERT INTO products (product_key, url, title, sku, image_count, mockup_count,"
+                    " has_mockup, updated_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (product_key) DO UPDATE SET url = excluded.url,"
+                    " title = excluded.title, sku = excluded.sku, image_count = excluded.image_count,"
+                    " mockup_count = excluded.mockup_count, has_mockup = excluded.has_mockup,"
+                    " updated_at = excluded.updated_at, data = excluded.data",
+                    (key, url, item.get("title", "") or "", item.get("sku", "") or "",
+                     item.get("image_count", len(images)) or 0, mockup_count, int(bool(mockup_count)),
+                     now, json.dumps(item, ensure_ascii=False))
+                )
+                product_id = self._conn.execute(
+                    "SELECT id FROM products WHERE product_key = ?", (key,)
+                ).fetchone()[0]
+
+                # Bağlı indeks satırları yeniden yazılır
+                self._conn.execute("DELETE FROM sizes WHERE product_id = ?", (product_id,))
+                self._conn.execute("DELETE FROM images WHERE product_id = ?", (product_id,))
+                self._conn.execute("DELETE FROM products_fts WHERE rowid = ?", (product_id,))
+
+                self._conn.executemany(
+                    "INSERT INTO sizes (size, product_id) VALUES (?, ?)",
+                    [(size, product_id) for size in variation_sizes(item.get("variations"))]
+                )
+                self._conn.executemany(
+                    "INSERT INTO images (product_id, position, url, asset_key, is_mockup)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(product_id, position, img_url, image_asset_key(img_url), int(img_url in mockups))
+                     for position, img_url in enumerate(images)]
+                )
+                self._conn.execute("INSERT INTO products_fts (rowid, title) VALUES (?, ?)",
+                                   (product_id, item.get("title", "") or ""))
+                count += 1
+        return count
+
+    # -------------------------------------------------------------------------
+    # Sorgu
+    # -------------------------------------------------------------------------
+
+    def _where(self, search=None, has_sizes=(), missing_sizes=(), mockup=None,
+               min_images=None, image=None):
+        """Filtrelerden WHERE koşulu ve parametreleri"""
+        conditions = []
+        params = []
+        if search:
+            query = fts_query(search)
+            if query:
+                conditions.append("p.id IN (SELECT rowid FROM products_fts WHERE products_fts MATCH ?)")
+                params.append(query)
+        for size in has_sizes:
+            conditions.append("p.id IN (SELECT product_id FROM sizes WHERE size = ?)")
+            params.append(normalize_size(size))
+        for size in missing_sizes:
+            conditions.append("NOT EXISTS (SELECT 1 FROM sizes s WHERE s.size = ? AND s.product_id = p.id)")
+            params.append(normalize_size(size))
+        if mockup is not None:
+            conditions.append("p.has_mockup = ?")
+            params.append(int(bool(mockup)))
+        if min_images is not None:
+            conditions.append("p.image_count >= ?")
+            params.append(min_images)
+        if image:
+            conditions.append("p.id IN (SELECT product_id FROM images WHERE asset_key = ?)")
+            params.append(image_asset_key(image))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def find(self, search=None, has_sizes=(), missing_sizes=(), mockup=None,
+             min_images=None, image=None, limit=None):
+        """
+        Filtrelere uyan ürünler (scraped_products.json şemasında, ekleme sırasıyla)
+
+        Args:
+            search (str): Ürün adında geçen kelimeler (FTS5, önek eşleşmesi)
+            has_sizes (list): Hepsi bulunması gereken ölçüler
+            missing_sizes (list): Hiçbiri bulunmaması gereken ölçüler
+            mockup (bool): True: mockup'ı olan, False: olmayan ürünler
+            min_images (int): En az görsel sayısı
+            image (str): Bu görseli (herhangi bir boyut varyantını) kullanan ürünler
+            limit (int): En fazla sonuç
+
+        Returns:
+            list: Ürün sözlükleri
+        """
+        where, params = self._where(search, has_sizes, missing_sizes, mockup, min_images, image)
+        sql = f"SELECT p.data FROM products p{where} ORDER BY p.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row[0]) for row in self._conn.execute(sql, params)]
+
+    def count(self, search=None, has_sizes=(), missing_sizes=(), mockup=None,
+              min_images=None, image=None):
+        """find() ile aynı filtrelere uyan ürün sayısı"""
+        where, params = self._where(search, has_sizes, missing_sizes, mockup, min_images, image)
+        return self._conn.execute(f"SELECT COUNT(*) FROM products p{where}", params).fetchone()[0]
+
+    def sql(self, query, params=()):
+        """Serbest SQL sorgusu; satırlar kolon adı -> değer sözlükleri olarak döner"""
+        return [dict(row) for row in self._conn.execute(query, params)]
+
+    def close(self):
+        self._conn.close()
+
+def update_catalog(results, path="katalog.db"):
+    """Sonuçları kataloğa yazar (tarama ve reparse sonrası çağrılır)"""
+    try:
+        with Catalog(path) as catalog:
+            written = catalog.upsert(results)
+            total = len(catalog)
+        print(f"🗂️ Katalog güncellendi: {path} ({written} ürün yazıldı, toplam {total})")
+    except sqlite3.Error as e:
+        print(f"❌ Katalog güncellenemedi: {e}")
+
+def print_products(products, elapsed, total):
+    """Sorgu sonucunu terminale tablo olarak yazar"""
+    for item in products[:PRINT_LIMIT]:
+        title = item.get("title", "") or ""
+        if len(title) > 50:
+            title = title[:50] + "..."
+        sizes = ", ".join(sorted(variation_sizes(item.get("variations")))) or "-"
+        mockups = len(item.get("mockup_images", []) or ())
+        print(f"  {title:<53} ölçüler: {sizes:<30} mockup: {mockups}  {item.get('url', '')}")
+    if total > PRINT_LIMIT:
+        print(f"  ... ve {total - PRINT_LIMIT} ürün daha")
+    print(f"🔎 {total} ürün bulundu ({elapsed * 1000:.1f} ms)")
+
+def main(argv=None, prog=None):
+    """Katalog sorgu komut satırı"""
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="İndeksli ürün kataloğunu sorgular (ölçü, mockup, ad araması)"
+    )
+    parser.add_argument("database", nargs="?", default="katalog.db", help="Katalog veritabanı")
+    parser.add_argument("--import", dest="import_files", nargs="+", default=None, metavar="JSON",
+                        help="scraped_products.json dosyalarını kataloğa ekle")
+    parser.add_argument("-s", "--search", default=None, help="Ürün adında geçen kelimeler")
+    parser.add_argument("--has", nargs="+", default=[], metavar="OLCU", help="Bulunması gereken ölçüler")
+    parser.add_argument("--missing", nargs="+", default=[], metavar="OLCU", help="Eksik olması gereken ölçüler")
+    mockup = parser.add_mutually_exclusive_group()
+    mockup.add_argument("--mockup", dest="mockup", action="store_const", const=True, default=None,
+                        help="Sadece mockup'ı olan ürünler")
+    mockup.add_argument("--no-mockup", dest="mockup", action="store_const", const=False,
+                        help="Sadece mockup'ı olmayan ürünler")
+    parser.add_argument("--min-images", type=int, default=None, help="En az görsel sayısı")
+    parser.add_argument("--image", default=None, metavar="URL", help="Bu görseli kullanan ürünler")
+    parser.add_argument("--limit", type=int, default=None, help="En fazla sonuç")
+    parser.add_argument("--sql", default=None, help="Serbest SQL sorgusu (filtreler yerine)")
+    parser.add_argument("-o", "--output", default=None, metavar="DOSYA",
+                        help="Sonucu dışa aktar (.xlsx: Excel raporu, .json: ürün listesi)")
+    args = parser.parse_args(argv)
+
+    with Catalog(args.database) as catalog:
+        if args.import_files:
+            for filename in args.import_files:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    written = catalog.upsert(json.load(f))
+                print(f"📥 {written} ürün kataloğa eklendi: {filename}")
+            if not (args.search or args.has or args.missing or args.mockup is not None
+                    or args.min_images is not None or args.image or args.sql):
+                print(f"🗂️ Katalogda {len(catalog)} ürün var")
+                return
+
+        start = time.perf_counter()
+        if args.sql:
+            try:
+                rows = catalog.sql(args.sql)
+            except sqlite3.Error as e:
+                print(f"❌ SQL hatası: {e}")
+                return
+            elapsed = time.perf_counter() - start
+            for row in rows[:PRINT_LIMIT]:
+                print("  " + "  ".join(f"{key}={value}" for key, value in row.items()))
+            print(f"🔎 {len(rows)} satır ({elapsed * 1000:.1f} ms)")
+        else:
+            rows = catalog.find(args.search, args.has, args.missing, args.mockup,
+                                args.min_images, args.image, args.limit)
+            elapsed = time.perf_counter() - start
+            print_products(rows, elapsed, len(rows))
+
+    if args.output and rows:
+        if args.output.endswith(".json"):
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(rows, f, ensure_ascii=False, indent=2)
+            print(f"💾 Sorgu sonucu kaydedildi: {args.output}")
+        elif args.sql:
+            try:
+                from .report_generator import export_query_result
+            except ImportError:
+                from report_generator import export_query_result
+            export_query_result(rows, args.output, query=args.sql)
+        else:
+            try:
+                from .report_generator import generate_excel_report
+            except ImportError:
+                from report_generator import generate_excel_report
+            generate_excel_report(rows, args.output)
+
+# ============================================================================
+# TEST
+# ============================================================================
+
+def test_catalog():
+    """Upsert, ölçü normalizasyonu, FTS araması, mockup ve görsel filtresi testleri"""
+    import os
+    import tempfile
+
+    print("🧪 Katalog testleri:")
+    cdn = "https://cdn.dsmcdn.com"
+    products = [
+        {
+            "url": "https://www.trendyol.com/marka/kanvas-tablo-p-101",
+            "title": "Kanvas Tablo Çiçek", "sku": "KT1",
+            "images": [f"{cdn}/ty1/prod/a_org_zoom.jpg", f"{cdn}/ty1/prod/oda.jpg"],
+            "mockup_images": [f"{cdn}/ty1/prod/oda.jpg"],
+            "variations": ["50 X 70 cm", "30x40"], "image_count": 2,
+        },
+        {
+            "url": "https://www.trendyol.com/marka/poster-p-202",
+            "title": "Manzara Poster", "sku": "P2",
+            "images": [f"{cdn}/ty2/prod/b_org_zoom.jpg"], "mockup_images": [],
+            "variations": ["30 x 40 cm"], "image_count": 1,
+        },
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        with Catalog(os.path.join(directory, "katalog.db")) as catalog:
+            catalog.upsert(products)
+            # Aynı ürün farklı URL ile tekrar gelir: satır güncellenir, eklenmez
+            updated = dict(products[1], url=products[1]["url"] + "?boutiqueId=61",
+                           title="Manzara Poster Yeni", variations=["50x70"])
+            catalog.upsert([updated])
+
+            test_cases = [
+                ("ölçü normalizasyonu", [normalize_size("50 X 70 cm"), normalize_size("50x70")],
+                 ["50x70", "50x70"]),
+                ("upsert tekrarı ürün eklemez", len(catalog), 2),
+                ("upsert kaydı günceller", [p["title"] for p in catalog.find(search="manzara")],
+                 ["Manzara Poster Yeni"]),
+                ("eski ölçüler silinir", catalog.count(has_sizes=["30x40"]), 1),
+                ("has ölçü (50 X 70 cm)", [p["sku"] for p in catalog.find(has_sizes=["50 X 70 cm"])],
+                 ["KT1", "P2"]),
+                ("missing ölçü (30x40)", [p["sku"] for p in catalog.find(missing_sizes=["30 x 40"])],
+                 ["P2"]),
+                ("FTS önek araması", [p["sku"] for p in catalog.find(search="kanv")], ["KT1"]),
+                ("FTS aksansız arama", [p["sku"] for p in catalog.find(search="cicek")], ["KT1"]),
+                ("mockup olan", [p["sku"] for p in catalog.find(mockup=True)], ["KT1"]),
+                ("mockup olmayan", [p["sku"] for p in catalog.find(mockup=False)], ["P2"]),
+                ("mockup + missing", catalog.count(missing_sizes=["50x70"], mockup=True), 0),
+                ("görsel varlık anahtarı (boyut varyantı)",
+                 [p["sku"] for p in catalog.find(image=f"{cdn}/mnresize/400/-/ty1/prod/a.jpg")], ["KT1"]),
+                ("bilinmeyen görsel", catalog.count(image=f"{cdn}/ty9/prod/x.jpg"), 0),
+            ]
+
+    for name, result, expected in test_cases:
+        status = "✅" if result == expected else "❌"
+        print(f"{status} {name}: {result!r} (beklenen: {expected!r})")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 1:
+        test_catalog()
+    else:
+        main()
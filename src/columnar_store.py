@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Columnar Store - Parquet Depolama Modülü
+========================================
+
+Scraping sonuçlarını normalize edilmiş Parquet tabloları olarak saklar:
+
+- products.parquet:      product_id, url, title, sku, image_count, ...
+- images.parquet:        product_id, position, url, is_mockup
+- variations.parquet:    product_id, size
+- missing_sizes.parquet: product_id, size
+
+URL ve ölçü kolonları dictionary-encoded yazılır. Okurken sadece gereken
+kolonlar okunur ve filtreler (predicate pushdown) Parquet seviyesine iletilir.
+Excel raporu ve ölçü analizleri ürün sözlükleri oluşturmadan doğrudan
+kolonlardan hesaplanır (report_table, report_aggregate).
+
+Opsiyonel bağımlılık: pyarrow (pip install pyarrow)
+
+KULLANIM:
+from columnar_store import save_results_to_parquet, load_results_from_parquet
+
+save_results_to_parquet(results, "veri")
+results = load_results_from_parquet("veri", fields=REPORT_FIELDS,
+                                    filters=[("missing_count", ">", 0)])
+counts = missing_size_counts("veri", ["50x70"])
+"""
+
+import os
+import sys
+import json
+
+try:
+    from .report_aggregates import ReportAggregate, AGGREGATE_VERSION, MAX_SIZE_LENGTH, TITLE_PREVIEW_LENGTH
+except ImportError:
+    from report_aggregates import ReportAggregate, AGGREGATE_VERSION, MAX_SIZE_LENGTH, TITLE_PREVIEW_LENGTH
+
+# Tablo dosya adları
+TABLES = {
+    "products": "products.parquet",
+    "images": "images.parquet",
+    "variations": "variations.parquet",
+    "missing_sizes": "missing_sizes.parquet",
+}
+
+# Sözlükte (JSON şemasında) bulunan alanlar
+ALL_FIELDS = [
+    "url", "title", "sku", "images", "variations",
+    "mockup_images", "missing_sizes", "image_count"
+]
+
+# Excel raporunun ihtiyaç duyduğu alanlar (tüm görsel URL'leri gerekmez)
+REPORT_FIELDS = [
+    "url", "title", "sku", "variations",
+    "mockup_images", "missing_sizes", "image_count"
+]
+
+# products tablosundan doğrudan okunan alanlar
+_PRODUCT_COLUMNS = ["url", "title", "sku", "image_count"]
+
+# Sadece mockup olarak işaretlenmiş (görsel listesinde olmayan) satırların pozisyonu
+_MOCKUP_ONLY_POSITION = -1
+
+def _require_pyarrow():
+    """pyarrow modüllerini import eder, yoksa anlaşılır bir hata verir"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Parquet depolama için pyarrow gerekli: pip install pyarrow"
+        ) from e
+    return pa, pq
+
+def _dictionary_array(pa, values):
+    """String listesini dictionary-encoded Arrow dizisine çevirir"""
+    return pa.array(values, type=pa.string()).dictionary_encode()
+
+def save_results_to_parquet(results, directory="veri"):
+    """
+    Sonuçları normalize edilmiş Parquet tabloları olarak kaydeder
+
+    Args:
+        results (list): Scraping sonuçları listesi
+        directory (str): Tabloların yazılacağı klasör
+    """
+    pa, pq = _require_pyarrow()
+    os.makedirs(directory, exist_ok=True)
+
+    products = {
+        "product_id": [], "url": [], "title": [], "sku": [], "image_count": [],
+        "mockup_count": [], "variation_count": [], "missing_count": []
+    }
+    images = {"product_id": [], "position": [], "url": [], "is_mockup": []}
+    variations = {"product_id": [], "size": []}
+    missing = {"product_id": [], "size": []}
+
+    for product_id, item in enumerate(results, 1):
+        image_urls = item.get("images", [])
+        mockup_urls = item.get("mockup_images", [])
+        variation_list = item.get("variations", [])
+        missing_list = item.get("missing_sizes", [])
+
+        products["product_id"].append(product_id)
+        products["url"].append(item.get("url", ""))
+        products["title"].append(item.get("title", ""))
+        products["sku"].append(item.get("sku", ""))
+        products["image_count"].append(item.get("image_count", 0))
+        products["mockup_count"].append(len(mockup_urls))
+        products["variation_count"].append(len(variation_list))
+        products["missing_count"].append(len(missing_list))
+
+        # Aynı URL görsel listesinde birden fazla geçse de mockup olarak
+        # sadece ilk geçtiği satır işaretlenir (okurken tekrar oluşmasın)
+        unmarked = set(mockup_urls)
+        for position, img_url in enumerate(image_urls):
+            images["product_id"].append(product_id)
+            images["position"].append(position)
+            images["url"].append(img_url)
+            images["is_mockup"].append(img_url in unmarked)
+            unmarked.discard(img_url)
+
+        # Görsel listesinde olmayan mockup URL'leri kaybolmasın
+        for img_url in mockup_urls:
+            if img_url in unmarked:
+                unmarked.discard(img_url)
+                images["product_id"].append(product_id)
+                images["position"].append(_MOCKUP_ONLY_POSITION)
+                images["url"].append(img_url)
+                images["is_mockup"].append(True)
+
+        for size in variation_list:
+            variations["product_id"].append(product_id)
+            variations["size"].append(size)
+
+        for size in missing_list:
+            missing["product_id"].append(product_id)
+            missing["size"].append(size)
+
+    tables = {
+        "products": pa.table({
+            "product_id": pa.array(products["product_id"], type=pa.int32()),
+            "url": _dictionary_array(pa, products["url"]),
+            "title": pa.array(products["title"], type=pa.string()),
+            "sku": pa.array(products["sku"], type=pa.string()),
+            "image_count": pa.array(products["image_count"], type=pa.int32()),
+            "mockup_count": pa.array(products["mockup_count"], type=pa.int32()),
+            "variation_count": pa.array(products["variation_count"], type=pa.int32()),
+            "missing_count": pa.array(products["missing_count"], type=pa.int32()),
+        }),
+        "images": pa.table({
+            "product_id": pa.array(images["product_id"], type=pa.int32()),
+            "position": pa.array(images["position"], type=pa.int32()),
+            "url": _dictionary_array(pa, images["url"]),
+            "is_mockup": pa.array(images["is_mockup"], type=pa.bool_()),
+        }),
+        "variations": pa.table({
+            "product_id": pa.array(variations["product_id"], type=pa.int32()),
+            "size": _dictionary_array(pa, variations["size"]),
+        }),
+        "missing_sizes": pa.table({
+            "product_id": pa.array(missing["product_id"], type=pa.int32()),
+            "size": _dictionary_array(pa, missing["size"]),
+        }),
+    }
+
+    for name, table in tables.items():
+        pq.write_table(table, os.path.join(directory, TABLES[name]), compression="zstd")
+
+    print(f"💾 Sonuçlar Parquet tablolarına kaydedildi: {directory} ({len(results)} ürün)")
+
+def read_table(directory, name, columns=None, filters=None):
+    """
+    Tek bir tabloyu sadece istenen kolonlarla okur
+
+    Args:
+        directory (str): Parquet klasörü
+        name (str): Tablo adı ("products", "images", "variations", "missing_sizes")
+        columns (list): Okunacak kolonlar (None = hepsi)
+        filters (list): pyarrow filtreleri, örn. [("size", "in", ["30x40"])]
+
+    Returns:
+        pyarrow.Table
+    """
+    _, pq = _require_pyarrow()
+    return pq.read_table(os.path.join(directory, TABLES[name]), columns=columns, filters=filters)
+
+def _group_by_product(table, value_column):
+    """(product_id, değer) tablosunu {product_id: [değerler]} sözlüğüne çevirir"""
+    grouped = {}
+    product_ids = table.column("product_id").to_pylist()
+    values = table.column(value_column).to_pylist()
+    for product_id, value in zip(product_ids, values):
+        grouped.setdefault(product_id, []).append(value)
+    return grouped
+
+def _linked_filter(product_ids, filters):
+    """
+    Ürün filtresi verildiyse bağlı tabloları (images, variations,
+    missing_sizes) aynı ürünlerle sınırlayan filtre, yoksa boş liste
+    """
+    if not filters:
+        return []
+    return [("product_id", "in", product_ids)]
+
+def _filtered_product_ids(directory, filters):
+    """Filtreye uyan ürünlerin ID'leri (sadece product_id kolonu okunur)"""
+    if not filters:
+        return None
+    return read_table(directory, "products", columns=["product_id"],
+                      filters=filters).column("product_id").to_pylist()
+
+def load_results_from_parquet(directory="veri", fields=None, filters=None):
+    """
+    Parquet tablolarından sonuç listesini (JSON şemasıyla) yeniden oluşturur
+    Sadece istenen alanların tabloları/kolonları okunur
+
+    Args:
+        directory (str): Parquet klasörü
+        fields (list): İstenen alanlar (None = ALL_FIELDS)
+        filters (list): products tablosuna uygulanacak pyarrow filtreleri
+            (pq.read_table'a iletilir), örn. [("missing_count", ">", 0)]
+
+    Returns:
+        list: Ürün sözlükleri
+    """
+    fields = ALL_FIELDS if fields is None else fields
+
+    product_columns = ["product_id"] + [f for f in _PRODUCT_COLUMNS if f in fields]
+    products = read_table(directory, "products", columns=product_columns, filters=filters)
+    product_ids = products.column("product_id").to_pylist()
+
+    # Ürün filtresi varsa diğer tablolar da sadece bu ürünler için okunur
+    id_filter = _linked_filter(product_ids, filters)
+
+    images = {}
+    mockups = {}
+    if "images" in fields:
+        table = read_table(
+            directory, "images", columns=["product_id", "position", "url"],
+            filters=id_filter + [("position", ">=", 0)]
+        )
+        table = table.sort_by([("product_id", "ascending"), ("position", "ascending")])
+        images = _group_by_product(table, "url")
+    if "mockup_images" in fields:
+        table = read_table(
+            directory, "images", columns=["product_id", "position", "url"],
+            filters=id_filter + [("is_mockup", "==", True)]
+        )
+        # Görsel listesindeki sırayı koru, listede olmayanlar sona eklenir
+        rows = sorted(
+            zip(table.column("product_id").to_pylist(),
+                table.column("position").to_pylist(),
+                table.column("url").to_pylist()),
+            key=lambda row: (row[0], row[1] == _MOCKUP_ONLY_POSITION)
+        )
+        for product_id, _, img_url in rows:
+            mockups.setdefault(product_id, []).append(img_url)
+
+    variations = {}
+    if "variations" in fields:
+        table = read_table(directory, "variations", columns=["product_id", "size"],
+                           filters=id_filter or None)
+        variations = _group_by_product(table, "size")
+
+    missing = {}
+    if "missing_sizes" in fields:
+        table = read_table(directory, "missing_sizes", columns=["product_id", "size"],
+                           filters=id_filter or None)
+        missing = _group_by_product(table, "size")
+
+    columns = {name: products.column(name).to_pylist() for name in product_columns}
+    results = []
+    for index, product_id in enumerate(product_ids):
+        item = {}
+        for field in fields:
+            if field in _PRODUCT_COLUMNS:
+                item[field] = columns[field][index]
+            elif field == "images":
+                item[field] = images.get(product_id, [])
+            elif field == "mockup_images":
+                item[field] = mockups.get(product_id, [])
+            elif field == "variations":
+                item[field] = variations.get(product_id, [])
+            elif field == "missing_sizes":
+                item[field] = missing.get(product_id, [])
+        results.append(item)
+
+    return results
+
+def _product_counts_by_size(table):
+    """(product_id, size) tablosundan {ölçü: farklı ürün sayısı}"""
+    pa, _ = _require_pyarrow()
+    table = pa.table({
+        "product_id": table.column("product_id"),
+        "size": table.column("size").cast(pa.string()),
+    })
+    grouped = table.group_by("size").aggregate([("product_id", "count_distinct")])
+    return dict(zip(grouped.column("size").to_pylist(),
+                    grouped.column("product_id_count_distinct").to_pylist()))
+
+def missing_size_counts(directory, sizes=None, filters=None):
+    """
+    Ölçülerin eksik olduğu ürün sayılarını döndürür
+    Sadece missing_sizes tablosunun product_id/size kolonları okunur, ölçü
+    filtresi Parquet'e iletilir
+
+    Args:
+        directory (str): Parquet klasörü
+        sizes (list): Sayılacak ölçüler (None = tüm eksik ölçüler)
+        filters (list): products tablosuna uygulanacak pyarrow filtreleri
+
+    Returns:
+        dict: {ölçü: eksik ürün sayısı}
+    """
+    product_ids = _filtered_product_ids(directory, filters)
+    conditions = _linked_filter(product_ids, filters)
+    if sizes is not None:
+        conditions.append(("size", "in", list(sizes)))
+    table = read_table(directory, "missing_sizes", columns=["product_id", "size"],
+                       filters=conditions or None)
+    counts = _product_counts_by_size(table)
+    if sizes is None:
+        return counts
+    return {size: counts.get(size, 0) for size in sizes}
+
+def size_product_counts(directory, filters=None):
+    """
+    Her ölçü için o ölçüye sahip farklı ürün sayısını döndürür
+    Ölçüler büyük/küçük harften bağımsız sayılır (rapordaki gibi);
+    sadece variations tablosunun product_id/size kolonları okunur
+
+    Returns:
+        dict: {ölçü (küçük harf): ürün sayısı}
+    """
+    import pyarrow.compute as pc
+
+    product_ids = _filtered_product_ids(directory, filters)
+    table = read_table(directory, "variations", columns=["product_id", "size"],
+                       filters=_linked_filter(product_ids, filters) or None)
+    table = table.set_column(1, "size", pc.utf8_lower(table.column("size").cast("string")))
+    return _product_counts_by_size(table)
+
+def _size_labels(directory, product_ids, filters):
+    """Gerçek ölçü analizinde gösterilen farklı ölçü adları"""
+    import pyarrow.compute as pc
+
+    table = read_table(directory, "variations", columns=["product_id", "size"],
+                       filters=_linked_filter(product_ids, filters) or None)
+    labels = pc.unique(table.column("size").cast("string")).to_pylist()
+    return {label.strip() for label in labels if len(label.strip()) < MAX_SIZE_LENGTH}
+
+def report_aggregate(directory, filters=None):
+    """
+    Rapor özet sayfalarının durumunu (ReportAggregate) doğrudan kolonlardan
+    hesaplar; ürün sözlükleri oluşturulmaz, görsel tablosu okunmaz
+
+    Args:
+        directory (str): Parquet klasörü
+        filters (list): products tablosuna uygulanacak pyarrow filtreleri
+
+    Returns:
+        ReportAggregate
+    """
+    import pyarrow.compute as pc
+
+    products = read_table(directory, "products", filters=filters, columns=[
+        "product_id", "title", "sku", "image_count", "mockup_count",
+        "variation_count", "missing_count"
+    ])
+    product_ids = products.column("product_id").to_pylist()
+    sku = products.column("sku")
+    image_counts = products.column("image_count").to_pylist()
+    mockup_counts = products.column("mockup_count").to_pylist()
+
+    def positive(name):
+        return pc.sum(pc.greater(products.column(name), 0)).as_py() or 0
+
+    titles = []
+    for title in products.column("title").to_pylist():
+        title = title or ""
+        titles.append(title[:TITLE_PREVIEW_LENGTH] + "..." if len(title) > TITLE_PREVIEW_LENGTH else title)
+
+    return ReportAggregate.from_dict({
+        "aggregate_version": AGGREGATE_VERSION,
+        "total_products": products.num_rows,
+        "sku_count": pc.sum(pc.and_(pc.not_equal(sku, ""),
+                                    pc.not_equal(sku, "SKU Bulunamadı"))).as_py() or 0,
+        "variation_count": positive("variation_count"),
+        "missing_sizes_count": positive("missing_count"),
+        "total_images": sum(image_counts),
+        "total_mockups": sum(mockup_counts),
+        "missing_by_size": missing_size_counts(directory, filters=filters),
+        "size_presence": size_product_counts(directory, filters=filters),
+        "size_labels": sorted(_size_labels(directory, product_ids, filters)),
+        "mockup_rows": list(zip(titles, image_counts, mockup_counts)),
+    })
+
+def report_table(directory, filters=None):
+    """
+    Ana rapor sayfası için ürün başına bir satırlık Arrow tablosu
+    Varyasyon ve eksik ölçü listeleri Arrow içinde ", " ile birleştirilir
+    (ürün sözlüğü oluşturulmaz, görsel tablosu okunmaz)
+
+    Returns:
+        pyarrow.Table: url, title, sku, image_count, mockup_count,
+        variation_count, variations, missing_sizes (liste yoksa null)
+    """
+    import pyarrow.compute as pc
+
+    products = read_table(directory, "products", filters=filters, columns=[
+        "product_id", "url", "title", "sku", "image_count", "mockup_count", "variation_count"
+    ])
+    id_filter = _linked_filter(products.column("product_id").to_pylist(), filters)
+    for name in ("variations", "missing_sizes"):
+        table = read_table(directory, name, columns=["product_id", "size"], filters=id_filter or None)
+        table = table.set_column(1, "size", table.column("size").cast("string"))
+        # Tek thread: grup içi sıra kayıttaki sırayla aynı kalır
+        grouped = table.group_by("product_id", use_threads=False).aggregate([("size", "list")])
+        joined = grouped.set_column(1, name, pc.binary_join(grouped.column("size_list"), ", "))
+        products = products.join(joined, "product_id", join_type="left outer")
+    products = products.sort_by("product_id")
+    return products.select(["url", "title", "sku", "image_count", "mockup_count",
+                            "variation_count", "variations", "missing_sizes"])
+
+def is_parquet_store(path):
+    """Verilen yolun Parquet tablo klasörü olup olmadığını kontrol eder"""
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, TABLES["products"]))
+
+# ============================================================================
+# TEST
+# ============================================================================
+
+def test_parquet_roundtrip():
+    """Kaydet/oku turunda alanların (tekrarlanan görsel URL'leri dahil) korunduğu testler"""
+    import tempfile
+
+    print("🧪 Parquet kaydet/oku testleri:")
+    results = [
+        {
+            "url": "https://www.trendyol.com/marka/poster-p-1", "title": "Poster", "sku": "P1",
+            "images": ["https://cdn/a.jpg", "https://cdn/b.jpg", "https://cdn/a.jpg"],
+            "mockup_images": ["https://cdn/a.jpg"],
+            "variations": ["50x70", "30x40"], "missing_sizes": ["70x100"], "image_count": 3,
+        },
+        {
+            "url": "https://www.trendyol.com/marka/tablo-p-2", "title": "Tablo", "sku": "P2",
+            "images": ["https://cdn/c.jpg", "https://cdn/c.jpg"],
+            "mockup_images": ["https://cdn/c.jpg", "https://cdn/oda.jpg"],
+            "variations": [], "missing_sizes": [], "image_count": 2,
+        },
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        save_results_to_parquet(results, directory)
+        loaded = load_results_from_parquet(directory)
+        report = load_results_from_parquet(directory, fields=REPORT_FIELDS)
+        filtered = load_results_from_parquet(directory, filters=[("missing_count", ">", 0)])
+        aggregate = report_aggregate(directory).to_dict()
+        expected_aggregate = ReportAggregate.from_results(results).to_dict()
+        table = report_table(directory).to_pylist()
+
+        test_cases = [
+            ("tüm alanlar", loaded, results),
+            ("tekrarlanan görsel URL'leri", loaded[0]["images"], results[0]["images"]),
+            ("mockup tekrarlanmaz", loaded[0]["mockup_images"], ["https://cdn/a.jpg"]),
+            ("listede olmayan mockup", loaded[1]["mockup_images"], results[1]["mockup_images"]),
+            ("rapor alanları", [sorted(item) for item in report], [sorted(REPORT_FIELDS)] * 2),
+            ("Parquet klasörü", is_parquet_store(directory), True),
+            ("filtre (pushdown)", filtered, results[:1]),
+            ("eksik ölçü sayıları", missing_size_counts(directory, ["70x100", "30x40"]),
+             {"70x100": 1, "30x40": 0}),
+            ("ölçü ürün sayıları", size_product_counts(directory), {"50x70": 1, "30x40": 1}),
+            ("kolon bazlı özet", aggregate, expected_aggregate),
+            ("rapor tablosu listeleri", [(row["variations"], row["missing_sizes"]) for row in table],
+             [("50x70, 30x40", "70x100"), (None, None)]),
+        ]
+
+    for name, result, expected in test_cases:
+        status = "✅" if result == expected else "❌"
+        print(f"{status} {name}: {result!r} (beklenen: {expected!r})")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 1:
+        test_parquet_roundtrip()
+        sys.exit(0)
+
+    # JSON -> Parquet dönüştürme
+    if len(sys.argv) < 3:
+        print("Kullanım: python columnar_store.py scraped_products.json veri/")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        save_results_to_parquet(json.load(f), sys.argv[2])
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Driver Health - Tarayıcı Sağlık Takibi ve Yenileme
+==================================================
+
+Uzun Selenium oturumlarında Chrome'un bellek kullanımı artar ve sayfalar
+yavaşlar/çöker. ManagedDriver, driver'ı sarmalayarak sunulan sayfa sayısını,
+tarayıcı bellek kullanımını ve ardışık hata sayısını takip eder; eşikler
+aşıldığında driver'ı sayfalar arasında şeffaf şekilde yeniler.
+
+Bellek, chromedriver süreç ağacının (Chrome, renderer ve GPU süreçleri) RSS
+toplamı olarak ölçülür. psutil kurulu değilse aktif sekmenin JS heap'i
+(performance.memory) kullanılır.
+
+Bellek ölçümleri ve yenileme olayları JSONL metrik dosyasına yazılır. Aynı
+dosyaya birden fazla tarayıcı yazıyorsa (ör. link üreticisi ve ürün işleyici)
+her satır driver etiketiyle ayırt edilir.
+
+Opsiyonel bağımlılık: psutil (pip install psutil)
+
+KULLANIM:
+from driver_health import ManagedDriver
+
+driver = ManagedDriver(init_driver, max_pages=500)
+driver.get(url)            # Normal Selenium driver gibi kullanılır
+driver.record_success()
+driver.check_health()      # Gerekirse driver'ı yeniler
+"""
+
+import json
+import time
+
+# Varsayılan eşikler
+DEFAULT_MAX_PAGES = 500          # Driver başına maksimum sayfa
+DEFAULT_MAX_MEMORY_MB = 2048     # Süreç ağacı RSS sınırı (MB)
+DEFAULT_MAX_HEAP_MB = 1024       # psutil yoksa JS heap sınırı (MB)
+DEFAULT_MAX_ERROR_STREAK = 5     # Ardışık hata sınırı
+DEFAULT_MEMORY_CHECK_EVERY = 25  # Kaç sayfada bir bellek ölçülür
+DEFAULT_START_ATTEMPTS = 3       # Yenilemede tarayıcı başlatma denemesi
+DEFAULT_START_RETRY_DELAY = 5.0  # Başlatma denemeleri arası temel bekleme (saniye)
+
+# Yedek bellek ölçümü (Chrome'a özel performance.memory)
+_MEMORY_SCRIPT = (
+    "return (window.performance && performance.memory) ? "
+    "performance.memory.usedJSHeapSize : null;"
+)
+
+class DriverUnavailable(Exception):
+    """Yenileme sırasında yeni tarayıcı başlatılamadığında fırlatılır"""
+
+def process_tree_rss_mb(pid):
+    """
+    Sürecin ve tüm alt süreçlerinin RSS toplamını MB olarak döndürür
+    Paylaşılan sayfalar her süreçte sayıldığı için değer gerçek kullanımın
+    biraz üstündedir; eğilim takibi ve eşik için yeterlidir.
+
+    Returns:
+        float: RSS toplamı, psutil yoksa veya süreç bulunamazsa None
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue  # Süreç ölçüm sırasında kapandı
+    return total / 1024 / 1024
+
+class ManagedDriver:
+    """Sağlık takibi yapan ve eşiklerde kendini yenileyen driver sarmalayıcı"""
+
+    def __init__(self, factory, max_pages=DEFAULT_MAX_PAGES, max_memory_mb=DEFAULT_MAX_MEMORY_MB,
+                 max_error_streak=DEFAULT_MAX_ERROR_STREAK, memory_check_every=DEFAULT_MEMORY_CHECK_EVERY,
+                 metrics_path=None, max_heap_mb=DEFAULT_MAX_HEAP_MB,
+                 start_attempts=DEFAULT_START_ATTEMPTS, start_retry_delay=DEFAULT_START_RETRY_DELAY,
+                 sleep=time.sleep, label=None):
+        self._factory = factory
+        self.label = label          # Metrik satırlarındaki driver adı (ör. "producer")
+        self.start_attempts = start_attempts
+        self.start_retry_delay = start_retry_delay
+        self._sleep = sleep
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.max_heap_mb = max_heap_mb
+        self.max_error_streak = max_error_streak
+        self.memory_check_every = memory_check_every
+        self.metrics_path = metrics_path
+
+        self.driver_id = 0
+        self.recycle_count = 0
+        self.pages_served = 0
+        self.error_streak = 0
+        self.last_memory_mb = None
+        self.memory_source = None   # "rss" veya "js_heap"
+        self._driver = factory()
+
+    def __getattr__(self, name):
+        # Selenium driver metotlarını (find_element, execute_script, ...) aktar
+        return getattr(self._driver, name)
+
+    def get(self, url):
+        """Sayfayı yükler ve sayfa sayacını artırır"""
+        self.pages_served += 1
+        return self._driver.get(url)
+
+    def record_success(self):
+        """Başarılı sayfa sonrası ardışık hata sayacını sıfırlar"""
+        self.error_streak = 0
+
+    def record_error(self):
+        """Başarısız sayfa sonrası ardışık hata sayacını artırır"""
+        self.error_streak += 1
+
+    def _driver_pid(self):
+        """chromedriver sürecinin PID'i (Selenium service.process), yoksa None"""
+        process = getattr(getattr(self._driver, "service", None), "process", None)
+        return getattr(process, "pid", None)
+
+    def renderer_memory_mb(self):
+        """
+        Tarayıcı bellek kullanımını MB olarak döndürür, ölçülemezse None
+        Ölçüm kaynağı memory_source'a yazılır: "rss" chromedriver süreç
+        ağacının RSS toplamıdır. "js_heap" (psutil yoksa) sadece aktif
+        sekmenin JS heap'idir; DOM, görsel ve GPU belleğini içermediği için
+        gerçek kullanımın çok altında kalır.
+        """
+        pid = self._driver_pid()
+        if pid is not None:
+            rss_mb = process_tree_rss_mb(pid)
+            if rss_mb is not None:
+                self.memory_source = "rss"
+                return rss_mb
+
+        try:
+            used = self._driver.execute_script(_MEMORY_SCRIPT)
+        except Exception:
+            return None
+        if used is None:
+            return None
+        self.memory_source = "js_heap"
+        return used / 1024 / 1024
+
+    def check_health(self):
+        """
+        Eşikleri kontrol eder, gerekirse driver'ı yeniler
+        Sayfalar arasında çağrılmalıdır (kuyruk konumu kaybolmaz)
+
+        Returns:
+            str: Yenileme nedeni, yenileme yapılmadıysa None
+
+        Raises:
+            DriverUnavailable: Yenileme sırasında tarayıcı başlatılamadı
+        """
+        reason = None
+
+        if self.error_streak >= self.max_error_streak:
+            reason = f"{self.error_streak} ardışık hata"
+        elif self.pages_served >= self.max_pages:
+            reason = f"{self.pages_served} sayfa sınırı"
+        elif self.memory_check_every and self.pages_served % self.memory_check_every == 0 \
+                and self.pages_served > 0:
+            memory_mb = self.renderer_memory_mb()
+            self.last_memory_mb = memory_mb
+            self._emit("memory", memory_mb=memory_mb, memory_source=self.memory_source)
+            limit = self.max_memory_mb if self.memory_source == "rss" else self.max_heap_mb
+            if memory_mb is not None and memory_mb >= limit:
+                reason = f"{self.memory_source} bellek {memory_mb:.0f} MB"
+
+        if reason:
+            self.recycle(reason)
+        return reason
+
+    def _start_driver(self):
+        """Factory ile yeni driver başlatır, başarısız olursa artan beklemeyle tekrar dener"""
+        for attempt in range(1, self.start_attempts + 1):
+            try:
+                return self._factory()
+            except Exception as e:
+                error = e
+                print(f"⚠️ Tarayıcı başlatılamadı ({attempt}/{self.start_attempts}): {e}")
+                if attempt < self.start_attempts:
+                    self._sleep(self.start_retry_delay * attempt)
+        self._emit("start_failed", error=str(error))
+        raise DriverUnavailable(f"Tarayıcı {self.start_attempts} denemede başlatılamadı: {error}") from error
+
+    def recycle(self, reason="manuel"):
+        """
+        Mevcut driver'ı kapatıp yenisini başlatır
+
+        Raises:
+            DriverUnavailable: Yeni driver başlatılamadı (eski driver kapatılmış olur)
+        """
+        print(f"♻️ Tarayıcı yenileniyor ({reason}, {self.pages_served} sayfa sunuldu)")
+        self._emit("recycle", reason=reason, memory_mb=self.last_memory_mb)
+
+        try:
+            self._driver.quit()
+        except Exception as e:
+            print(f"⚠️ Eski tarayıcı kapatılamadı: {e}")
+
+        self._driver = None
+        self._driver = self._start_driver()
+        self.driver_id += 1
+        self.recycle_count += 1
+        self.pages_served = 0
+        self.error_streak = 0
+        self.last_memory_mb = None
+
+    def quit(self):
+        """Driver'ı kapatır ve son durumu metrik olarak yazar"""
+        self._emit("quit")
+        if self._driver is not None:
+            self._driver.quit()
+
+    def metrics(self):
+        """Anlık sağlık metrikleri"""
+        return {
+            "driver": self.label,
+            "driver_id": self.driver_id,
+            "pages_served": self.pages_served,
+            "error_streak": self.error_streak,
+            "memory_mb": self.last_memory_mb,
+            "recycle_count": self.recycle_count,
+        }
+
+    def _emit(self, event, **fields):
+        """Metrik olayını JSONL dosyasına ekler"""
+        if not self.metrics_path:
+            return
+        record = {"ts": time.time(), "event": event}
+        record.update(self.metrics())
+        record.update(fields)
+        try:
+            with open(self.metrics_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️ Metrik yazılamadı: {e}")
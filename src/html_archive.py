@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML Archive - Sıkıştırılmış Ham HTML Arşivi
+============================================
+
+Taranan her ürün sayfasının HTML'i içerik adresli (SHA-256) bir arşive
+yazılır. Böylece seçiciler bozulduğunda veya yeni alan eklendiğinde tarayıcı
+ve ağ olmadan sayfalar yeniden işlenebilir (reparse).
+
+Yapı:
+    <klasör>/index.jsonl              Her kayıt: url, hash, segment, offset, length, codec
+    <klasör>/<host>-<pid>-00001.zst   Segment dosyaları (ardışık sıkıştırılmış kayıtlar)
+
+- Her kayıt ayrı sıkıştırılır, tek bir sayfa segmenti açmadan okunabilir
+- Aynı içerik (hash) bir kez saklanır, sonraki taramalar sadece indekse eklenir
+- Her süreç kendi segment dosyalarına yazar, worker'lar aynı klasörü paylaşabilir
+- zstd (pip install zstandard) yoksa gzip kullanılır
+
+KULLANIM:
+from html_archive import HtmlArchive
+
+archive = HtmlArchive("html_arsivi")
+archive.put(url, html)
+for entry in archive.entries():
+    html = archive.read(entry)
+"""
+
+import os
+import json
+import gzip
+import time
+import socket
+import hashlib
+
+try:
+    from .url_utils import product_key
+except ImportError:
+    from url_utils import product_key
+
+INDEX_FILE = "index.jsonl"
+DEFAULT_SEGMENT_MAX_BYTES = 64 * 1024 * 1024   # Segment dosyası üst sınırı
+ZSTD_LEVEL = 9
+
+# Codec -> segment dosya uzantısı
+SEGMENT_EXTENSIONS = {"zstd": "zst", "gzip": "gz"}
+
+def default_codec():
+    """zstandard kuruluysa "zstd", değilse "gzip" """
+    try:
+        import zstandard  # noqa: F401
+        return "zstd"
+    except ImportError:
+        return "gzip"
+
+def compress(data, codec):
+    """Bytes veriyi verilen codec ile sıkıştırır"""
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if codec == "gzip":
+        return gzip.compress(data, mtime=0)
+    raise ValueError(f"Bilinmeyen codec: {codec}")
+
+def decompress(data, codec):
+    """compress() ile sıkıştırılmış veriyi açar"""
+    if codec == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd arşivi okumak için zstandard gerekli: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    raise ValueError(f"Bilinmeyen codec: {codec}")
+
+def content_hash(html):
+    """HTML içeriğinin SHA-256 adresi"""
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+class HtmlArchive:
+    """İçerik adresli, segment dosyalarından oluşan HTML arşivi"""
+
+    def __init__(self, directory, codec=None, segment_max_bytes=DEFAULT_SEGMENT_MAX_BYTES):
+        self.directory = directory
+        self.codec = codec or default_codec()
+        self.segment_max_bytes = segment_max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._index_path = os.path.join(directory, INDEX_FILE)
+        self._locations = {}      # hash -> indeks kaydı (içerik tekrarını önler)
+        for entry in self._read_index():
+            self._locations[entry["hash"]] = entry
+
+        self._segment_prefix = f"{socket.gethostname()}-{os.getpid()}"
+        self._segment_number = 0
+        self._segment = None      # Açık segment dosyası (yazma)
+        self._segment_name = None
+
+    def __len__(self):
+        """Saklanan benzersiz sayfa sayısı"""
+        return len(self._locations)
+
+    def __contains__(self, html_hash):
+        return html_hash in self._locations
+
+    def _read_index(self):
+        """İndeks kayıtlarını sırayla okur (yarım yazılmış son satır atlanır)"""
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def _open_segment(self, needed):
+        """Yazılabilir segment döndürür, dolduysa yenisine geçer"""
+        if self._segment is not None and self._segment.tell() + needed <= self.segment_max_bytes:
+            return self._segment
+        if self._segment is not None:
+            self._segment.close()
+
+        while True:
+            self._segment_number += 1
+            name = f"{self._segment_prefix}-{self._segment_number:05d}.{SEGMENT_EXTENSIONS[self.codec]}"
+            if not os.path.exists(os.path.join(self.directory, name)):
+                break
+        self._segment_name = name
+        self._segment = open(os.path.join(self.directory, name), 'ab')
+        return self._segment
+
+    def put(self, url, html):
+        """
+        Sayfanın HTML'ini arşive ekler
+        İçerik daha önce saklandıysa sadece indekse yeni kayıt yazılır
+
+        Returns:
+            str: İçerik hash'i
+        """
+        html_hash = content_hash(html)
+        location = self._locations.get(html_hash)
+
+        if location is None:
+            blob = compress(html.encode("utf-8"), self.codec)
+            segment = self._open_segment(len(blob))
+            offset = segment.tell()
+            segment.write(blob)
+            segment.flush()
+            location = {
+                "hash": html_hash,
+                "segment": self._segment_name,
+                "offset": offset,
+                "length": len(blob),
+                "codec": self.codec,
+            }
+            self._locations[html_hash] = location
+
+        entry = {"url": url, **location, "fetched_at": time.time()}
+        with open(self._index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return html_hash
+
+    def get(self, html_hash):
+        """Hash'i verilen sayfanın HTML'ini döndürür"""
+        return self.read(self._locations[html_hash])
+
+    def read(self, entry):
+        """İndeks kaydının gösterdiği HTML'i okur"""
+        return read_entry(self.directory, entry)
+
+    def entries(self, latest=True):
+        """
+        İndeks kayıtları
+        latest=True ise her ürün için (içerik ID'si) sadece en son tarama döner
+        """
+        if not latest:
+            return list(self._read_index())
+        newest = {}
+        for entry in self._read_index():
+            newest[product_key(entry["url"])] = entry
+        return list(newest.values())
+
+    def close(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+def read_entry(directory, entry):
+    """
+    İndeks kaydının gösterdiği HTML'i okur
+    (HtmlArchive nesnesi gerektirmez, süreç havuzundaki worker'larda kullanılır)
+    """
+    with open(os.path.join(directory, entry["segment"]), 'rb') as f:
+        f.seek(entry["offset"])
+        blob = f.read(entry["length"])
+    return decompress(blob, entry["codec"]).decode("utf-8")
@@ -5,7 +5,9 @@ Image Analyzer - Mockup Tespit Modülü
 =====================================
 
 Bu modül görsel URL'lerinde veya alt-text'lerinde mockup anahtar kelimelerini arar.
-İleride CLIP gibi AI modelleri eklemeye uygun yapıda tasarlanmıştır.
+Görsel içeriğine bakan model tabanlı skorlama mockup_classifier modülündedir;
+analyze_image_batch() bir sınıflandırıcı verilirse anahtar kelimeyi ön filtre
+olarak kullanıp kalan görselleri modele gönderir.
 
 KULLANIM:
 from image_analyzer import is_mockup_by_filename
@@ -17,6 +19,11 @@ print(result)  # True veya False
 import re
 from urllib.parse import urlparse
 
+try:
+    from .url_utils import collapse_image_variants
+except ImportError:
+    from url_utils import collapse_image_variants
+
 # Mockup tespiti için anahtar kelimeler
 MOCKUP_KEYWORDS = [
     "mockup", "mokap", "frame", "psd", "mock", 
@@ -70,12 +77,15 @@ def is_mockup_by_filename(url_or_alt):
     
     return False
 
-def analyze_image_batch(image_urls):
+def analyze_image_batch(image_urls, classifier=None):
     """
     Birden fazla görsel URL'sini toplu olarak analiz eder
+    Aynı görselin CDN boyut varyantları tek görsel olarak sayılır
     
     Args:
         image_urls (list): Görsel URL'leri listesi
+        classifier (MockupClassifier): Verilirse anahtar kelimeyle yakalanmayan
+            görseller model skoruna göre sınıflandırılır
         
     Returns:
         dict: {
@@ -87,6 +97,7 @@ def analyze_image_batch(image_urls):
     """
     mockup_images = []
     regular_images = []
+    image_urls = collapse_image_variants(image_urls)
     
     for url in image_urls:
         if is_mockup_by_filename(url):
@@ -94,6 +105,14 @@ def analyze_image_batch(image_urls):
         else:
             regular_images.append(url)
     
+    # Model sadece ön filtreden geçemeyen görselleri skorlar (gruplar halinde)
+    if classifier is not None and regular_images:
+        scores = classifier.classify(regular_images)
+        mockup_set = set(mockup_images)
+        mockup_set.update(u for u, score in zip(regular_images, scores) if score >= classifier.threshold)
+        mockup_images = [u for u in image_urls if u in mockup_set]
+        regular_images = [u for u in image_urls if u not in mockup_set]
+    
     return {
         'mockup_images': mockup_images,
         'regular_images': regular_images,
@@ -103,8 +122,8 @@ def analyze_image_batch(image_urls):
 
 def get_mockup_confidence_score(url_or_alt):
     """
-    Mockup olma olasılığını 0-1 arasında skorlar
-    (İleride AI modelleri için hazırlık)
+    Mockup olma olasılığını anahtar kelimelere göre 0-1 arasında skorlar
+    (Görsel içeriğine bakan skor için: mockup_classifier.MockupClassifier)
     
     Args:
         url_or_alt (str): Görsel URL'si veya alt-text
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Link Pipeline - Link Toplama ve Ürün İşleme Boru Hattı
+======================================================
+
+Satıcı sayfalarından link toplama ayrı bir thread'de (kendi tarayıcısıyla)
+çalışır ve bulunan linkleri sınırlı bir kuyruğa yazar. Ürün işleme aynı anda
+bu kuyruktan okur; böylece ilk ürünler link toplama bitmeden işlenir ve
+toplam süre keşif + işleme toplamı yerine ikisinin büyüğüne yaklaşır.
+
+Kuyruk dolduğunda üretici bekler (backpressure), işleme geride kalsa bile
+bellekte sınırsız link birikmez.
+
+Üreticinin tarayıcısı ilk kullanıldığı anda açılır: linkler listeleme
+servisinden alınabildiğinde (render gerekmediğinde) ikinci Chrome hiç
+başlatılmaz.
+
+KULLANIM:
+from link_pipeline import LinkProducer
+
+producer = LinkProducer(create_driver, lambda driver: iter_links(driver, url))
+producer.start()
+for link in producer:      # Linkler bulundukça gelir
+    ...
+producer.stop()
+"""
+
+import queue
+import threading
+
+# Varsayılan kuyruk kapasitesi (link)
+DEFAULT_MAXSIZE = 50
+
+# Bekleyen put/get işlemlerinin durdurma isteğini kontrol etme aralığı (saniye)
+_POLL_INTERVAL = 0.5
+
+# Kuyruk sonu işareti
+_DONE = object()
+
+class LazyDriver:
+    """İlk kullanımda oluşturulan tarayıcı (kullanılmazsa hiç açılmaz)"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._driver = None
+
+    @property
+    def started(self):
+        """Tarayıcı oluşturuldu mu"""
+        return self._driver is not None
+
+    def __getattr__(self, name):
+        if self._driver is None:
+            self._driver = self._factory()
+        return getattr(self._driver, name)
+
+    def quit(self):
+        """Oluşturulduysa tarayıcıyı kapatır"""
+        if self._driver is not None:
+            self._driver.quit()
+
+class LinkProducer:
+    """Link toplamayı ayrı thread'de çalıştırıp sınırlı kuyruğa besleyen üretici"""
+
+    def __init__(self, driver_factory, link_iter_factory, maxsize=DEFAULT_MAXSIZE):
+        """
+        Args:
+            driver_factory (callable): Üretici thread'i için tarayıcı oluşturur
+                (ilk kullanımda çağrılır, link kaynağı tarayıcıya dokunmazsa hiç çağrılmaz)
+            link_iter_factory (callable): driver alıp link üreten iterable döndürür
+            maxsize (int): Kuyruk kapasitesi (dolunca üretici bekler)
+        """
+        self._driver_factory = driver_factory
+        self._link_iter_factory = link_iter_factory
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._thread = None
+        self.error = None      # Üretici thread'inde oluşan hata
+        self.produced = 0      # Kuyruğa yazılan link sayısı
+        self.driver = None     # Üreticinin LazyDriver'ı
+
+    def start(self):
+        """Üretici thread'ini başlatır"""
+        self._thread = threading.Thread(target=self._run, name="link-producer", daemon=True)
+        self._thread.start()
+        return self
+
+    def _put(self, item):
+        """Kuyruğa yazar, doluysa yer açılana veya durdurulana kadar bekler"""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        driver = self.driver = LazyDriver(self._driver_factory)
+        try:
+            links = self._link_iter_factory(driver)
+            try:
+                for link in links:
+                    if not self._put(link):
+                        break
+                    self.produced += 1
+            finally:
+                close = getattr(links, "close", None)
+                if close:
+                    close()
+        except Exception as e:
+            self.error = e
+            print(f"❌ Link toplama hatası: {e}")
+        finally:
+            if driver.started:
+                try:
+                    driver.quit()
+                except Exception as e:
+                    print(f"⚠️ Link toplama tarayıcısı kapatılamadı: {e}")
+            self._put(_DONE)
+
+    def __iter__(self):
+        """Linkleri bulundukça döndürür; üretici bitince durur"""
+        while True:
+            try:
+                item = self._queue.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if self._thread is None or not self._thread.is_alive():
+                    return
+                continue
+            if item is _DONE:
+                return
+            yield item
+
+    def stop(self, timeout=None):
+        """Üreticiyi durdurur ve thread'in bitmesini bekler"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+# ============================================================================
+# TEST
+# ============================================================================
+
+class _FakeDriver:
+    """Test için tarayıcı yerine geçen nesne"""
+
+    def __init__(self):
+        self.closed = False
+        self.pages = []
+
+    def get(self, url):
+        self.pages.append(url)
+
+    def quit(self):
+        self.closed = True
+
+def _fake_links(count=None, fail_after=None, pulled=None, render=True):
+    """
+    Sahte link kaynağı: count kadar (None = sonsuz) link üretir
+    render=False ise tarayıcıya hiç dokunmaz (listeleme servisi gibi)
+    """
+    def links(driver):
+        index = 0
+        while count is None or index < count:
+            if fail_after is not None and index == fail_after:
+                raise RuntimeError("satıcı sayfası yüklenemedi")
+            if render:
+                driver.get(f"https://www.trendyol.com/magaza/xxxx-m-1?sayfa={index}")
+            if pulled is not None:
+                pulled.append(index)
+            yield f"https://www.trendyol.com/marka/urun-p-{index}"
+            index += 1
+    return links
+
+def test_link_producer():
+    """Backpressure, stop(), max_products ile erken bitiş ve hata iletimi testleri"""
+    import time
+
+    print("🧪 Link pipeline testleri:")
+    test_cases = []
+
+    # Backpressure: yavaş tüketici varken üretici kuyruk kapasitesinin ötesine geçmez
+    pulled = []
+    driver = _FakeDriver()
+    producer = LinkProducer(lambda: driver, _fake_links(pulled=pulled), maxsize=5).start()
+    consumed = []
+    for link in producer:
+        consumed.append(link)
+        time.sleep(0.05)  # Yavaş tüketici
+        if len(consumed) == 10:
+            break
+    test_cases.append(("backpressure (çekilen link <= tüketilen + kapasite + 2)",
+                       len(pulled) <= len(consumed) + 5 + 2, True))
+
+    # stop(): sonsuz kaynakta kuyruk doluyken üretici thread'i biter
+    producer.stop(timeout=5)
+    test_cases.append(("stop() sonrası thread bitti", not producer._thread.is_alive(), True))
+    test_cases.append(("stop() sonrası tarayıcı kapandı", driver.closed, True))
+
+    # max_products: kaynak limitte durunca üretici kendiliğinden biter
+    driver = _FakeDriver()
+    producer = LinkProducer(lambda: driver, _fake_links(count=7), maxsize=3).start()
+    links = list(producer)
+    producer._thread.join(timeout=5)
+    test_cases.append(("max_products link sayısı", (len(links), producer.produced), (7, 7)))
+    test_cases.append(("max_products sonrası thread bitti", not producer._thread.is_alive(), True))
+    test_cases.append(("max_products sonrası tarayıcı kapandı", driver.closed, True))
+
+    # Tarayıcı gerekmezse (listeleme servisi) üretici tarayıcısı hiç açılmaz
+    created = []
+    producer = LinkProducer(lambda: created.append(_FakeDriver()) or created[-1],
+                            _fake_links(count=5, render=False), maxsize=2).start()
+    links = list(producer)
+    producer.stop(timeout=5)
+    test_cases.append(("render'sız link sayısı", len(links), 5))
+    test_cases.append(("render'sız tarayıcı açılmadı", (len(created), producer.driver.started), (0, False)))
+
+    # Üretici hatası: önceki linkler teslim edilir, hata tüketiciye ulaşır
+    producer = LinkProducer(_FakeDriver, _fake_links(fail_after=4), maxsize=2).start()
+    links = list(producer)
+    producer.stop(timeout=5)
+    test_cases.append(("hata öncesi linkler", len(links), 4))
+    test_cases.append(("hata tüketiciye ulaştı", repr(producer.error),
+                       repr(RuntimeError("satıcı sayfası yüklenemedi"))))
+    test_cases.append(("hata sonrası thread bitti", not producer._thread.is_alive(), True))
+
+    for name, result, expected in test_cases:
+        status = "✅" if result == expected else "❌"
+        print(f"{status} {name}: {result!r} (beklenen: {expected!r})")
+
+if __name__ == "__main__":
+    test_link_producer()
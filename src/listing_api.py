@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Listing API - JSON Listeleme Servisinden Ürün Keşfi
+===================================================
+
+Mağaza sayfasının ürün listesi sayfalı JSON olarak da sunulur. Bu modül
+ilk sayfadan toplam ürün sayısını ve sayfa boyutunu okur, kalan sayfaları
+eşzamanlı (thread havuzu, ortak HTTP bağlantı havuzu) çeker ve ürün ID'leri
+ile kart bilgilerini (ad, marka, fiyat, görsel, puan) doğrudan döndürür.
+
+Tarayıcıda sayfa sayfa render etmeye göre 10 bin ürünlü bir satıcı dakikalar
+yerine saniyeler içinde keşfedilir. Satıcı ID'si bulunamazsa, ilk sayfa
+beklenen şemada değilse veya boşsa ListingUnavailable fırlatılır; çağıran
+taraf tarayıcıyla render etmeye geri döner.
+
+KULLANIM:
+from listing_api import discover_seller_products, ListingUnavailable
+
+try:
+    cards, failed_pages = discover_seller_products("https://www.trendyol.com/magaza/xxx-m-123")
+except ListingUnavailable:
+    ...  # tarayıcı ile link toplama
+
+python listing_api.py    # Yerel sahte sunucu ile test
+"""
+
+import re
+import math
+import time
+import threading
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from .url_utils import canonicalize_product_url
+    from .retry_queue import backoff_delay
+    from .run_budget import UNLIMITED
+except ImportError:
+    from url_utils import canonicalize_product_url
+    from retry_queue import backoff_delay
+    from run_budget import UNLIMITED
+
+# Mağaza ürün listesinin JSON servisi (mid: satıcı ID'si, pi: sayfa numarası)
+LISTING_ENDPOINT = "https://public.trendyol.com/discovery-web-searchgw-service/v2/api/infinite-scroll/sr"
+
+# Göreli görsel yolları için CDN adresi
+IMAGE_BASE_URL = "https://cdn.dsmcdn.com"
+
+LISTING_WORKERS = 8            # Eşzamanlı sayfa isteği
+LISTING_TIMEOUT = 15           # İstek başına zaman aşımı (saniye)
+LISTING_MAX_ATTEMPTS = 3       # Sayfa başına deneme
+LISTING_RETRY_BASE_DELAY = 1.0
+LISTING_RETRY_MAX_DELAY = 10.0
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+# Mağaza URL'sindeki satıcı ID'si: /magaza/satici-adi-m-123456
+_SELLER_ID = re.compile(r"-m-(\d+)(?:[/?#]|$)")
+
+class ListingUnavailable(Exception):
+    """JSON listeleme kullanılamıyor (tarayıcıyla render edilmeli)"""
+
+def extract_seller_id(seller_url):
+    """Mağaza URL'sinden satıcı ID'sini çıkarır, yoksa None"""
+    if not seller_url:
+        return None
+    match = _SELLER_ID.search(seller_url)
+    if match:
+        return match.group(1)
+    query = parse_qs(urlsplit(seller_url).query)
+    for name in ("mid", "merchantId"):
+        if query.get(name, [""])[0].isdigit():
+            return query[name][0]
+    return None
+
+def create_session(workers=LISTING_WORKERS):
+    """Eşzamanlı isteklerde bağlantıları yeniden kullanan HTTP oturumu"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept": "application/json"})
+    return session
+
+def parse_listing_page(payload):
+    """
+    Listeleme yanıtından toplam ürün sayısını ve ürünleri okur
+
+    Returns:
+        tuple: (toplam ürün sayısı, ürün sözlükleri listesi)
+    """
+    result = payload.get("result") if isinstance(payload, dict) else None
+    if not isinstance(result, dict) or not isinstance(result.get("products"), list):
+        raise ValueError("Beklenmeyen listeleme yanıtı")
+    return int(result.get("totalCount") or 0), result["products"]
+
+def product_card(product):
+    """Listeleme ürününü kart bilgisine çevirir (içerik ID'si ve kanonik URL ile)"""
+    images = product.get("images") or []
+    image = images[0] if images else ""
+    if image.startswith("/"):
+        image = IMAGE_BASE_URL + image
+
+    brand = product.get("brand")
+    price = product.get("price") or {}
+    rating = product.get("ratingScore") or {}
+    return {
+        "content_id": str(product.get("id", "")),
+        "url": canonicalize_product_url(product.get("url", "")),
+        "title": product.get("name", ""),
+        "brand": brand.get("name", "") if isinstance(brand, dict) else (brand or ""),
+        "price": price.get("sellingPrice", price.get("discountedPrice")),
+        "image": image,
+        "rating": rating.get("averageRating"),
+        "rating_count": rating.get("totalCount"),
+    }
+
+def fetch_listing_page(session, seller_id, page, endpoint=LISTING_ENDPOINT,
+                       max_attempts=LISTING_MAX_ATTEMPTS, budget=UNLIMITED):
+    """
+    Tek listeleme sayfasını çeker; hata olursa backoff ile tekrar dener
+
+    Returns:
+        tuple: (toplam ürün sayısı, ürün sözlükleri listesi)
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            response = session.get(endpoint, params={"mid": seller_id, "pi": page},
+                                   timeout=LISTING_TIMEOUT)
+            response.raise_for_status()
+            return parse_listing_page(response.json())
+        except Exception:
+            if attempt == max_attempts or budget.expired():
+                raise
+            delay = backoff_delay(attempt, LISTING_RETRY_BASE_DELAY, LISTING_RETRY_MAX_DELAY)
+            if not budget.allows_wait(delay):
+                raise
+            time.sleep(delay)
+
+def discover_seller_products(seller_url, max_products=None, workers=LISTING_WORKERS,
+                             endpoint=LISTING_ENDPOINT, session=None, budget=UNLIMITED):
+    """
+    Satıcının tüm ürünlerini JSON listeleme servisinden keşfeder
+    İlk sayfadan toplam sayı okunur, kalan sayfalar eşzamanlı çekilir
+
+    Args:
+        seller_url (str): Mağaza URL'si (satıcı ID'si içermeli)
+        max_products (int): Verilirse sadece gereken sayfalar çekilir
+        workers (int): Eşzamanlı istek sayısı
+        endpoint (str): Listeleme servisi adresi
+        session: requests.Session benzeri oturum (verilmezse oluşturulur)
+
+    Returns:
+        tuple: (sayfa sırasıyla tekil ürün kartları, çekilemeyen sayfa numaraları)
+
+    Raises:
+        ListingUnavailable: Satıcı ID'si yok, ilk sayfa alınamadı veya boş
+    """
+    seller_id = extract_seller_id(seller_url)
+    if seller_id is None:
+        raise ListingUnavailable(f"Satıcı ID'si bulunamadı: {seller_url}")
+
+    own_session = session is None
+    if own_session:
+        session = create_session(workers)
+
+    try:
+        try:
+            total, first_products = fetch_listing_page(session, seller_id, 1, endpoint, budget=budget)
+        except Exception as e:
+            raise ListingUnavailable(f"Listeleme servisi yanıt vermedi: {e}") from e
+
+        # Boş ilk sayfa (totalCount 0 veya ürün yok) başarı sayılmaz: mağaza
+        # gerçekten boş olsa bile tarayıcıyla render edilerek doğrulanır
+        if not total or not first_products:
+            raise ListingUnavailable("Listeleme servisi ürün döndürmedi")
+
+        wanted = total if max_products is None else min(total, max_products)
+        page_size = len(first_products) or 1
+        page_count = max(1, math.ceil(wanted / page_size))
+        print(f"🔎 Listeleme servisi: {total} ürün, {page_count} sayfa ({workers} eşzamanlı istek)")
+
+        pages = {1: first_products}
+        failed_pages = []
+        lock = threading.Lock()
+
+        def fetch(page):
+            if budget.expired():
+                with lock:
+                    failed_pages.append(page)
+                return
+            try:
+                _, products = fetch_listing_page(session, seller_id, page, endpoint, budget=budget)
+            except Exception as e:
+                print(f"⚠️ Listeleme sayfası {page} alınamadı: {e}")
+                with lock:
+                    failed_pages.append(page)
+                return
+            with lock:
+                pages[page] = products
+
+        if page_count > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="listing") as pool:
+                list(pool.map(fetch, range(2, page_count + 1)))
+    finally:
+        if own_session:
+            session.close()
+
+    # Sayfa sırasıyla birleştir, aynı ürün (içerik ID'si) bir kez
+    cards = []
+    seen = set()
+    for page in sorted(pages):
+        for product in pages[page]:
+            card = product_card(product)
+            key = card["content_id"] or card["url"]
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            cards.append(card)
+            if max_products is not None and len(cards) >= max_products:
+                return cards, sorted(failed_pages)
+
+    return cards, sorted(failed_pages)
+
+# =============================================================================
+# Yerel sahte sunucu ile test
+# =============================================================================
+
+def _start_stand_in_server(total, page_size=24, latency=0.02, flaky_pages=()):
+    """
+    Listeleme servisini taklit eden yerel HTTP sunucusu
+    flaky_pages içindeki sayfalar ilk istekte 503 döner
+    """
+    import json
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    failed_once = set()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlsplit(self.path).query)
+            page = int(query.get("pi", ["1"])[0])
+            time.sleep(latency)
+            if page in flaky_pages and page not in failed_once:
+                failed_once.add(page)
+                self.send_response(503)
+                self.end_headers()
+                return
+
+            start = (page - 1) * page_size
+            products = [{
+                "id": 1000 + i,
+                "name": f"Ürün {i}",
+                "url": f"/marka/urun-{i}-p-{1000 + i}?boutiqueId=61&merchantId={query['mid'][0]}",
+                "brand": {"name": "Marka"},
+                "price": {"sellingPrice": 100 + i},
+                "images": [f"/ty{i}/prod/1_org_zoom.jpg"],
+                "ratingScore": {"averageRating": 4.5, "totalCount": i},
+            } for i in range(start, min(start + page_size, total))]
+            body = json.dumps({"result": {"totalCount": total, "products": products}}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/sr"
+
+def test_listing_discovery():
+    """Keşfi yerel sahte sunucuya karşı test eder"""
+    global LISTING_RETRY_BASE_DELAY
+    LISTING_RETRY_BASE_DELAY = 0.05
+    seller_url = "https://www.trendyol.com/magaza/test-satici-m-4242?sst=0"
+
+    server, endpoint = _start_stand_in_server(total=10000, flaky_pages=(7, 300))
+    try:
+        start = time.perf_counter()
+        cards, failed_pages = discover_seller_products(seller_url, endpoint=endpoint, workers=16)
+        elapsed = time.perf_counter() - start
+        limited, _ = discover_seller_products(seller_url, max_products=50, endpoint=endpoint)
+    finally:
+        server.shutdown()
+
+    print("🧪 Listeleme keşfi testleri:")
+    test_cases = [
+        ("satıcı ID'si", extract_seller_id(seller_url), "4242"),
+        ("satıcı ID'si (sorgu)", extract_seller_id("https://www.trendyol.com/sr?mid=77"), "77"),
+        ("ürün sayısı", len(cards), 10000),
+        ("çekilemeyen sayfa", failed_pages, []),
+        ("sayfa sırası", [c["content_id"] for c in cards[:3]], ["1000", "1001", "1002"]),
+        ("kanonik URL", cards[0]["url"], "https://www.trendyol.com/marka/urun-0-p-1000"),
+        ("görsel", cards[0]["image"], IMAGE_BASE_URL + "/ty0/prod/1_org_zoom.jpg"),
+        ("max_products", len(limited), 50),
+    ]
+    for name, result, expected in test_cases:
+        status = "✅" if result == expected else "❌"
+        print(f"{status} {name}: {result!r} (beklenen: {expected!r})")
+
+    try:
+        discover_seller_products("https://www.trendyol.com/magaza/satici")
+        print("❌ satıcı ID'si olmayan URL: ListingUnavailable bekleniyordu")
+    except ListingUnavailable:
+        print("✅ satıcı ID'si olmayan URL: ListingUnavailable")
+
+    server, endpoint = _start_stand_in_server(total=0)
+    try:
+        discover_seller_products(seller_url, endpoint=endpoint)
+        print("❌ boş ilk sayfa: ListingUnavailable bekleniyordu")
+    except ListingUnavailable:
+        print("✅ boş ilk sayfa: ListingUnavailable")
+    finally:
+        server.shutdown()
+
+    print(f"⏱️ 10000 ürün {elapsed:.2f} sn'de keşfedildi")
+
+if __name__ == "__main__":
+    test_listing_discovery()
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mockup Classifier - Gömme (Embedding) Tabanlı Mockup Sınıflandırıcı
+===================================================================
+
+Görseller CPU üzerinde çalışan bir görsel modelinden (ör. CLIP görsel
+kodlayıcısının ONNX çıktısı) geçirilip gömme vektörüne çevrilir ve etiketli
+örneklerden hesaplanan mockup / normal görsel prototiplerine benzerliğe göre
+0-1 arasında skorlanır.
+
+- Anahtar kelime eşleşmesi (image_analyzer) ucuz ön filtredir; URL'si zaten
+  mockup olduğunu söyleyen görseller modele gönderilmez
+- İstekler dinamik gruplar (batch) halinde thread havuzunda işlenir: grup
+  dolunca veya kısa bekleme süresi dolunca model çağrılır, tüm worker'lar
+  meşgulken biriken istekler bir sonraki gruba eklenir
+- Gömmeler görsel içeriğinin SHA-256'sı ile diskte saklanır; aynı görsel
+  (farklı URL'de olsa bile) ikinci kez modelden geçmez
+- Model arka ucu değiştirilebilir: name özelliği ve embed(list[bytes]) ->
+  (n, d) numpy dizisi döndüren her nesne kullanılabilir
+
+ONNX arka ucu için: pip install onnxruntime numpy pillow
+
+KULLANIM:
+from mockup_classifier import MockupClassifier, OnnxEmbeddingBackend, load_prototypes
+
+backend = OnnxEmbeddingBackend("modeller/clip_gorsel.onnx")
+classifier = MockupClassifier(backend, load_prototypes("modeller/prototipler.npz"))
+scores = classifier.classify(image_urls)     # [0.93, 0.04, ...]
+classifier.close()
+"""
+
+import os
+import math
+import time
+import queue
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    from .image_analyzer import is_mockup_by_filename, get_mockup_confidence_score
+except ImportError:
+    from image_analyzer import is_mockup_by_filename, get_mockup_confidence_score
+
+# Dinamik gruplama
+DEFAULT_BATCH_SIZE = 16          # Tek model çağrısındaki en fazla görsel
+DEFAULT_MAX_WAIT_MS = 10.0       # Grup dolmazsa ilk istekten sonra bekleme süresi
+DEFAULT_WORKERS = 2              # Aynı anda çalışan model çağrısı
+DEFAULT_FETCH_WORKERS = 8        # Görsel indirme thread'leri
+
+# Skorlama
+DEFAULT_THRESHOLD = 0.5          # Bu skor ve üzeri mockup sayılır
+SCORE_SCALE = 20.0               # Benzerlik farkını skora çeviren ölçek (sigmoid)
+KEYWORD_MATCH_SCORE = 0.5        # Anahtar kelime eşleşmesinin en düşük skoru
+
+# Görsel indirme
+DEFAULT_CACHE_DIR = "gomme_onbellegi"
+FETCH_TIMEOUT = 15
+
+# CLIP görsel ön işleme değerleri
+CLIP_INPUT_SIZE = 224
+CLIP_MEAN = (0.48145466, 0.4578275, 0.40821073)
+CLIP_STD = (0.26862954, 0.26130258, 0.27577711)
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("Gömme tabanlı sınıflandırma için numpy gerekli: pip install numpy")
+    return numpy
+
+def image_hash(data):
+    """Görsel içeriğinin SHA-256 adresi (önbellek anahtarı)"""
+    return hashlib.sha256(data).hexdigest()
+
+def download_image(url):
+    """Görseli indirir (varsayılan fetcher)"""
+    import requests
+    response = requests.get(url, timeout=FETCH_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+# =============================================================================
+# Model arka uçları
+# =============================================================================
+
+class OnnxEmbeddingBackend:
+    """ONNX Runtime ile CPU üzerinde görsel gömmesi üreten arka uç"""
+
+    def __init__(self, model_path, input_size=CLIP_INPUT_SIZE, mean=CLIP_MEAN, std=CLIP_STD,
+                 intra_op_threads=1):
+        """
+        Args:
+            model_path (str): (n, 3, H, W) float32 girdi alıp (n, d) gömme döndüren model
+            input_size (int): Kare girdi boyutu
+            mean, std (tuple): Kanal bazında normalizasyon değerleri
+            intra_op_threads (int): Model çağrısı başına CPU thread'i
+                (paralellik worker havuzundan gelir, küçük tutulmalı)
+        """
+        try:
+            import onnxruntime
+        except ImportError:
+            raise ImportError("ONNX arka ucu için onnxruntime gerekli: pip install onnxruntime")
+        np = _require_numpy()
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        self._session = onnxruntime.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        self._input_name = self._session.get_inputs()[0].name
+        self.input_size = input_size
+        self._mean = np.array(mean, dtype=np.float32).reshape(3, 1, 1)
+        self._std = np.array(std, dtype=np.float32).reshape(3, 1, 1)
+
+        # Önbellek ad alanı: model dosyası değişince eski gömmeler kullanılmaz
+        with open(model_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+        self.name = f"onnx-{os.path.splitext(os.path.basename(model_path))[0]}-{digest}"
+
+    def preprocess(self, data):
+        """Görsel baytlarını (3, H, W) normalize float32 diziye çevirir"""
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ImportError("Görsel ön işleme için Pillow gerekli: pip install pillow")
+        import io
+        np = _require_numpy()
+
+        image = Image.open(io.BytesIO(data)).convert("RGB")
+        # Kısa kenar input_size olacak şekilde ölçekle, ortadan kırp
+        scale = self.input_size / min(image.size)
+        width = max(self.input_size, round(image.width * scale))
+        height = max(self.input_size, round(image.height * scale))
+        image = image.resize((width, height), Image.BICUBIC)
+        left = (width - self.input_size) // 2
+        top = (height - self.input_size) // 2
+        image = image.crop((left, top, left + self.input_size, top + self.input_size))
+
+        pixels = np.asarray(image, dtype=np.float32).transpose(2, 0, 1) / 255.0
+        return (pixels - self._mean) / self._std
+
+    def embed(self, images):
+        """Görsel baytları listesini tek model çağrısında gömmeye çevirir"""
+        np = _require_numpy()
+        batch = np.stack([self.preprocess(data) for data in images])
+        return self._session.run(None, {self._input_name: batch})[0]
+
+# =============================================================================
+# Prototipler
+# =============================================================================
+
+def normalize(vectors):
+    """Satırları birim uzunluğa getirir (kosinüs benzerliği için)"""
+    np = _require_numpy()
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def build_prototypes(backend, mockup_images, regular_images, filename=None):
+    """
+    Etiketli örnek görsellerden mockup / normal prototiplerini hesaplar
+
+    Args:
+        backend: Gömme arka ucu
+        mockup_images (list): Mockup görsel baytları
+        regular_images (list): Normal ürün görseli baytları
+        filename (str): Verilirse prototipler .npz olarak kaydedilir
+
+    Returns:
+        dict: {"mockup": (k, d) dizi, "regular": (m, d) dizi}
+    """
+    prototypes = {
+        "mockup": normalize(backend.embed(list(mockup_images))),
+        "regular": normalize(backend.embed(list(regular_images))),
+    }
+    if filename:
+        np = _require_numpy()
+        np.savez(filename, **prototypes)
+        print(f"💾 Mockup prototipleri kaydedildi: {filename}")
+    return prototypes
+
+def load_prototypes(filename):
+    """build_prototypes() ile kaydedilmiş prototipleri okur"""
+    np = _require_numpy()
+    with np.load(filename) as data:
+        return {"mockup": normalize(data["mockup"]), "regular": normalize(data["regular"])}
+
+# =============================================================================
+# Gömme önbelleği
+# =============================================================================
+
+class EmbeddingCache:
+    """Görsel hash'i ile adreslenen, disk üzerindeki gömme önbelleği"""
+
+    def __init__(self, directory, namespace):
+        """
+        Args:
+            directory (str): Önbellek klasörü
+            namespace (str): Model adı (farklı modellerin gömmeleri karışmaz)
+        """
+        self.directory = os.path.join(directory, namespace)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.npy")
+
+    def get(self, key):
+        """Kayıtlı gömme veya None"""
+        np = _require_numpy()
+        try:
+            return np.load(self._path(key))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, vector):
+        """Gömmeyi yazar (yarım dosya okunmasın diye geçici dosya + rename)"""
+        np = _require_numpy()
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, vector)
+        os.replace(tmp_path, path)
+
+# =============================================================================
+# Dinamik gruplama
+# =============================================================================
+
+_STOP = object()
+
+class BatchScheduler:
+    """
+    Tekil istekleri dinamik gruplara toplayıp thread havuzunda işleyen zamanlayıcı
+
+    İlk istek geldiğinde boş bir worker beklenir; bu sırada gelen istekler
+    gruba eklenir. Grup batch_size'a ulaşınca veya max_wait_ms dolunca
+    worker'a verilir. Yük arttıkça gruplar kendiliğinden büyür.
+    """
+
+    def __init__(self, batch_fn, batch_size=DEFAULT_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                 workers=DEFAULT_WORKERS):
+        """
+        Args:
+            batch_fn (callable): Girdi listesi alıp aynı sırada sonuç listesi döndürür
+        """
+        self._batch_fn = batch_fn
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._requests = queue.Queue()
+        self._slots = threading.BoundedSemaphore(workers)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mockup-model")
+        self._thread = threading.Thread(target=self._collect, name="mockup-batcher", daemon=True)
+        self._thread.start()
+        self.batches = 0        # Çalıştırılan model çağrısı
+        self.items = 0          # Modelden geçen girdi
+
+    def submit(self, item):
+        """Girdiyi kuyruğa ekler, sonucu veren Future döndürür"""
+        future = Future()
+        self._requests.put((item, future))
+        return future
+
+    def _collect(self):
+        while True:
+            request = self._requests.get()
+            if request is _STOP:
+                return
+            batch = [request]
+
+            # Boş worker beklenirken gelen istekler de bu gruba girer
+            self._slots.acquire()
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    request = self._requests.get(block=timeout > 0, timeout=max(timeout, 0))
+                except queue.Empty:
+                    break
+                if request is _STOP:
+                    stop = True
+                    break
+                batch.append(request)
+
+            self._pool.submit(self._run_batch, batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch):
+        try:
+            outputs = self._batch_fn([item for item, _ in batch])
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), output in zip(batch, outputs):
+                future.set_result(output)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Bekleyen grupları bitirip thread'leri kapatır"""
+        self._requests.put(_STOP)
+        self._thread.join()
+        self._pool.shutdown(wait=True)
+
+# =============================================================================
+# Sınıflandırıcı
+# =============================================================================
+
+def _forward(source, target):
+    """Tamamlanmış Future'ın sonucunu (veya hatasını) diğerine aktarır"""
+    error = source.exception()
+    if error is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
+
+class MockupClassifier:
+    """Anahtar kelime ön filtresi + gruplanmış model çıkarımı ile mockup skorlayıcı"""
+
+    def __init__(self, backend, prototypes, threshold=DEFAULT_THRESHOLD,
+                 cache_dir=DEFAULT_CACHE_DIR, batch_size=DEFAULT_BATCH_SIZE,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS, workers=DEFAULT_WORKERS,
+                 fetch_workers=DEFAULT_FETCH_WORKERS, fetcher=download_image):
+        """
+        Args:
+            backend: name özelliği ve embed(list[bytes]) metodu olan model arka ucu
+            prototypes (dict): {"mockup": dizi, "regular": dizi} (load_prototypes)
+            cache_dir (str): Gömme önbelleği klasörü (None ise önbellek kullanılmaz)
+            fetcher (callable): URL alıp görsel baytlarını döndürür
+        """
+        self.backend = backend
+        self.threshold = threshold
+        self._mockup = normalize(prototypes["mockup"])
+        self._regular = normalize(prototypes["regular"])
+        self._cache = EmbeddingCache(cache_dir, backend.name) if cache_dir else None
+        self._fetcher = fetcher
+        self._batcher = BatchScheduler(self._embed_batch, batch_size, max_wait_ms, workers)
+        self._fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers,
+                                              thread_name_prefix="mockup-fetch")
+        self._lock = threading.Lock()
+        self.keyword_hits = 0
+        self.cache_hits = 0
+
+    def _embed_batch(self, images):
+        return normalize(self.backend.embed(images))
+
+    def score_embedding(self, vector):
+        """Gömmenin mockup skoru: en yakın mockup ve normal prototip benzerlik farkı"""
+        mockup_similarity = float((self._mockup @ vector).max())
+        regular_similarity = float((self._regular @ vector).max())
+        margin = (mockup_similarity - regular_similarity) * SCORE_SCALE
+        return 1.0 / (1.0 + math.exp(-margin))
+
+    def _resolve(self, data):
+        """Görsel baytlarının skoru: önbellekte varsa hemen, yoksa model grubundan"""
+        key = image_hash(data)
+        result = Future()
+
+        vector = self._cache.get(key) if self._cache else None
+        if vector is not None:
+            with self._lock:
+                self.cache_hits += 1
+            result.set_result(self.score_embedding(vector))
+            return result
+
+        def embedded(future):
+            try:
+                vector = future.result()
+                if self._cache:
+                    self._cache.put(key, vector)
+                result.set_result(self.score_embedding(vector))
+            except Exception as e:
+                result.set_exception(e)
+
+        self._batcher.submit(data).add_done_callback(embedded)
+        return result
+
+    def submit(self, url, data=None):
+        """
+        Görseli skorlamak üzere kuyruğa ekler (beklemeden döner)
+
+        Args:
+            url (str): Görsel URL'si (anahtar kelime ön filtresi ve indirme için)
+            data (bytes): Görsel zaten indirildiyse içeriği
+
+        Returns:
+            Future: 0-1 arası mockup skoru
+        """
+        if is_mockup_by_filename(url):
+            with self._lock:
+                self.keyword_hits += 1
+            future = Future()
+            future.set_result(max(get_mockup_confidence_score(url), KEYWORD_MATCH_SCORE))
+            return future
+        if data is not None:
+            return self._resolve(data)
+
+        # İndirme thread'leri model grubunu beklemez, sonuç callback ile aktarılır
+        result = Future()
+
+        def fetched(future):
+            try:
+                inner = self._resolve(future.result())
+            except Exception as e:
+                result.set_exception(e)
+                return
+            inner.add_done_callback(lambda done: _forward(done, result))
+
+        self._fetch_pool.submit(self._fetcher, url).add_done_callback(fetched)
+        return result
+
+    def classify(self, urls):
+        """URL listesini skorlar (aynı sırada skor listesi)"""
+        futures = [self.submit(url) for url in urls]
+        return [future.result() for future in futures]
+
+    def is_mockup(self, url, data=None):
+        """Tek görsel için eşik kararı"""
+        return self.submit(url, data).result() >= self.threshold
+
+    def stats(self):
+        """Ön filtre, önbellek ve gruplama sayaçları"""
+        batches = self._batcher.batches
+        return {
+            "keyword_hits": self.keyword_hits,
+            "cache_hits": self.cache_hits,
+            "model_images": self._batcher.items,
+            "batches": batches,
+            "mean_batch_size": round(self._batcher.items / batches, 2) if batches else 0,
+        }
+
+    def close(self):
+        self._fetch_pool.shutdown(wait=True)
+        self._batcher.close()
+
+def apply_mockup_classifier(results, classifier):
+    """
+    Ürünlerin anahtar kelimeyle yakalanmamış görsellerini modelle skorlayıp
+    mockup listelerini günceller. Tüm ürünlerin görselleri birlikte kuyruğa
+    verilir, böylece gruplar ürün sınırlarını aşarak dolar.
+
+    Returns:
+        list: mockup_images alanı güncellenmiş ürün sözlükleri
+    """
+    items = [item.to_dict() if hasattr(item, "to_dict") else dict(item) for item in results]
+
+    pending = []
+    for item in items:
+        known = set(item.get("mockup_images", []) or ())
+        for url in item.get("images", []) or ():
+            if url not in known:
+                pending.append((item, url, classifier.submit(url)))
+
+    found = 0
+    for item, url, future in pending:
+        try:
+            score = future.result()
+        except Exception as e:
+            print(f"⚠️ Görsel sınıflandırılamadı: {url} ({e})")
+            continue
+        if score >= classifier.threshold:
+            item.setdefault("mockup_images", []).append(url)
+            found += 1
+
+    # Mockup listesi görsel sırasını korur
+    for item in items:
+        mockups = set(item.get("mockup_images", []) or ())
+        if mockups:
+            images = item.get("images", []) or []
+            item["mockup_images"] = [u for u in images if u in mockups] + \
+                [u for u in item["mockup_images"] if u not in images]
+
+    print(f"🖼️ Model {len(pending)} görseli skorladı, {found} yeni mockup bulundu")
+    return items
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Product Record - Kompakt Ürün Kaydı
+===================================
+
+Büyük kataloglarda bellek kullanımını azaltmak için ürünleri sözlük yerine
+__slots__ kullanan kompakt kayıtlar olarak tutar:
+
+- Ortak CDN URL önekleri PrefixTable'da bir kez saklanır; kayıtlar önek
+  ID'lerini ve URL soneklerini tek bir bytes bloğunda tutar
+- Mockup görselleri ikinci bir URL listesi yerine görsel listesi üzerinde
+  bitmask olarak işaretlenir
+- Varyasyon ve ölçü metinleri intern edilir
+
+Kayıtlar .get() / [] ile sözlük gibi okunabilir, böylece rapor fonksiyonları
+değişmeden çalışır. to_dict() mevcut JSON şemasını kayıpsız geri üretir.
+
+KULLANIM:
+from product_record import ProductRecord
+
+record = ProductRecord.from_dict(product_data)
+record.get("mockup_images")   # ["https://..."]
+record.to_dict() == product_data  # True
+"""
+
+import sys
+from array import array
+
+# Görsel soneklerini bytes bloğunda ayıran karakter (URL'lerde bulunmaz)
+_SEPARATOR = "\n"
+
+# JSON şemasındaki alanlar (to_dict bu sırayla üretir)
+FIELDS = [
+    "url", "title", "sku", "images", "variations",
+    "mockup_images", "missing_sizes", "image_count"
+]
+
+class PrefixTable:
+    """
+    Ortak URL öneklerini bir kez saklayıp tamsayı ID veren tablo
+    Önek: son iki yol parçasından önceki kısım. CDN URL'lerinde ortak CDN
+    yolu önekte paylaşılır, ürüne özel klasör ve dosya adı sonekte kalır.
+    """
+
+    __slots__ = ("_prefixes", "_index")
+
+    def __init__(self):
+        self._prefixes = []   # önek id -> önek
+        self._index = {}      # önek -> önek id
+
+    def __len__(self):
+        return len(self._prefixes)
+
+    def split(self, url):
+        """URL'yi (önek id, sonek) çiftine ayırır, yeni önekleri tabloya ekler"""
+        cut = url.rfind("/", 0, max(url.rfind("/"), 0)) + 1
+        prefix = url[:cut]
+        prefix_id = self._index.get(prefix)
+        if prefix_id is None:
+            prefix_id = len(self._prefixes)
+            self._prefixes.append(prefix)
+            self._index[prefix] = prefix_id
+        return prefix_id, url[cut:]
+
+    def join(self, prefix_id, suffix):
+        """Önek id ve sonekten URL'yi yeniden oluşturur"""
+        return self._prefixes[prefix_id] + suffix
+
+# Varsayılan ortak önek tablosu
+PREFIX_TABLE = PrefixTable()
+
+def _intern_strings(values):
+    """Metin listesini intern edilmiş tuple'a çevirir"""
+    return tuple(sys.intern(v) if isinstance(v, str) else v for v in values)
+
+class ProductRecord:
+    """Kompakt ürün kaydı (sözlük benzeri okuma arayüzü ile)"""
+
+    __slots__ = (
+        "url", "title", "sku", "image_count", "variations", "missing_sizes",
+        "_prefixes", "_image_prefix_ids", "_image_suffixes", "_mockup_mask",
+        "_mockup_urls", "_extra"
+    )
+
+    def __init__(self, url="", title="", sku="", images=(), mockup_mask=0,
+                 variations=(), missing_sizes=(), image_count=0, prefix_table=PREFIX_TABLE):
+        self.url = url
+        self.title = title
+        self.sku = sku
+        self.image_count = image_count
+        self.variations = _intern_strings(variations)
+        self.missing_sizes = _intern_strings(missing_sizes)
+        self._prefixes = prefix_table
+
+        # Görseller: önek ID dizisi + sonekler tek bir bytes bloğunda
+        prefix_ids = array("I")
+        suffixes = []
+        for img_url in images:
+            prefix_id, suffix = prefix_table.split(img_url)
+            prefix_ids.append(prefix_id)
+            if _SEPARATOR in suffix:
+                raise ValueError(f"Görsel URL'si geçersiz karakter içeriyor: {img_url!r}")
+            suffixes.append(suffix)
+        self._image_prefix_ids = prefix_ids
+        self._image_suffixes = _SEPARATOR.join(suffixes).encode("utf-8")
+
+        self._mockup_mask = mockup_mask
+        self._mockup_urls = None  # Sadece bitmask ile ifade edilemeyen mockup listeleri için
+        self._extra = None        # Şemada olmayan ek alanlar (kayıpsızlık için)
+
+    @classmethod
+    def from_dict(cls, item, prefix_table=PREFIX_TABLE):
+        """Ürün sözlüğünden kompakt kayıt oluşturur"""
+        images = item.get("images", [])
+        mockups = item.get("mockup_images", [])
+
+        mockup_set = set(mockups)
+        mask = 0
+        for position, img_url in enumerate(images):
+            if img_url in mockup_set:
+                mask |= 1 << position
+
+        record = cls(
+            url=item.get("url", ""),
+            title=item.get("title", ""),
+            sku=item.get("sku", ""),
+            images=images,
+            mockup_mask=mask,
+            variations=item.get("variations", []),
+            missing_sizes=item.get("missing_sizes", []),
+            image_count=item.get("image_count", 0),
+            prefix_table=prefix_table,
+        )
+
+        # Bitmask mockup listesini birebir üretemiyorsa (sıra farkı, tekrar,
+        # görsel listesinde olmayan mockup) listeyi olduğu gibi sakla
+        if record.mockup_images != list(mockups):
+            record._mockup_urls = tuple(mockups)
+
+        extra = {k: v for k, v in item.items() if k not in FIELDS}
+        if extra:
+            record._extra = extra
+        return record
+
+    @property
+    def images(self):
+        """Görsel URL listesi"""
+        if not self._image_prefix_ids:
+            return []
+        join = self._prefixes.join
+        suffixes = self._image_suffixes.decode("utf-8").split(_SEPARATOR)
+        return [join(p, s) for p, s in zip(self._image_prefix_ids, suffixes)]
+
+    @property
+    def mockup_images(self):
+        """Mockup görsel URL listesi"""
+        if self._mockup_urls is not None:
+            return list(self._mockup_urls)
+        if not self._mockup_mask:
+            return []
+        mask = self._mockup_mask
+        return [u for position, u in enumerate(self.images) if mask >> position & 1]
+
+    @property
+    def mockup_count(self):
+        """Mockup görsel sayısı (URL'leri çözmeden)"""
+        if self._mockup_urls is not None:
+            return len(self._mockup_urls)
+        return bin(self._mockup_mask).count("1")
+
+    def is_mockup(self, position):
+        """Verilen sıradaki görsel mockup mı"""
+        return bool(self._mockup_mask >> position & 1)
+
+    def get(self, key, default=None):
+        """Sözlük benzeri alan okuma"""
+        if key in FIELDS:
+            value = getattr(self, key)
+            return list(value) if isinstance(value, tuple) else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __getitem__(self, key):
+        if key not in FIELDS and (self._extra is None or key not in self._extra):
+            raise KeyError(key)
+        return self.get(key)
+
+    def __contains__(self, key):
+        return key in FIELDS or (self._extra is not None and key in self._extra)
+
+    def keys(self):
+        return FIELDS + list(self._extra or ())
+
+    def to_dict(self):
+        """Mevcut JSON şemasında sözlük üretir (kayıpsız)"""
+        item = {field: self.get(field) for field in FIELDS}
+        if self._extra:
+            item.update(self._extra)
+        return item
+
+    def __repr__(self):
+        return f"ProductRecord(url={self.url!r}, images={len(self._image_prefix_ids)}, mockups={self.mockup_count})"
+
+def to_jsonable(obj):
+    """json.dump için default: ProductRecord nesnelerini sözlüğe çevirir"""
+    if isinstance(obj, ProductRecord):
+        return obj.to_dict()
+    raise TypeError(f"{type(obj).__name__} JSON'a çevrilemez")
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Profiler - Performans Profil Modülü
+===================================
+
+Scraper ve rapor akışlarını elle sarmalamadan profillemek için yardımcılar.
+Üç mod desteklenir:
+
+- cpu:    cProfile ile deterministik profil (.prof, pstats / snakeviz uyumlu)
+- sample: Örnekleme profili (.folded, flamegraph.pl / speedscope uyumlu)
+- memory: tracemalloc snapshot'ı (.tracemalloc, tracemalloc.Snapshot.load ile açılır)
+
+KULLANIM:
+from profiler import configure_profiling, profile_stage
+
+configure_profiling("cpu", stage="products")
+with profile_stage("products"):
+    ...  # Sadece bu aşama profillenir
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+# Desteklenen profil modları ve çıktı dosya uzantıları
+PROFILE_MODES = {
+    "cpu": "prof",
+    "sample": "folded",
+    "memory": "tracemalloc",
+}
+
+# Profillenebilecek aşamalar ("all" tüm çalışmayı kapsar)
+PROFILE_STAGES = ["all", "links", "products", "report"]
+
+# Ekrana yazdırılacak en sıcak fonksiyon sayısı
+TOP_N = 15
+
+# Örnekleme profili aralığı (saniye)
+SAMPLE_INTERVAL = 0.005
+
+# Aktif profil ayarları (configure_profiling ile doldurulur)
+_settings = {
+    "mode": None,
+    "stage": "all",
+    "output": None,
+}
+
+def configure_profiling(mode, stage="all", output=None):
+    """
+    Profil ayarlarını yapar
+
+    Args:
+        mode (str): "cpu", "sample", "memory" veya None (kapalı)
+        stage (str): Profillenecek aşama (PROFILE_STAGES)
+        output (str): Çıktı dosyası (None ise profil_<aşama>.<uzantı>)
+    """
+    if mode is not None and mode not in PROFILE_MODES:
+        raise ValueError(f"Bilinmeyen profil modu: {mode}")
+    if stage not in PROFILE_STAGES:
+        raise ValueError(f"Bilinmeyen profil aşaması: {stage}")
+
+    _settings["mode"] = mode
+    _settings["stage"] = stage
+    _settings["output"] = output
+
+def _output_path(stage, mode):
+    """Profil çıktı dosyasının yolunu döndürür"""
+    if _settings["output"]:
+        return _settings["output"]
+    return f"profil_{stage}.{PROFILE_MODES[mode]}"
+
+@contextmanager
+def profile_stage(stage):
+    """
+    Verilen aşama profil ayarlarıyla eşleşiyorsa bloğu profiller
+
+    Args:
+        stage (str): Aşama adı ("all", "links", "products", "report")
+    """
+    mode = _settings["mode"]
+    if mode is None or _settings["stage"] != stage:
+        yield
+        return
+
+    output = _output_path(stage, mode)
+    runner = {
+        "cpu": _run_cprofile,
+        "sample": _run_sampling,
+        "memory": _run_tracemalloc,
+    }[mode]
+
+    print(f"🔬 Profil başlatıldı (mod: {mode}, aşama: {stage})")
+    with runner(output):
+        yield
+
+# =============================================================================
+# cProfile
+# =============================================================================
+
+@contextmanager
+def _run_cprofile(output):
+    """cProfile ile profil alır, .prof dosyası yazar ve özet yazdırır"""
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(output)
+        print(f"💾 Profil kaydedildi: {output}")
+        print(f"🔥 En sıcak {TOP_N} fonksiyon (tottime):")
+        stats = pstats.Stats(profiler, stream=sys.stdout)
+        stats.sort_stats("tottime").print_stats(TOP_N)
+
+# =============================================================================
+# Örnekleme profili
+# =============================================================================
+
+def _frame_label(frame):
+    """Stack frame'i flamegraph etiketine çevirir"""
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+def _collect_stack(frame):
+    """Frame zincirini kökten yaprağa doğru etiket listesine çevirir"""
+    stack = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+@contextmanager
+def _run_sampling(output, interval=SAMPLE_INTERVAL):
+    """
+    Arka plan thread'i ile tüm thread'lerin stack'lerini örnekler
+    Sonuçları collapsed-stack (.folded) formatında yazar
+    """
+    samples = Counter()
+    stop_event = threading.Event()
+    sampler_id = None
+
+    def sampler():
+        nonlocal sampler_id
+        sampler_id = threading.get_ident()
+        while not stop_event.is_set():
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id:
+                    continue
+                samples[_collect_stack(frame)] += 1
+            time.sleep(interval)
+
+    thread = threading.Thread(target=sampler, name="profiler-sampler", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop_event.set()
+        thread.join()
+        _write_folded(samples, output)
+        _print_sample_summary(samples)
+
+def _write_folded(samples, output):
+    """Örnekleri flamegraph uyumlu collapsed-stack formatında yazar"""
+    with open(output, "w", encoding="utf-8") as f:
+        for stack, count in samples.most_common():
+            f.write(f"{';'.join(stack)} {count}\n")
+    print(f"💾 Örnekleme profili kaydedildi: {output}")
+
+def _print_sample_summary(samples):
+    """Yaprak (self) örnek sayısına göre en sıcak fonksiyonları yazdırır"""
+    total = sum(samples.values())
+    if total == 0:
+        print("⚠️ Hiç örnek toplanamadı")
+        return
+
+    self_counts = Counter()
+    for stack, count in samples.items():
+        if stack:
+            self_counts[stack[-1]] += count
+
+    print(f"🔥 En sıcak {TOP_N} fonksiyon ({total} örnek):")
+    for label, count in self_counts.most_common(TOP_N):
+        print(f"   {count / total * 100:5.1f}%  {label}")
+
+# =============================================================================
+# tracemalloc
+# =============================================================================
+
+@contextmanager
+def _run_tracemalloc(output, frames=25):
+    """tracemalloc ile bellek snapshot'ı alır ve en çok ayıran satırları yazdırır"""
+    import tracemalloc
+
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start(frames)
+    try:
+        yield
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if not already_tracing:
+            tracemalloc.stop()
+
+        snapshot.dump(output)
+        print(f"💾 Bellek snapshot'ı kaydedildi: {output}")
+        print(f"📈 Bellek: şu an {current / 1024 / 1024:.1f} MB, tepe {peak / 1024 / 1024:.1f} MB")
+        print(f"🔥 En çok bellek ayıran {TOP_N} satır:")
+        for stat in snapshot.statistics("lineno")[:TOP_N]:
+            print(f"   {stat}")
+
+def add_profile_arguments(parser):
+    """argparse parser'ına ortak profil seçeneklerini ekler"""
+    parser.add_argument(
+        "--profile", choices=sorted(PROFILE_MODES), default=None,
+        help="Profil modu: cpu (cProfile), sample (örnekleme), memory (tracemalloc)"
+    )
+    parser.add_argument(
+        "--profile-stage", choices=PROFILE_STAGES, default="all",
+        help="Profillenecek aşama (varsayılan: all)"
+    )
+    parser.add_argument(
+        "--profile-output", default=None,
+        help="Profil çıktı dosyası (varsayılan: profil_<aşama>.<uzantı>)"
+    )
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Report Aggregates - Tek Geçişte Birleştirilebilir Rapor İstatistikleri
+======================================================================
+
+Özet istatistikler, eksik ölçü analizi, mockup analizi ve gerçek ölçü
+analizi için gereken tüm sayaçlar ürünler üzerinden tek geçişte toplanır.
+
+Kısmi durumlar birleştirilebilir (merge) ve JSON olarak kaydedilebilir;
+paralel worker'ların veya farklı günlerin parçaları ham ürün kayıtları
+yeniden okunmadan tek raporda toplanabilir. Parçaların farklı ürünleri
+içerdiği varsayılır (sayaçlar toplanır).
+
+KULLANIM:
+from report_aggregates import ReportAggregate
+
+agg = ReportAggregate.from_results(results)
+agg.merge(ReportAggregate.load("ozet_dun.json"))
+agg.summary_rows()
+
+python report_aggregates.py scraped_products.json -o ozet.json
+python report_aggregates.py ozet_1.json ozet_2.json -o ozet_rapor.xlsx
+"""
+
+import json
+import argparse
+from datetime import datetime
+from collections import Counter
+
+# Kayıt formatı sürümü (load uyumluluk kontrolü için)
+AGGREGATE_VERSION = 1
+
+# Eksik ölçüler sayfasında gösterilen ölçüler
+REPORT_EXPECTED_SIZES = ["30x40", "40x60", "50x70"]
+
+# Gerçek ölçü analizinde dikkate alınan en uzun varyasyon metni
+MAX_SIZE_LENGTH = 20
+
+# Mockup analizinde ürün adının kısaltılacağı uzunluk
+TITLE_PREVIEW_LENGTH = 50
+
+# Toplanan sayaçlar
+_COUNTERS = [
+    "total_products", "sku_count", "variation_count",
+    "missing_sizes_count", "total_images", "total_mockups"
+]
+
+class ReportAggregate:
+    """Rapor sayfalarının tek geçişte toplanan, birleştirilebilir durumu"""
+
+    def __init__(self):
+        self.total_products = 0
+        self.sku_count = 0
+        self.variation_count = 0
+        self.missing_sizes_count = 0
+        self.total_images = 0
+        self.total_mockups = 0
+        self.missing_by_size = Counter()   # Ölçü -> eksik olduğu ürün sayısı
+        self.size_presence = Counter()     # Küçük harf varyasyon -> ürün sayısı
+        self.size_labels = set()           # Gerçek ölçü analizindeki ölçü adları
+        self.mockup_rows = []              # (kısaltılmış ad, görsel sayısı, mockup sayısı)
+
+    @classmethod
+    def from_results(cls, results):
+        """Ürün listesinden (veya generator'dan) tek geçişte durum oluşturur"""
+        aggregate = cls()
+        for item in results:
+            aggregate.add(item)
+        return aggregate
+
+    def add(self, item):
+        """Tek bir ürünü sayaçlara ekler (sözlük veya ProductRecord)"""
+        self.total_products += 1
+
+        image_count = item.get("image_count", 0) or 0
+        mockup_count = getattr(item, "mockup_count", None)
+        if mockup_count is None:
+            mockup_count = len(item.get("mockup_images", []) or ())
+        self.total_images += image_count
+        self.total_mockups += mockup_count
+
+        sku = item.get("sku")
+        if sku and sku != "SKU Bulunamadı":
+            self.sku_count += 1
+
+        variations = item.get("variations", []) or []
+        if variations:
+            self.variation_count += 1
+
+        missing_sizes = item.get("missing_sizes", []) or []
+        if missing_sizes:
+            self.missing_sizes_count += 1
+        self.missing_by_size.update(set(missing_sizes))
+
+        # Ölçü varlığı büyük/küçük harften bağımsız, ürün başına bir kez sayılır
+        self.size_presence.update({str(v).lower() for v in variations})
+        for variation in variations:
+            label = str(variation).strip()
+            if len(label) < MAX_SIZE_LENGTH:
+                self.size_labels.add(label)
+
+        title = item.get("title", "Başlık Bulunamadı")
+        if len(title) > TITLE_PREVIEW_LENGTH:
+            title = title[:TITLE_PREVIEW_LENGTH] + "..."
+        self.mockup_rows.append((title, image_count, mockup_count))
+
+    def merge(self, other):
+        """Başka bir kısmi durumu bu duruma ekler"""
+        for name in _COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.missing_by_size.update(other.missing_by_size)
+        self.size_presence.update(other.size_presence)
+        self.size_labels |= other.size_labels
+        self.mockup_rows.extend(other.mockup_rows)
+        return self
+
+    def __add__(self, other):
+        return ReportAggregate().merge(self).merge(other)
+
+    # -------------------------------------------------------------------------
+    # Rapor sayfaları
+    # -------------------------------------------------------------------------
+
+    def summary_rows(self):
+        """Özet İstatistikler sayfası"""
+        if not self.total_products:
+            return []
+
+        total_products = self.total_products
+        total_images = self.total_images
+        return [
+            {"Metrik": "Toplam Ürün Sayısı", "Değer": total_products},
+            {"Metrik": "SKU'lu Ürün Sayısı", "Değer": self.sku_count},
+            {"Metrik": "Varyasyonlu Ürün Sayısı", "Değer": self.variation_count},
+            {"Metrik": "Eksik Ölçülü Ürün Sayısı", "Değer": self.missing_sizes_count},
+            {"Metrik": "Toplam Görsel Sayısı", "Değer": total_images},
+            {"Metrik": "Toplam Mockup Sayısı", "Değer": self.total_mockups},
+            {"Metrik": "Ortalama Görsel/Ürün", "Değer": round(total_images / total_products, 2)},
+            {"Metrik": "Mockup Oranı (%)", "Değer": round((self.total_mockups / total_images) * 100, 2) if total_images > 0 else 0},
+            {"Metrik": "Rapor Oluşturma Tarihi", "Değer": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        ]
+
+    def missing_sizes_rows(self, expected_sizes=REPORT_EXPECTED_SIZES):
+        """Eksik Ölçüler Analizi sayfası"""
+        if not self.total_products:
+            return []
+
+        rows = []
+        for size in expected_sizes:
+            missing_count = self.missing_by_size.get(size, 0)
+            rows.append({
+                "Ölçü": size,
+                "Mevcut Ürün Sayısı": self.total_products - missing_count,
+                "Eksik Ürün Sayısı": missing_count,
+                "Eksiklik Oranı (%)": round((missing_count / self.total_products) * 100, 2)
+            })
+        return rows
+
+    def mockup_analysis_rows(self):
+        """Mockup Analizi sayfası (ürün başına bir satır)"""
+        rows = []
+        for title, total_images, mockup_count in self.mockup_rows:
+            mockup_ratio = mockup_count / total_images if total_images > 0 else 0
+            rows.append({
+                "Ürün Adı": title,
+                "Toplam Görsel": total_images,
+                "Mockup Sayısı": mockup_count,
+                "Mockup Oranı (%)": round(mockup_ratio * 100, 2),
+                "Mockup Durumu": "Mockup Var" if mockup_count else "Mockup Yok"
+            })
+        return rows
+
+    def all_sizes_rows(self):
+        """Gercek Olculer Analizi sayfası (hangi ölçü kaç üründe var/eksik)"""
+        if not self.total_products:
+            return []
+
+        total = self.total_products
+        rows = []
+        for size in sorted(self.size_labels):
+            products_with = self.size_presence.get(size.lower(), 0)
+            rows.append({
+                "Olcu": size,
+                "Mevcut Urun Sayisi": products_with,
+                "Eksik Urun Sayisi": total - products_with,
+                "Toplam Urun": total,
+                "Varlik Orani (%)": round((products_with / total * 100), 2),
+                "Durum": "Mevcut" if products_with > 0 else "Eksik"
+            })
+        return rows
+
+    # -------------------------------------------------------------------------
+    # Kaydetme / yükleme
+    # -------------------------------------------------------------------------
+
+    def to_dict(self):
+        """JSON'a yazılabilir durum"""
+        state = {name: getattr(self, name) for name in _COUNTERS}
+        state.update({
+            "aggregate_version": AGGREGATE_VERSION,
+            "missing_by_size": dict(self.missing_by_size),
+            "size_presence": dict(self.size_presence),
+            "size_labels": sorted(self.size_labels),
+            "mockup_rows": [list(row) for row in self.mockup_rows],
+        })
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        """to_dict() çıktısından durum oluşturur"""
+        if state.get("aggregate_version") != AGGREGATE_VERSION:
+            raise ValueError(f"Desteklenmeyen özet sürümü: {state.get('aggregate_version')}")
+        aggregate = cls()
+        for name in _COUNTERS:
+            setattr(aggregate, name, state[name])
+        aggregate.missing_by_size = Counter(state["missing_by_size"])
+        aggregate.size_presence = Counter(state["size_presence"])
+        aggregate.size_labels = set(state["size_labels"])
+        aggregate.mockup_rows = [tuple(row) for row in state["mockup_rows"]]
+        return aggregate
+
+    def save(self, filename):
+        """Durumu JSON dosyasına kaydeder"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        print(f"💾 Rapor özeti kaydedildi: {filename}")
+
+    @classmethod
+    def load(cls, filename):
+        """save() ile kaydedilmiş durumu okur"""
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+def load_aggregate(filename):
+    """
+    Özet dosyasını veya ham scraped_products.json dosyasını okuyup durum döndürür
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and "aggregate_version" in data:
+        return ReportAggregate.from_dict(data)
+    return ReportAggregate.from_results(data)
+
+def write_aggregate_report(aggregate, filename):
+    """Sadece özet sayfalarından oluşan Excel raporu yazar (ham kayıt gerekmez)"""
+    import pandas as pd
+
+    sheets = [
+        ("Özet İstatistikler", aggregate.summary_rows()),
+        ("Eksik Ölçüler Analizi", aggregate.missing_sizes_rows()),
+        ("Mockup Analizi", aggregate.mockup_analysis_rows()),
+        ("Gercek Olculer Analizi", aggregate.all_sizes_rows()),
+    ]
+    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+        for sheet_name, rows in sheets:
+            pd.DataFrame(rows).to_excel(writer, sheet_name=sheet_name, index=False)
+    print(f"✅ Özet raporu oluşturuldu: {filename} ({aggregate.total_products} ürün)")
+
+def main(argv=None):
+    """Özet dosyalarını / ham sonuçları birleştirip JSON özet veya Excel raporu yazar"""
+    parser = argparse.ArgumentParser(
+        description="Rapor özetlerini birleştirir (ham ürün kayıtlarını yeniden okumadan)"
+    )
+    parser.add_argument("inputs", nargs="+", help="Özet JSON dosyaları veya scraped_products.json")
+    parser.add_argument("-o", "--output", default="ozet_rapor.xlsx",
+                        help="Çıktı: .json ise birleştirilmiş özet, değilse Excel raporu")
+    args = parser.parse_args(argv)
+
+    aggregate = ReportAggregate()
+    for filename in args.inputs:
+        aggregate.merge(load_aggregate(filename))
+
+    if args.output.endswith(".json"):
+        aggregate.save(args.output)
+    else:
+        write_aggregate_report(aggregate, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Report Generator - Excel Rapor Oluşturucu
 
 Bu modül scraping sonuçlarını Excel formatında raporlar.
 Pandas DataFrame kullanarak profesyonel Excel dosyaları oluşturur.
+Pandas sadece rapor yazılırken import edilir (hızlı başlangıç için).
 
 KULLANIM:
 from report_generator import generate_excel_report
@@ -14,18 +15,50 @@ results = [...]  # Scraping sonuçları
 generate_excel_report(results, "rapor.xlsx")
 """
 
-import pandas as pd
 from datetime import datetime
 import os
+import json
+import argparse
 
-def generate_excel_report(results, filename="rapor.xlsx"):
+# Excel'in sayfa başına satır limiti
+EXCEL_MAX_ROWS = 1048576
+
+# Bu sayıdan fazla üründe detaylı rapor uzun formata geçer
+DETAILED_SHEETS_LIMIT = 50
+
+# Uzun format detaylı rapor kolonları
+LONG_PRODUCT_COLUMNS = [
+    "Ürün ID", "Ürün Adı", "SKU", "URL", "Görsel Sayısı",
+    "Mockup Sayısı", "Varyasyon Sayısı", "Mevcut Ölçüler", "Eksik Ölçüler"
+]
+LONG_IMAGE_COLUMNS = ["Ürün ID", "Görsel No", "URL", "Mockup"]
+
+# Ana rapor sayfası kolonları
+REPORT_COLUMNS = [
+    "Ürün Adı", "Ürün Kodu", "Ürün URL", "Mevcut Ölçüler", "Eksik Ölçüler",
+    "Eksik Mokaplar", "Görsel Sayısı", "Mockup Sayısı", "Toplam Varyasyon"
+]
+
+try:
+    from .profiler import add_profile_arguments, configure_profiling, profile_stage
+    from .report_aggregates import ReportAggregate
+except ImportError:
+    from profiler import add_profile_arguments, configure_profiling, profile_stage
+    from report_aggregates import ReportAggregate
+
+def generate_excel_report(results, filename="rapor.xlsx", aggregate=None):
     """
     Scraping sonuçlarını Excel raporu olarak kaydeder
+    Ana rapor satırları ve tüm özet sayfalarının istatistikleri tek geçişte toplanır
     
     Args:
         results (list): Scraping sonuçları listesi
         filename (str): Çıktı Excel dosya adı
+        aggregate (ReportAggregate): Özet sayfaları için hazır (örn. birleştirilmiş)
+            durum; verilmezse results üzerinden hesaplanır
     """
+    import pandas as pd
+
     print(f"📊 Excel raporu oluşturuluyor: {filename}")
     
     if not results:
@@ -33,10 +66,16 @@ def generate_excel_report(results, filename="rapor.xlsx"):
         return
     
     try:
-        # DataFrame için veri hazırla
+        # DataFrame için veri hazırla (özet istatistikler aynı geçişte toplanır)
         report_data = []
+        collect = aggregate is None
+        if collect:
+            aggregate = ReportAggregate()
         
         for item in results:
+            if collect:
+                aggregate.add(item)
+            
             # Temel bilgiler
             title = item.get("title", "Başlık Bulunamadı")
             sku = item.get("sku", "SKU Bulunamadı")
@@ -73,190 +112,150 @@ def generate_excel_report(results, filename="rapor.xlsx"):
             
             report_data.append(row_data)
         
-        # DataFrame oluştur
-        df = pd.DataFrame(report_data)
-        
-        # Excel yazıcı ayarları
-        excel_writer = pd.ExcelWriter(filename, engine='openpyxl')
-        
-        # Ana rapor sayfası
-        df.to_excel(excel_writer, sheet_name='Ana Rapor', index=False)
-        
-        # Özet istatistikler sayfası
-        summary_data = create_summary_statistics(results)
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(excel_writer, sheet_name='Özet İstatistikler', index=False)
-        
-        # Eksik ölçüler analizi sayfası
-        missing_analysis = create_missing_sizes_analysis(results)
-        missing_df = pd.DataFrame(missing_analysis)
-        missing_df.to_excel(excel_writer, sheet_name='Eksik Ölçüler Analizi', index=False)
-        
-        # Mockup analizi sayfası
-        mockup_analysis = create_mockup_analysis(results)
-        mockup_df = pd.DataFrame(mockup_analysis)
-        mockup_df.to_excel(excel_writer, sheet_name='Mockup Analizi', index=False)
-        
-        # Tüm ölçüler analizi sayfası (yeni - gerçek ölçülerin analizi)
-        all_sizes_analysis = create_all_sizes_analysis(results)
-        sizes_df = pd.DataFrame(all_sizes_analysis)
-        sizes_df.to_excel(excel_writer, sheet_name='Gercek Olculer Analizi', index=False)
-        
-        # Excel dosyasını kaydet
-        excel_writer.close()
-        
-        print(f"✅ Excel raporu başarıyla oluşturuldu: {filename}")
-        print(f"📈 Toplam {len(results)} ürün raporlandı")
-        
-        # Dosya boyutunu göster
-        file_size = os.path.getsize(filename) / 1024  # KB
-        print(f"📁 Dosya boyutu: {file_size:.1f} KB")
+        _write_report_workbook(pd.DataFrame(report_data, columns=REPORT_COLUMNS), aggregate, filename, len(results))
         
     except Exception as e:
         print(f"❌ Excel raporu oluşturma hatası: {e}")
         raise
 
-def create_summary_statistics(results):
-    """Özet istatistikler oluşturur"""
-    if not results:
-        return []
+def generate_excel_report_from_parquet(directory, filename="rapor.xlsx", filters=None):
+    """
+    Parquet tablolarından Excel raporu oluşturur
+    Ana rapor ve özet sayfaları ürün sözlükleri oluşturulmadan, sadece
+    gereken kolonlar okunarak hesaplanır; filtreler Parquet okumasına iletilir
     
-    total_products = len(results)
-    total_images = sum(item.get("image_count", 0) for item in results)
-    total_mockups = sum(len(item.get("mockup_images", [])) for item in results)
+    Args:
+        directory (str): Parquet tablo klasörü
+        filename (str): Çıktı Excel dosya adı
+        filters (list): products tablosuna uygulanacak pyarrow filtreleri
+    """
+    import numpy as np
+    try:
+        from .columnar_store import report_aggregate, report_table
+    except ImportError:
+        from columnar_store import report_aggregate, report_table
+
+    print(f"📊 Excel raporu oluşturuluyor: {filename}")
     
-    # SKU'lu ürün sayısı
-    sku_count = sum(1 for item in results if item.get("sku") and item.get("sku") != "SKU Bulunamadı")
+    table = report_table(directory, filters)
+    if not table.num_rows:
+        print("⚠️ Rapor edilecek veri bulunamadı!")
+        return
     
-    # Varyasyonlu ürün sayısı
-    variation_count = sum(1 for item in results if item.get("variations"))
+    try:
+        # Satır metinleri generate_excel_report ile aynı, kolon bazında üretilir
+        columns = table.to_pandas()
+        mockup_count = columns["mockup_count"]
+        df = columns.assign(
+            variations=columns["variations"].fillna("Varyasyon Bulunamadı"),
+            missing_sizes=columns["missing_sizes"].fillna("Tüm Ölçüler Mevcut"),
+            mockup_str=np.where(mockup_count > 0, mockup_count.astype(str) + " adet mockup",
+                                "Mockup Bulunamadı"),
+        ).rename(columns={
+            "title": "Ürün Adı", "sku": "Ürün Kodu", "url": "Ürün URL",
+            "variations": "Mevcut Ölçüler", "missing_sizes": "Eksik Ölçüler",
+            "mockup_str": "Eksik Mokaplar", "image_count": "Görsel Sayısı",
+            "mockup_count": "Mockup Sayısı", "variation_count": "Toplam Varyasyon",
+        })[REPORT_COLUMNS]
+        _write_report_workbook(df, report_aggregate(directory, filters), filename, len(df))
+        
+    except Exception as e:
+        print(f"❌ Excel raporu oluşturma hatası: {e}")
+        raise
+
+def _write_report_workbook(df, aggregate, filename, product_count):
+    """Ana rapor ve özet sayfalarını Excel dosyasına yazar"""
+    import pandas as pd
+
+    # Excel yazıcı ayarları
+    excel_writer = pd.ExcelWriter(filename, engine='openpyxl')
     
-    # Eksik ölçülü ürün sayısı
-    missing_sizes_count = sum(1 for item in results if item.get("missing_sizes"))
+    # Ana rapor sayfası
+    df.to_excel(excel_writer, sheet_name='Ana Rapor', index=False)
     
-    summary_data = [
-        {"Metrik": "Toplam Ürün Sayısı", "Değer": total_products},
-        {"Metrik": "SKU'lu Ürün Sayısı", "Değer": sku_count},
-        {"Metrik": "Varyasyonlu Ürün Sayısı", "Değer": variation_count},
-        {"Metrik": "Eksik Ölçülü Ürün Sayısı", "Değer": missing_sizes_count},
-        {"Metrik": "Toplam Görsel Sayısı", "Değer": total_images},
-        {"Metrik": "Toplam Mockup Sayısı", "Değer": total_mockups},
-        {"Metrik": "Ortalama Görsel/Ürün", "Değer": round(total_images / total_products, 2) if total_products > 0 else 0},
-        {"Metrik": "Mockup Oranı (%)", "Değer": round((total_mockups / total_images) * 100, 2) if total_images > 0 else 0},
-        {"Metrik": "Rapor Oluşturma Tarihi", "Değer": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-    ]
+    # Özet istatistikler sayfası
+    summary_df = pd.DataFrame(aggregate.summary_rows())
+    summary_df.to_excel(excel_writer, sheet_name='Özet İstatistikler', index=False)
     
-    return summary_data
-
-def create_missing_sizes_analysis(results):
-    """Eksik ölçüler analizi oluşturur"""
-    if not results:
-        return []
+    # Eksik ölçüler analizi sayfası
+    missing_df = pd.DataFrame(aggregate.missing_sizes_rows())
+    missing_df.to_excel(excel_writer, sheet_name='Eksik Ölçüler Analizi', index=False)
     
-    # Beklenen ölçüler
-    expected_sizes = ["30x40", "40x60", "50x70"]
+    # Mockup analizi sayfası
+    mockup_df = pd.DataFrame(aggregate.mockup_analysis_rows())
+    mockup_df.to_excel(excel_writer, sheet_name='Mockup Analizi', index=False)
     
-    analysis_data = []
+    # Tüm ölçüler analizi sayfası (yeni - gerçek ölçülerin analizi)
+    sizes_df = pd.DataFrame(aggregate.all_sizes_rows())
+    sizes_df.to_excel(excel_writer, sheet_name='Gercek Olculer Analizi', index=False)
     
-    for size in expected_sizes:
-        missing_count = sum(1 for item in results if size in item.get("missing_sizes", []))
-        available_count = len(results) - missing_count
-        
-        analysis_data.append({
-            "Ölçü": size,
-            "Mevcut Ürün Sayısı": available_count,
-            "Eksik Ürün Sayısı": missing_count,
-            "Eksiklik Oranı (%)": round((missing_count / len(results)) * 100, 2) if len(results) > 0 else 0
-        })
+    # Excel dosyasını kaydet
+    excel_writer.close()
     
-    return analysis_data
+    print(f"✅ Excel raporu başarıyla oluşturuldu: {filename}")
+    print(f"📈 Toplam {product_count} ürün raporlandı")
+    
+    # Dosya boyutunu göster
+    file_size = os.path.getsize(filename) / 1024  # KB
+    print(f"📁 Dosya boyutu: {file_size:.1f} KB")
+
+def export_query_result(rows, filename="sorgu_sonucu.xlsx", query=None):
+    """
+    Serbest katalog sorgusunun satırlarını Excel'e yazar
+    (Ürün sorguları generate_excel_report ile tam rapor olarak yazılır)
+    
+    Args:
+        rows (list): Kolon adı -> değer sözlükleri
+        filename (str): Çıktı Excel dosya adı
+        query (str): Verilirse ayrı sayfaya yazılan SQL metni
+    """
+    import pandas as pd
+
+    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+        pd.DataFrame(rows).to_excel(writer, sheet_name='Sorgu Sonucu', index=False)
+        if query:
+            pd.DataFrame([{"Sorgu": query}]).to_excel(writer, sheet_name='Sorgu', index=False)
+    print(f"✅ Sorgu sonucu Excel'e yazıldı: {filename} ({len(rows)} satır)")
+
+def create_summary_statistics(results):
+    """Özet istatistikler oluşturur"""
+    return ReportAggregate.from_results(results).summary_rows()
+
+def create_missing_sizes_analysis(results):
+    """Eksik ölçüler analizi oluşturur"""
+    return ReportAggregate.from_results(results).missing_sizes_rows()
 
 def create_mockup_analysis(results):
     """Mockup analizi oluşturur"""
-    if not results:
-        return []
-    
-    analysis_data = []
-    
-    for item in results:
-        title = item.get("title", "Başlık Bulunamadı")
-        mockup_images = item.get("mockup_images", [])
-        total_images = item.get("image_count", 0)
-        
-        if total_images > 0:
-            mockup_ratio = len(mockup_images) / total_images
-        else:
-            mockup_ratio = 0
-        
-        analysis_data.append({
-            "Ürün Adı": title[:50] + "..." if len(title) > 50 else title,
-            "Toplam Görsel": total_images,
-            "Mockup Sayısı": len(mockup_images),
-            "Mockup Oranı (%)": round(mockup_ratio * 100, 2),
-            "Mockup Durumu": "Mockup Var" if mockup_images else "Mockup Yok"
-        })
-    
-    return analysis_data
+    return ReportAggregate.from_results(results).mockup_analysis_rows()
 
 def create_all_sizes_analysis(results):
     """
     Gerçek ürünlerden toplanan tüm ölçülerin analizini oluşturur
-    Hangi ölçünün kaç ürün
-
-de var/eksik olduğunu gösterir
+    Hangi ölçünün kaç üründe var/eksik olduğunu gösterir
     """
-    if not results:
-        return []
-    
-    # Tüm benzersiz ölçüleri topla
-    all_sizes = set()
-    for item in results:
-        variations = item.get("variations", [])
-        for var in variations:
-            # Ölçü formatı olabilir (örn: "30x40", "40x60 cm", "XL", "S")
-            var_clean = str(var).strip()
-            if len(var_clean) < 20:  # Çok uzun metinleri filtrele
-                all_sizes.add(var_clean)
-    
-    # Her ölçü için istatistik
-    analysis_data = []
-    for size in sorted(all_sizes):
-        products_with = 0
-        products_without = 0
-        products_with_list = []
-        products_without_list = []
-        
-        for item in results:
-            variations = item.get("variations", [])
-            if size in variations or size.lower() in [v.lower() for v in variations]:
-                products_with += 1
-                products_with_list.append(item.get("title", "Bilinmeyen"))
-            else:
-                products_without += 1
-                products_without_list.append(item.get("title", "Bilinmeyen"))
-        
-        total = len(results)
-        existence_rate = round((products_with / total * 100), 2) if total > 0 else 0
-        
-        analysis_data.append({
-            "Olcu": size,
-            "Mevcut Urun Sayisi": products_with,
-            "Eksik Urun Sayisi": products_without,
-            "Toplam Urun": total,
-            "Varlik Orani (%)": existence_rate,
-            "Durum": "Mevcut" if products_with > 0 else "Eksik"
-        })
-    
-    return analysis_data
+    return ReportAggregate.from_results(results).all_sizes_rows()
 
-def create_detailed_product_report(results, filename="detayli_rapor.xlsx"):
+def create_detailed_product_report(results, filename="detayli_rapor.xlsx", mode="auto"):
     """
     Detaylı ürün raporu oluşturur (görsel URL'leri dahil)
     
     Args:
         results (list): Scraping sonuçları
         filename (str): Çıktı dosya adı
+        mode (str): "sheets" (her ürün ayrı sayfa), "long" (uzun format,
+                    akış halinde yazım) veya "auto" (ürün sayısına göre seçer)
     """
+    if mode == "auto":
+        # Uzunluğu bilinmeyen (generator) girdiler her zaman akış halinde yazılır
+        small = hasattr(results, "__len__") and len(results) <= DETAILED_SHEETS_LIMIT
+        mode = "sheets" if small else "long"
+
+    if mode == "long":
+        return create_long_format_product_report(results, filename)
+
+    import pandas as pd
+
     print(f"📊 Detaylı Excel raporu oluşturuluyor: {filename}")
     
     try:
@@ -306,6 +305,111 @@ def create_detailed_product_report(results, filename="detayli_rapor.xlsx"):
     except Exception as e:
         print(f"❌ Detaylı rapor oluşturma hatası: {e}")
 
+def _shard_filename(filename, shard_no):
+    """Parça numarasına göre dosya adı üretir (ilk parça orijinal adı kullanır)"""
+    if shard_no == 1:
+        return filename
+    base, ext = os.path.splitext(filename)
+    return f"{base}_{shard_no}{ext}"
+
+def _open_long_format_workbook():
+    """Uzun format rapor için write-only (akış) çalışma kitabı açar"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    products_sheet = workbook.create_sheet("Ürünler")
+    products_sheet.append(LONG_PRODUCT_COLUMNS)
+    images_sheet = workbook.create_sheet("Görseller")
+    images_sheet.append(LONG_IMAGE_COLUMNS)
+    return workbook, products_sheet, images_sheet
+
+def create_long_format_product_report(results, filename="detayli_rapor.xlsx", max_rows=EXCEL_MAX_ROWS):
+    """
+    Ölçeklenebilir detaylı rapor oluşturur
+    Ürünler ve görseller iki uzun format sayfaya satır satır (akış halinde)
+    yazılır ve "Ürün ID" kolonu ile birbirine bağlanır. Sayfa satır limiti
+    aşılacaksa yeni bir çalışma kitabına (detayli_rapor_2.xlsx, ...) geçilir.
+    Görselleri tek sayfaya sığmayan ürün parçalara bölünür; ürün satırı her
+    parçada tekrar yazılır.
+    
+    Args:
+        results (iterable): Scraping sonuçları (liste veya generator)
+        filename (str): İlk çıktı dosyasının adı
+        max_rows (int): Sayfa başına maksimum satır (başlık dahil)
+        
+    Returns:
+        list: Oluşturulan dosya adları
+    """
+    print(f"📊 Detaylı Excel raporu (uzun format) oluşturuluyor: {filename}")
+    
+    filenames = []
+    shard_no = 1
+    workbook, products_sheet, images_sheet = _open_long_format_workbook()
+    product_rows = image_rows = 1  # Başlık satırları
+    
+    def next_shard():
+        nonlocal shard_no, workbook, products_sheet, images_sheet, product_rows, image_rows
+        shard_filename = _shard_filename(filename, shard_no)
+        workbook.save(shard_filename)
+        filenames.append(shard_filename)
+        print(f"📁 Parça kaydedildi: {shard_filename} ({product_rows - 1} ürün satırı)")
+        
+        shard_no += 1
+        workbook, products_sheet, images_sheet = _open_long_format_workbook()
+        product_rows = image_rows = 1
+    
+    try:
+        for product_id, item in enumerate(results, 1):
+            images = item.get("images", [])
+            mockup_list = item.get("mockup_images", [])
+            mockup_images = set(mockup_list)
+            product_row = [
+                product_id,
+                item.get("title", ""),
+                item.get("sku", ""),
+                item.get("url", ""),
+                item.get("image_count", 0),
+                len(mockup_list),
+                len(item.get("variations", [])),
+                ", ".join(item.get("variations", [])),
+                ", ".join(item.get("missing_sizes", []))
+            ]
+            
+            # Bu ürün mevcut parçaya sığmıyorsa yeni çalışma kitabına geç
+            if product_rows > 1 and (product_rows + 1 > max_rows or image_rows + len(images) > max_rows):
+                next_shard()
+            
+            if len(images) > max_rows - 1:
+                print(f"⚠️ Ürün {product_id} görselleri ({len(images)}) sayfa limitini aşıyor, "
+                      f"birden fazla parçaya bölünüyor")
+            
+            products_sheet.append(product_row)
+            product_rows += 1
+            
+            for j, img_url in enumerate(images):
+                if image_rows + 1 > max_rows:
+                    # Kalan görseller yeni parçaya, ürün satırı tekrarlanarak yazılır
+                    next_shard()
+                    products_sheet.append(product_row)
+                    product_rows += 1
+                images_sheet.append([
+                    product_id,
+                    j + 1,
+                    img_url,
+                    "Evet" if img_url in mockup_images else "Hayır"
+                ])
+                image_rows += 1
+        
+        shard_filename = _shard_filename(filename, shard_no)
+        workbook.save(shard_filename)
+        filenames.append(shard_filename)
+        print(f"✅ Detaylı rapor oluşturuldu: {', '.join(filenames)}")
+        
+    except Exception as e:
+        print(f"❌ Detaylı rapor oluşturma hatası: {e}")
+    
+    return filenames
+
 # Test fonksiyonu
 def test_report_generation():
     """Rapor oluşturma fonksiyonunu test eder"""
@@ -335,8 +439,73 @@ def test_report_generation():
     
     print("🧪 Rapor oluşturma testi:")
     generate_excel_report(test_results, "test_rapor.xlsx")
+    test_long_format_sharding()
     print("✅ Test tamamlandı!")
 
+def test_long_format_sharding():
+    """Sayfa limitini aşan ürünün parçalara bölündüğünü ve mockup sayısını test eder"""
+    import tempfile
+    from openpyxl import load_workbook
+
+    print("🧪 Uzun format parça testi:")
+    results = [
+        {"title": "Küçük", "images": ["a1.jpg", "a2.jpg"], "mockup_images": ["a1.jpg", "a1.jpg"]},
+        {"title": "Büyük", "images": [f"b{i}.jpg" for i in range(10)], "mockup_images": []},
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        filenames = create_long_format_product_report(results, os.path.join(tmp, "detay.xlsx"), max_rows=5)
+        products, images, sheet_rows = [], [], []
+        for name in filenames:
+            workbook = load_workbook(name, read_only=True)
+            product_sheet, image_sheet = workbook.worksheets[:2]
+            product_rows = list(product_sheet.iter_rows(values_only=True))
+            image_rows = list(image_sheet.iter_rows(values_only=True))
+            products.extend(product_rows[1:])
+            images.extend(image_rows[1:])
+            sheet_rows.append(max(len(product_rows), len(image_rows)))
+            workbook.close()
+
+    test_cases = [
+        ("sayfa satır limiti aşılmaz", max(sheet_rows) <= 5, True),
+        ("tüm görseller yazıldı", [row[2] for row in images if row[0] == 2],
+         [f"b{i}.jpg" for i in range(10)]),
+        ("bölünen ürün her parçada", sum(1 for row in products if row[0] == 2), len(filenames) - 1),
+        ("mockup sayısı (sayfa raporu ile aynı)", [row[5] for row in products if row[0] == 1], [2]),
+    ]
+    for name, result, expected in test_cases:
+        status = "✅" if result == expected else "❌"
+        print(f"{status} {name}: {result!r} (beklenen: {expected!r})")
+
+def main(argv=None):
+    """
+    Komut satırı giriş noktası
+    JSON dosyası verilirse ondan rapor üretir, verilmezse test raporu oluşturur
+    """
+    parser = argparse.ArgumentParser(description="Scraping sonuçlarından Excel raporu oluşturur")
+    parser.add_argument("input", nargs="?", default=None, help="scraped_products.json dosyası")
+    parser.add_argument("-o", "--output", default="rapor.xlsx", help="Çıktı Excel dosyası")
+    parser.add_argument("--detailed", action="store_true", help="Detaylı ürün raporu oluştur")
+    parser.add_argument("--detailed-mode", choices=["auto", "sheets", "long"], default="auto",
+                        help="Detaylı rapor modu (varsayılan: auto)")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    configure_profiling(args.profile, args.profile_stage, args.profile_output)
+
+    with profile_stage("all"):
+        if args.input is None:
+            # Test çalıştır
+            test_report_generation()
+            return
+
+        with open(args.input, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+
+        with profile_stage("report"):
+            if args.detailed:
+                create_detailed_product_report(results, args.output, mode=args.detailed_mode)
+            else:
+                generate_excel_report(results, args.output)
+
 if __name__ == "__main__":
-    # Test çalıştır
-    test_report_generation()
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Retry Queue - Ertelenmiş Tekrar Deneme Kuyruğu
+==============================================
+
+Başarısız URL'ler taramayı bloklamadan ayrı bir kuyruğa ertelenir ve
+üstel backoff + jitter ile belirlenen süre dolunca tekrar denenir.
+Circuit breaker, son isteklerdeki hata oranı yükseldiğinde taramayı duraklatır.
+
+KULLANIM:
+from retry_queue import RetryQueue, CircuitBreaker
+
+queue = RetryQueue(max_attempts=3)
+delay = queue.record_failure(url, "timeout")  # None ise vazgeçildi
+url = queue.pop_ready()                       # Süresi dolan URL veya None
+"""
+
+import time
+import heapq
+import random
+import itertools
+from collections import deque
+
+# Varsayılan ayarlar
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 5.0      # İlk tekrar denemeden önceki bekleme (saniye)
+DEFAULT_MAX_DELAY = 120.0     # Backoff üst sınırı (saniye)
+
+DEFAULT_WINDOW = 20           # Hata oranı için son N istek
+DEFAULT_FAILURE_RATE = 0.5    # Bu oranın üzerinde tarama duraklatılır
+DEFAULT_MIN_SAMPLES = 10      # Oran hesaplanmadan önce gereken istek sayısı
+DEFAULT_COOLDOWN = 60.0       # Duraklatma süresi (saniye)
+
+def backoff_delay(attempt, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY):
+    """
+    Üstel backoff + jitter ile bekleme süresi hesaplar
+    Sürenin yarısı sabit, yarısı rastgeledir (eşzamanlı tekrarları dağıtır)
+    """
+    delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+class RetryQueue:
+    """Başarısız URL'leri hazır olma zamanına göre sıralı tutan kuyruk"""
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY, clock=time.monotonic):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._heap = []                 # (hazır olma zamanı, sıra, url)
+        self._counter = itertools.count()
+        self._attempts = {}             # url -> başarısız deneme sayısı
+        self._reasons = {}              # url -> [hata nedenleri]
+        self._recovered = set()         # Tekrar denemede başarılı olan URL'ler
+        self._given_up = []             # Deneme hakkı biten URL'ler
+
+    def __len__(self):
+        return len(self._heap)
+
+    def attempts(self, url):
+        """URL'nin şimdiye kadarki başarısız deneme sayısı"""
+        return self._attempts.get(url, 0)
+
+    def record_failure(self, url, reason):
+        """
+        Başarısız denemeyi kaydeder ve hakkı kaldıysa URL'yi kuyruğa erteler
+
+        Returns:
+            float: Tekrar denemeye kadar bekleme süresi, vazgeçildiyse None
+        """
+        attempts = self._attempts.get(url, 0) + 1
+        self._attempts[url] = attempts
+        self._reasons.setdefault(url, []).append(reason)
+
+        if attempts >= self.max_attempts:
+            self._given_up.append(url)
+            return None
+
+        delay = backoff_delay(attempts, self.base_delay, self.max_delay)
+        heapq.heappush(self._heap, (self._clock() + delay, next(self._counter), url))
+        return delay
+
+    def record_success(self, url):
+        """Daha önce başarısız olmuş bir URL başarılı olduysa işaretler"""
+        if url in self._reasons:
+            self._recovered.add(url)
+
+    def pop_ready(self):
+        """Bekleme süresi dolmuş ilk URL'yi döndürür, yoksa None"""
+        if self._heap and self._heap[0][0] <= self._clock():
+            return heapq.heappop(self._heap)[2]
+        return None
+
+    def next_ready_in(self):
+        """Sıradaki URL'nin hazır olmasına kalan süre, kuyruk boşsa None"""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - self._clock())
+
+    def drain(self):
+        """Kuyrukta bekleyen tüm URL'leri çıkarıp döndürür"""
+        urls = [entry[2] for entry in sorted(self._heap)]
+        self._heap = []
+        return urls
+
+    @property
+    def given_up(self):
+        """Deneme hakkı biten URL'ler"""
+        return list(self._given_up)
+
+    def failure_report(self):
+        """
+        URL bazında hata kayıtları
+
+        Returns:
+            list: [{"url", "attempts", "reasons", "status"}]
+        """
+        report = []
+        for url, reasons in self._reasons.items():
+            if url in self._recovered:
+                status = "recovered"
+            elif url in self._given_up:
+                status = "failed"
+            else:
+                status = "pending"
+            report.append({
+                "url": url,
+                "attempts": self._attempts.get(url, 0),
+                "reasons": reasons,
+                "status": status
+            })
+        return report
+
+class CircuitBreaker:
+    """Son isteklerdeki hata oranı eşiği aşınca taramayı duraklatır"""
+
+    def __init__(self, window=DEFAULT_WINDOW, failure_rate=DEFAULT_FAILURE_RATE,
+                 min_samples=DEFAULT_MIN_SAMPLES, cooldown=DEFAULT_COOLDOWN, sleep=time.sleep):
+        self.failure_rate = failure_rate
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self._sleep = sleep
+        self._outcomes = deque(maxlen=window)
+        self.trips = 0
+
+    def record(self, success):
+        """İstek sonucunu kaydeder"""
+        self._outcomes.append(bool(success))
+
+    def current_failure_rate(self):
+        """Penceredeki hata oranı"""
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def is_open(self):
+        """Hata oranı eşiği aştıysa True"""
+        return (len(self._outcomes) >= self.min_samples
+                and self.current_failure_rate() >= self.failure_rate)
+
+    def wait_if_open(self, budget=None):
+        """
+        Devre açıksa cooldown süresi kadar bekler ve pencereyi sıfırlar
+        (yarı açık durum: sonraki istekler oranı yeniden belirler)
+        Süre bütçesi verilirse bekleme kalan süreyle sınırlanır; bütçe
+        cooldown bitmeden tükenirse pencere sıfırlanmaz
+
+        Args:
+            budget (RunBudget): Çalışma süresi bütçesi (None = sınırsız)
+
+        Returns:
+            bool: Bekleme yapıldıysa True
+        """
+        if not self.is_open():
+            return False
+
+        remaining = budget.remaining() if budget is not None else None
+        wait = self.cooldown if remaining is None else min(self.cooldown, remaining)
+        self.trips += 1
+        print(f"🛑 Hata oranı yüksek (%{self.current_failure_rate() * 100:.0f}), "
+              f"tarama {wait:.0f} sn duraklatılıyor...")
+        self._sleep(wait)
+        if wait >= self.cooldown:
+            self._outcomes.clear()
+        return True
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Run Budget - Çalışma Süresi ve Sayfa Bütçeleri
+==============================================
+
+Taramaya toplam bir süre sınırı (deadline) ve sayfa başına bir süre bütçesi
+uygular. Selenium timeout'ları kalan bütçeye göre kısaltılır, bütçe bittiğinde
+BudgetExceeded fırlatılarak yarım kalan iş temiz şekilde iptal edilir.
+
+KULLANIM:
+from run_budget import RunBudget
+
+budget = RunBudget(total_seconds=3600, page_seconds=45)
+page = budget.start_page()
+page.check()               # Bütçe bittiyse BudgetExceeded
+timeout = page.timeout(30) # min(30, sayfa bütçesi, toplam kalan süre)
+"""
+
+import time
+
+class BudgetExceeded(Exception):
+    """Toplam veya sayfa bütçesi tükendiğinde fırlatılır"""
+
+class PageBudget:
+    """Tek bir sayfanın süre bütçesi (toplam deadline ile sınırlı)"""
+
+    def __init__(self, run_budget, page_seconds):
+        self._run = run_budget
+        self._clock = run_budget.clock
+        self._deadline = None if page_seconds is None else self._clock() + page_seconds
+
+    def remaining(self):
+        """Sayfa için kalan süre (toplam deadline dahil), sınırsızsa None"""
+        candidates = [r for r in (self._run.remaining(), self._own_remaining()) if r is not None]
+        return min(candidates) if candidates else None
+
+    def _own_remaining(self):
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - self._clock())
+
+    def timeout(self, default):
+        """Varsayılan timeout'u kalan bütçeyle sınırlar (en az 1 saniye)"""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return max(1.0, min(default, remaining))
+
+    def check(self):
+        """Bütçe tükendiyse BudgetExceeded fırlatır"""
+        if self._run.expired():
+            raise BudgetExceeded("Toplam çalışma süresi doldu")
+        if self._deadline is not None and self._clock() >= self._deadline:
+            raise BudgetExceeded("Sayfa süre bütçesi doldu")
+
+class RunBudget:
+    """Toplam çalışma süresi ve sayfa başına bütçe"""
+
+    def __init__(self, total_seconds=None, page_seconds=None, clock=time.monotonic):
+        self.clock = clock
+        self.page_seconds = page_seconds
+        self._deadline = None if total_seconds is None else clock() + total_seconds
+
+    def remaining(self):
+        """Toplam kalan süre, sınır yoksa None"""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - self.clock())
+
+    def expired(self):
+        """Toplam süre dolduysa True"""
+        return self._deadline is not None and self.clock() >= self._deadline
+
+    def allows_wait(self, seconds):
+        """Verilen süre kadar beklemek deadline'ı aşmıyorsa True"""
+        remaining = self.remaining()
+        return remaining is None or seconds < remaining
+
+    def start_page(self):
+        """Yeni bir sayfa bütçesi başlatır"""
+        return PageBudget(self, self.page_seconds)
+
+# Sınırsız bütçe (deadline verilmediğinde kullanılır)
+UNLIMITED = RunBudget()
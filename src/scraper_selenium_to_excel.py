@@ -22,27 +22,62 @@ import sys
 import json
 import time
 import random
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from urllib.parse import urljoin, urlparse
-import requests
-from bs4 import BeautifulSoup
+import socket
+import argparse
 
 # Windows terminal encoding düzeltme
 if sys.platform == 'win32':
     os.environ['PYTHONIOENCODING'] = 'utf-8'
     sys.stdout.reconfigure(encoding='utf-8')
 
-# Yardımcı modülleri import et (src klasörü ekleniyor)
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.image_analyzer import is_mockup_by_filename
-from src.report_generator import generate_excel_report
+# Yardımcı modüller (selenium / pandas gibi ağır bağımlılıklar sadece
+# ihtiyaç duyan fonksiyonların içinde import edilir)
+try:
+    from .product_parser import extract_product_data, reparse_archive
+    from .html_archive import HtmlArchive
+    from .report_generator import (
+        generate_excel_report, generate_excel_report_from_parquet, create_detailed_product_report
+    )
+    from .profiler import add_profile_arguments, configure_profiling, profile_stage
+    from .snapshot_diff import diff_snapshot_files
+    from .retry_queue import RetryQueue, CircuitBreaker
+    from .run_budget import RunBudget, BudgetExceeded, UNLIMITED
+    from .product_record import ProductRecord, to_jsonable
+    from .url_utils import DedupIndex, dedupe_results, is_product_url
+    from .driver_health import ManagedDriver, DriverUnavailable
+    from .work_queue import open_work_queue, LeaseKeeper
+    from .link_pipeline import LinkProducer
+    from .listing_api import discover_seller_products, ListingUnavailable
+    from .catalog import update_catalog, main as catalog_main
+    from .mockup_classifier import (
+        MockupClassifier, OnnxEmbeddingBackend, apply_mockup_classifier, load_prototypes
+    )
+    from .columnar_store import (
+        is_parquet_store, load_results_from_parquet, save_results_to_parquet
+    )
+except ImportError:
+    from product_parser import extract_product_data, reparse_archive
+    from html_archive import HtmlArchive
+    from report_generator import (
+        generate_excel_report, generate_excel_report_from_parquet, create_detailed_product_report
+    )
+    from profiler import add_profile_arguments, configure_profiling, profile_stage
+    from snapshot_diff import diff_snapshot_files
+    from retry_queue import RetryQueue, CircuitBreaker
+    from run_budget import RunBudget, BudgetExceeded, UNLIMITED
+    from product_record import ProductRecord, to_jsonable
+    from url_utils import DedupIndex, dedupe_results, is_product_url
+    from driver_health import ManagedDriver, DriverUnavailable
+    from work_queue import open_work_queue, LeaseKeeper
+    from link_pipeline import LinkProducer
+    from listing_api import discover_seller_products, ListingUnavailable
+    from catalog import update_catalog, main as catalog_main
+    from mockup_classifier import (
+        MockupClassifier, OnnxEmbeddingBackend, apply_mockup_classifier, load_prototypes
+    )
+    from columnar_store import (
+        is_parquet_store, load_results_from_parquet, save_results_to_parquet
+    )
 
 # =============================================================================
 # KONFIGÜRASYON AYARLARI
@@ -70,9 +105,62 @@ MOCKUP_KEYWORDS = ["mockup", "mokap", "frame", "psd", "mock"]
 WAIT_MIN = 1.0
 WAIT_MAX = 2.5
 
-# Maksimum retry sayısı
+# Maksimum deneme sayısı (URL başına)
 MAX_RETRIES = 3
 
+# Başarısız URL'ler için tekrar deneme backoff süreleri (saniye)
+RETRY_BASE_DELAY = 5.0
+RETRY_MAX_DELAY = 120.0
+
+# Circuit breaker: son CIRCUIT_WINDOW istekte hata oranı CIRCUIT_FAILURE_RATE'i
+# aşarsa tarama CIRCUIT_COOLDOWN saniye duraklatılır
+CIRCUIT_WINDOW = 20
+CIRCUIT_FAILURE_RATE = 0.5
+CIRCUIT_MIN_SAMPLES = 10
+CIRCUIT_COOLDOWN = 60.0
+
+# Selenium timeout'ları (saniye) - süre bütçesi varsa kalan süreye göre kısaltılır
+PAGE_LOAD_TIMEOUT = 30
+IMPLICIT_WAIT = 10
+BODY_WAIT_TIMEOUT = 15
+
+# Tarayıcı sağlığı: driver bu eşiklerden biri aşılınca sayfalar arasında yenilenir
+DRIVER_MAX_PAGES = 500           # Driver başına maksimum sayfa
+DRIVER_MAX_MEMORY_MB = 2048      # Tarayıcı süreç ağacı RSS sınırı (MB)
+DRIVER_MAX_HEAP_MB = 1024        # psutil yoksa JS heap sınırı (MB)
+DRIVER_MAX_ERROR_STREAK = 5      # Ardışık hata sınırı
+DRIVER_MEMORY_CHECK_EVERY = 25   # Kaç sayfada bir bellek ölçülür
+DRIVER_METRICS_FILE = "driver_metrics.jsonl"
+
+# Toplam çalışma süresi ve ürün sayfası başına süre bütçesi (saniye, None = sınırsız)
+MAX_RUNTIME = None
+PAGE_BUDGET = None
+
+# Boru hattı: link toplama ayrı tarayıcıda sürerken ürünler işlenmeye başlar
+PIPELINE_CRAWL = True
+LINK_QUEUE_SIZE = 50             # Bekleyen link kuyruğu kapasitesi (dolunca link toplama bekler)
+
+# Paylaşımlı iş kuyruğu (worker alt komutu): SQLite dosyası veya redis://sunucu:6379/0
+WORK_QUEUE = "tarama_kuyrugu.db"
+WORK_LEASE_SECONDS = 300.0       # Lease süresi; dolarsa iş başka bir worker'a verilir
+WORK_POLL_INTERVAL = 5.0         # Hazır iş yokken bekleme süresi (saniye)
+
+# Ürün keşfi önce JSON listeleme servisinden yapılır; kullanılamazsa
+# satıcı sayfaları tarayıcıda render edilir
+LISTING_API = True
+LISTING_WORKERS = 8              # Eşzamanlı listeleme sayfası isteği
+
+# Ham HTML arşivi (reparse alt komutu için); None ise arşivlenmez
+HTML_ARCHIVE_DIR = "html_arsivi"
+
+# İndeksli SQLite ürün kataloğu (catalog alt komutu ile sorgulanır); None ise yazılmaz
+CATALOG_DB = "katalog.db"
+
+# Gömme tabanlı mockup sınıflandırıcı (None ise sadece anahtar kelime kullanılır)
+MOCKUP_MODEL = None                       # Ör: os.path.join("modeller", "clip_gorsel.onnx")
+MOCKUP_PROTOTYPES = None                  # Ör: os.path.join("modeller", "prototipler.npz")
+EMBEDDING_CACHE_DIR = "gomme_onbellegi"   # Görsel hash'i ile saklanan gömmeler
+
 # =============================================================================
 # YARDIMCI FONKSİYONLAR
 # =============================================================================
@@ -88,6 +176,10 @@ def init_driver():
     ChromeDriver ile tarayıcı başlatma
     User-agent ve timeout ayarları ile
     """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+
     print("🚀 ChromeDriver başlatılıyor...")
     
     # Chrome seçenekleri
@@ -116,8 +208,8 @@ def init_driver():
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
         # Timeout ayarları
-        driver.implicitly_wait(10)
-        driver.set_page_load_timeout(30)
+        driver.implicitly_wait(IMPLICIT_WAIT)
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
         
         print("✅ ChromeDriver başarıyla başlatıldı")
         return driver
@@ -127,17 +219,89 @@ def init_driver():
         print("💡 tools/ klasöründe chromedriver.exe dosyasının olduğundan emin olun")
         raise
 
-def collect_product_links_from_seller(driver, seller_url, max_pages=30, max_products=MAX_PRODUCTS):
+def create_managed_driver(label="main"):
+    """
+    Sağlık takibi yapan ve eşiklerde yenilenen driver oluşturur
+    label, ortak metrik dosyasında driver'ı ayırt eder
+    """
+    return ManagedDriver(
+        init_driver,
+        max_pages=DRIVER_MAX_PAGES,
+        max_memory_mb=DRIVER_MAX_MEMORY_MB,
+        max_heap_mb=DRIVER_MAX_HEAP_MB,
+        max_error_streak=DRIVER_MAX_ERROR_STREAK,
+        memory_check_every=DRIVER_MEMORY_CHECK_EVERY,
+        metrics_path=DRIVER_METRICS_FILE,
+        label=label
+    )
+
+def discover_links_from_listing_api(seller_url, max_products=MAX_PRODUCTS, budget=UNLIMITED, dedup=None):
+    """
+    Ürün linklerini JSON listeleme servisinden toplar (tarayıcı gerekmez)
+    
+    Returns:
+        tuple: (yeni kanonik linkler, tüm sayfalar alındı mı) veya servis
+        kullanılamıyorsa None
     """
-    Satıcı sayfasından ürün linklerini toplar
+    if dedup is None:
+        dedup = DedupIndex()
+    
+    try:
+        cards, failed_pages = discover_seller_products(seller_url, max_products, LISTING_WORKERS,
+                                                       budget=budget)
+    except ListingUnavailable as e:
+        print(f"⚠️ {e} - sayfalar tarayıcıyla taranacak")
+        return None
+    
+    links = []
+    for card in cards:
+        canonical = dedup.add(card["url"])
+        if canonical:
+            links.append(canonical)
+    
+    print(f"✅ Listeleme servisinden {len(links)} ürün linki alındı")
+    if failed_pages:
+        print(f"⚠️ {len(failed_pages)} listeleme sayfası alınamadı: {failed_pages}")
+    return links, not failed_pages
+
+def iter_product_links_from_seller(driver, seller_url, max_pages=30, max_products=MAX_PRODUCTS,
+                                   budget=UNLIMITED, dedup=None):
+    """
+    Satıcı sayfasından ürün linklerini bulundukça üretir (generator)
+    LISTING_API açıksa linkler önce JSON listeleme servisinden alınır,
+    servis kullanılamazsa sayfalar tarayıcıda render edilir
     Sayfalama ile çalışır ve maksimum ürün sayısına kadar toplar
+    Linkler kanonik hale getirilir, aynı ürün (içerik ID'si) bir kez üretilir
+    Toplam süre bütçesi dolarsa durur
     """
+    from selenium.webdriver.common.by import By
+
     print(f"🔍 Satıcı sayfasından ürün linkleri toplanıyor: {seller_url}")
     
+    if dedup is None:
+        dedup = DedupIndex()
+    
     product_links = []
     page = 1
     
+    if LISTING_API:
+        listing = discover_links_from_listing_api(seller_url, max_products, budget, dedup)
+        if listing is not None:
+            links, complete = listing
+            product_links.extend(links)
+            yield from links
+            if complete or len(product_links) >= max_products:
+                return
+            # Alınamayan sayfaların ürünleri render ile tamamlanır
+            # (ortak indeks sayesinde bulunan ürünler tekrar üretilmez)
+            print("🔁 Eksik listeleme sayfaları tarayıcıyla tamamlanıyor")
+    
     while page <= max_pages and len(product_links) < max_products:
+        if budget.expired():
+            print("⏰ Süre bütçesi doldu, link toplama durduruldu")
+            break
+        
+        new_links = []
         try:
             # Sayfa URL'si oluştur
             if page == 1:
@@ -155,6 +319,7 @@ def collect_product_links_from_seller(driver, seller_url, max_pages=30, max_prod
             selectors = [
                 "a.p-card-chld",  # Ana ürün kartları
                 "a[href*='/p/']",  # Ürün linkleri
+                "a[href*='-p-']",  # İçerik ID'li ürün linkleri
                 ".p-card a",  # Alternatif seçici
                 "[data-testid='product-card'] a"  # Test ID ile
             ]
@@ -165,7 +330,7 @@ def collect_product_links_from_seller(driver, seller_url, max_pages=30, max_prod
                     elements = driver.find_elements(By.CSS_SELECTOR, selector)
                     for element in elements:
                         href = element.get_attribute("href")
-                        if href and "/p/" in href and href not in links_found:
+                        if is_product_url(href) and href not in links_found:
                             links_found.append(href)
                     
                     if links_found:
@@ -180,181 +345,104 @@ def collect_product_links_from_seller(driver, seller_url, max_pages=30, max_prod
                 print(f"⚠️ Sayfa {page}'de ürün linki bulunamadı")
                 break
             
-            # Yeni linkleri ekle
+            # Yeni linkleri ekle (kanonik URL, içerik ID'sine göre tekil)
             for link in links_found:
-                if link not in product_links and len(product_links) < max_products:
-                    product_links.append(link)
+                if len(product_links) + len(new_links) >= max_products:
+                    break
+                canonical = dedup.add(link)
+                if canonical:
+                    new_links.append(canonical)
+            product_links.extend(new_links)
             
             print(f"📊 Toplam {len(product_links)} ürün linki toplandı")
+            update_driver_health(driver, True)
             
             # Sonraki sayfa kontrolü
             page += 1
-            
-            # Eğer maksimum ürün sayısına ulaştıysak dur
-            if len(product_links) >= max_products:
-                print(f"🎯 Maksimum ürün sayısına ({max_products}) ulaşıldı")
-                break
                 
         except Exception as e:
             print(f"❌ Sayfa {page} işleme hatası: {e}")
+            yield from new_links
+            break
+        
+        # Sayfanın linkleri try dışında üretilir (tüketicideki hatalar
+        # link toplama hatası sayılmaz)
+        yield from new_links
+        
+        # Eğer maksimum ürün sayısına ulaştıysak dur
+        if len(product_links) >= max_products:
+            print(f"🎯 Maksimum ürün sayısına ({max_products}) ulaşıldı")
             break
     
     print(f"✅ Toplam {len(product_links)} ürün linki toplandı")
-    return product_links
 
-def parse_product_page(driver, product_url):
+def collect_product_links_from_seller(driver, seller_url, max_pages=30, max_products=MAX_PRODUCTS,
+                                      budget=UNLIMITED, dedup=None):
     """
-    Tek bir ürün sayfasından bilgileri toplar
-    Başlık, SKU, görseller, varyasyonlar ve mockup tespiti yapar
+    Satıcı sayfasından ürün linklerini toplar (tüm sayfalar bittikten sonra döner)
+    Boru hattı modunda bunun yerine iter_product_links_from_seller kullanılır
     """
+    return list(iter_product_links_from_seller(driver, seller_url, max_pages, max_products,
+                                               budget, dedup))
+
+def fetch_product_page(driver, product_url, budget=UNLIMITED, archive=None):
+    """
+    Tek bir ürün sayfasından bilgileri toplar (tek deneme)
+    Sayfa kaynağı alınır, archive verildiyse HTML arşivine yazılır ve
+    extract_product_data ile ayrıştırılır
+    Hata durumunda exception fırlatır, tekrar deneme kararı çağırana aittir
+    Sayfa veya toplam süre bütçesi dolarsa BudgetExceeded fırlatır
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     print(f"📦 Ürün sayfası işleniyor: {product_url}")
     
+    # Timeout'ları sayfa bütçesine göre ayarla
+    page_budget = budget.start_page()
+    page_budget.check()
+    driver.set_page_load_timeout(page_budget.timeout(PAGE_LOAD_TIMEOUT))
+    driver.implicitly_wait(page_budget.timeout(IMPLICIT_WAIT))
+    
+    # Sayfayı yükle
+    driver.get(product_url)
+    human_wait()
+    page_budget.check()
+    
+    # Sayfa yüklenene kadar bekle
+    WebDriverWait(driver, page_budget.timeout(BODY_WAIT_TIMEOUT)).until(
+        EC.presence_of_element_located((By.TAG_NAME, "body"))
+    )
+    
+    page_budget.check()
+    
+    # Sayfa kaynağını arşivle ve ayrıştır (aynı ayrıştırıcı reparse'ta da kullanılır)
+    html = driver.page_source
+    if archive is not None:
+        archive.put(product_url, html)
+    
+    product_data = extract_product_data(html, product_url, EXPECTED_SIZES)
+    
+    print(f"✅ Ürün işlendi: {product_data['title'][:50]}...")
+    return product_data
+
+def parse_product_page(driver, product_url, max_retries=MAX_RETRIES):
+    """
+    Tek bir ürün sayfasını satır içi tekrar denemelerle işler
+    Tarama akışı bunun yerine crawl_products ile ertelenmiş retry kuyruğu kullanır
+    """
+    from selenium.common.exceptions import TimeoutException
+
     retry_count = 0
-    while retry_count < MAX_RETRIES:
+    while retry_count < max_retries:
         try:
-            # Sayfayı yükle
-            driver.get(product_url)
-            human_wait()
-            
-            # Sayfa yüklenene kadar bekle
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Ürün bilgilerini topla
-            product_data = {
-                "url": product_url,
-                "title": "",
-                "sku": "",
-                "images": [],
-                "variations": [],
-                "mockup_images": [],
-                "missing_sizes": [],
-                "image_count": 0
-            }
-            
-            # Ürün başlığı
-            try:
-                title_selectors = [
-                    "h1.pr-new-br",
-                    "h1[data-testid='product-name']",
-                    ".pr-new-br",
-                    "h1"
-                ]
-                
-                for selector in title_selectors:
-                    try:
-                        title_element = driver.find_element(By.CSS_SELECTOR, selector)
-                        product_data["title"] = title_element.text.strip()
-                        if product_data["title"]:
-                            break
-                    except:
-                        continue
-                        
-            except Exception as e:
-                print(f"⚠️ Başlık bulunamadı: {e}")
-            
-            # SKU (Ürün Kodu)
-            try:
-                sku_selectors = [
-                    "[data-testid='product-sku']",
-                    ".product-sku",
-                    ".sku",
-                    "[class*='sku']"
-                ]
-                
-                for selector in sku_selectors:
-                    try:
-                        sku_element = driver.find_element(By.CSS_SELECTOR, selector)
-                        product_data["sku"] = sku_element.text.strip()
-                        if product_data["sku"]:
-                            break
-                    except:
-                        continue
-                        
-            except Exception as e:
-                print(f"⚠️ SKU bulunamadı: {e}")
-            
-            # Görselleri topla
-            try:
-                image_selectors = [
-                    "img[src*='trendyol']",
-                    "img[data-src*='trendyol']",
-                    "img[data-lazy*='trendyol']",
-                    ".product-image img",
-                    "[data-testid='product-image'] img"
-                ]
-                
-                all_images = []
-                for selector in image_selectors:
-                    try:
-                        images = driver.find_elements(By.CSS_SELECTOR, selector)
-                        for img in images:
-                            # Farklı src özelliklerini kontrol et
-                            src_attrs = ["src", "data-src", "data-lazy", "data-original"]
-                            for attr in src_attrs:
-                                img_url = img.get_attribute(attr)
-                                if img_url and img_url not in all_images:
-                                    all_images.append(img_url)
-                                    break
-                    except:
-                        continue
-                
-                product_data["images"] = all_images
-                product_data["image_count"] = len(all_images)
-                
-            except Exception as e:
-                print(f"⚠️ Görsel toplama hatası: {e}")
-            
-            # Mockup görsellerini tespit et
-            try:
-                mockup_images = []
-                for img_url in product_data["images"]:
-                    if is_mockup_by_filename(img_url):
-                        mockup_images.append(img_url)
-                
-                product_data["mockup_images"] = mockup_images
-                
-            except Exception as e:
-                print(f"⚠️ Mockup tespit hatası: {e}")
-            
-            # Varyasyonları topla (ölçüler)
-            try:
-                variation_selectors = [
-                    "ul li",
-                    ".variation-item",
-                    "[data-testid='variation']",
-                    ".size-option",
-                    ".option-item"
-                ]
-                
-                variations = []
-                for selector in variation_selectors:
-                    try:
-                        elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                        for element in elements:
-                            text = element.text.strip()
-                            if text and len(text) < 20:  # Çok uzun metinleri filtrele
-                                variations.append(text)
-                    except:
-                        continue
-                
-                # Tekrarları kaldır ve temizle
-                product_data["variations"] = list(set(variations))
-                
-            except Exception as e:
-                print(f"⚠️ Varyasyon toplama hatası: {e}")
-            
-            # Eksik ölçüleri hesapla
-            product_data["missing_sizes"] = evaluate_missing_sizes(product_data, EXPECTED_SIZES)
-            
-            print(f"✅ Ürün işlendi: {product_data['title'][:50]}...")
-            return product_data
+            return fetch_product_page(driver, product_url)
             
         except TimeoutException:
             retry_count += 1
-            print(f"⏰ Sayfa yükleme timeout (deneme {retry_count}/{MAX_RETRIES})")
-            if retry_count < MAX_RETRIES:
+            print(f"⏰ Sayfa yükleme timeout (deneme {retry_count}/{max_retries})")
+            if retry_count < max_retries:
                 human_wait()
                 continue
             else:
@@ -363,26 +451,252 @@ def parse_product_page(driver, product_url):
                 
         except Exception as e:
             retry_count += 1
-            print(f"❌ Ürün sayfası işleme hatası (deneme {retry_count}/{MAX_RETRIES}): {e}")
-            if retry_count < MAX_RETRIES:
+            print(f"❌ Ürün sayfası işleme hatası (deneme {retry_count}/{max_retries}): {e}")
+            if retry_count < max_retries:
                 human_wait()
                 continue
             else:
                 return None
 
-def evaluate_missing_sizes(item, expected_sizes):
+def update_driver_health(driver, success):
+    """
+    Sayfa sonucunu driver sağlığına işler ve gerekirse driver'ı yeniler
+    Yenilemede tarayıcı başlatılamazsa DriverUnavailable fırlatılır
+    """
+    if not isinstance(driver, ManagedDriver):
+        return
+    if success:
+        driver.record_success()
+    else:
+        driver.record_error()
+    driver.check_health()
+
+def failure_reason(error):
+    """Hata nesnesini kayıt için kısa bir nedene çevirir"""
+    if type(error).__name__ == "TimeoutException":
+        return "timeout"
+    if isinstance(error, BudgetExceeded):
+        return "page budget exceeded"
+    message = str(error).strip().splitlines()
+    return f"{type(error).__name__}: {message[0] if message else ''}".rstrip(": ")
+
+def crawl_products(driver, product_links, retry_queue=None, breaker=None, budget=UNLIMITED,
+                   dedup=None, archive=None):
+    """
+    Ürün sayfalarını işler; başarısız URL'ler satır içinde beklenmeden
+    retry kuyruğuna ertelenir ve backoff süresi dolunca yeni işlerle
+    dönüşümlü olarak tekrar denenir. Hata oranı yükselirse circuit breaker
+    taramayı bir süre duraklatır. Toplam süre bütçesi dolduğunda işlenmemiş
+    URL'ler atlanır ve o ana kadarki sonuçlarla dönülür; tarayıcı
+    yenilenirken yeniden başlatılamazsa da aynı şekilde dönülür. Aynı ürün
+    (içerik ID'si) çalışma boyunca bir kez işlenir. archive verilirse
+    sayfaların HTML'i arşive yazılır.
+    
+    Returns:
+        tuple: (ProductRecord listesi, RetryQueue, atlanan URL listesi)
+    """
+    if retry_queue is None:
+        retry_queue = RetryQueue(MAX_RETRIES, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+    if breaker is None:
+        breaker = CircuitBreaker(CIRCUIT_WINDOW, CIRCUIT_FAILURE_RATE, CIRCUIT_MIN_SAMPLES, CIRCUIT_COOLDOWN)
+    if dedup is None:
+        dedup = DedupIndex()
+    
+    total = len(product_links) if hasattr(product_links, "__len__") else "?"
+    fresh = iter(product_links)
+    fresh_done = False
+    position = 0
+    results = []
+    skipped = []
+    
+    while True:
+        if budget.expired():
+            skipped.extend(retry_queue.drain())
+            skipped.extend(fresh)
+            print(f"⏰ Süre bütçesi doldu, {len(skipped)} URL atlandı")
+            break
+        
+        if breaker.wait_if_open(budget) and budget.expired():
+            continue  # Bütçe cooldown sırasında doldu, döngü başında kapanır
+        
+        # Süresi dolmuş tekrar denemeler yeni işlerden önce gelir
+        product_url = retry_queue.pop_ready()
+        if product_url is None and not fresh_done:
+            product_url = next(fresh, None)
+            if product_url is None:
+                fresh_done = True
+                continue
+            if not dedup.claim(product_url):
+                print(f"⏭️ Ürün bu çalışmada zaten işlendi: {product_url}")
+                continue
+        
+        if product_url is None:
+            wait_time = retry_queue.next_ready_in()
+            if wait_time is None:
+                break
+            if not budget.allows_wait(wait_time):
+                skipped.extend(retry_queue.drain())
+                print(f"⏰ Tekrar denemeler süre bütçesine sığmıyor, {len(skipped)} URL atlandı")
+                break
+            print(f"⏳ {len(retry_queue)} URL tekrar denemeyi bekliyor ({wait_time:.1f} sn)")
+            time.sleep(wait_time)
+            continue
+        
+        attempt = retry_queue.attempts(product_url) + 1
+        if attempt == 1:
+            position += 1
+            print(f"\n📦 [{position}/{total}] Ürün işleniyor...")
+        else:
+            print(f"\n🔁 Tekrar deneme ({attempt}/{retry_queue.max_attempts}): {product_url}")
+        
+        try:
+            product_data = fetch_product_page(driver, product_url, budget, archive)
+        except Exception as e:
+            if budget.expired():
+                # Toplam süre doldu: yarım kalan sayfa hata sayılmaz, atlanır
+                skipped.append(product_url)
+                continue
+            reason = failure_reason(e)
+            breaker.record(False)
+            delay = retry_queue.record_failure(product_url, reason)
+            if delay is None:
+                print(f"❌ Ürün sayfası işlenemedi, vazgeçildi: {product_url} ({reason})")
+            else:
+                print(f"🔁 Hata ({reason}), {delay:.1f} sn sonra tekrar denenecek: {product_url}")
+            success = False
+        else:
+            breaker.record(True)
+            retry_queue.record_success(product_url)
+            results.append(ProductRecord.from_dict(product_data))
+            
+            # İlerleme göster
+            if len(results) % 10 == 0:
+                print(f"📊 İlerleme: {len(results)} ürün işlendi")
+            success = True
+        
+        try:
+            update_driver_health(driver, success)
+        except DriverUnavailable as e:
+            # Yeni tarayıcı yok: o ana kadarki sonuçlarla dönülür (kısmi rapor)
+            skipped.extend(retry_queue.drain())
+            skipped.extend(fresh)
+            print(f"❌ {e} - tarama durduruldu, {len(skipped)} URL atlandı")
+            break
+    
+    return results, retry_queue, skipped
+
+def run_worker(queue, worker_id, budget=UNLIMITED, lease_seconds=WORK_LEASE_SECONDS,
+               poll_interval=WORK_POLL_INTERVAL, archive=None):
     """
-    Varyasyonlarda beklenen ölçülerin olup olmadığını kontrol eder
-    Eksik ölçüleri döndürür
+    Paylaşımlı kuyruktan iş alıp işleyen worker döngüsü
+    - listing işi: satıcı sayfasından ürün linklerini toplar ve kuyruğa ekler
+    - product işi: ürün sayfasını işler ve sonucu kuyruğa yazar
+    Başarısız işler kuyrukta backoff ile tekrar denenir (başka bir worker
+    tarafından da alınabilir). İş sürerken lease düzenli olarak uzatılır.
+    Kuyrukta bekleyen veya lease'te iş kalmayınca, ya da süre bütçesi dolunca
+    döner. Tarayıcı ilk işte başlatılır.
+    
+    Returns:
+        int: Bu worker'ın tamamladığı iş sayısı
     """
-    missing_sizes = []
-    variations_text = " ".join(item.get("variations", [])).lower()
+    breaker = CircuitBreaker(CIRCUIT_WINDOW, CIRCUIT_FAILURE_RATE, CIRCUIT_MIN_SAMPLES, CIRCUIT_COOLDOWN)
+    dedup = DedupIndex()
+    driver = None
+    lease = None
+    completed = 0
+    
+    try:
+        while True:
+            if budget.expired():
+                print("⏰ Süre bütçesi doldu, worker durduruluyor")
+                break
+            
+            if breaker.wait_if_open(budget) and budget.expired():
+                continue  # Bütçe cooldown sırasında doldu, döngü başında durur
+            
+            lease = queue.lease(worker_id, lease_seconds)
+            if lease is None:
+                if not queue.unfinished():
+                    print("✅ Kuyrukta iş kalmadı")
+                    break
+                if not budget.allows_wait(poll_interval):
+                    break
+                # Diğer worker'ların lease'leri veya backoff bekleyen işler var
+                time.sleep(poll_interval)
+                continue
+            
+            if driver is None:
+                driver = create_managed_driver(label=f"worker-{worker_id}")
+            
+            try:
+                # Uzun işlerde lease süresi dolmasın diye arka planda uzatılır
+                with LeaseKeeper(queue, lease, lease_seconds):
+                    if lease.kind == "listing":
+                        product_links = collect_product_links_from_seller(
+                            driver, lease.url, budget=budget, dedup=dedup
+                        )
+                        if not product_links:
+                            raise RuntimeError("ürün linki bulunamadı")
+                        added = queue.enqueue_many("product", product_links)
+                        print(f"📥 {added} yeni ürün kuyruğa eklendi ({len(product_links) - added} zaten vardı)")
+                        result = None
+                    else:
+                        print(f"\n📦 Ürün işleniyor: {lease.url}")
+                        result = fetch_product_page(driver, lease.url, budget, archive)
+            except Exception as e:
+                if budget.expired():
+                    # Yarım kalan iş deneme sayılmadan diğer worker'lara bırakılır
+                    queue.release(lease)
+                    lease = None
+                    continue
+                reason = failure_reason(e)
+                breaker.record(False)
+                delay = queue.fail(lease, reason)
+                if delay is None:
+                    print(f"❌ İş işlenemedi, vazgeçildi: {lease.url} ({reason})")
+                else:
+                    print(f"🔁 Hata ({reason}), {delay:.1f} sn sonra tekrar denenecek: {lease.url}")
+                lease = None
+                success = False
+            else:
+                breaker.record(True)
+                if not queue.ack(lease, result=result, worker_id=worker_id):
+                    print(f"⚠️ Lease süresi dolmuştu, iş başka bir worker'a geçmiş olabilir: {lease.url}")
+                kind = lease.kind
+                lease = None
+                completed += 1
+                if kind != "product":
+                    continue  # Listeleme işi driver sağlığına işlenmez
+                success = True
+            
+            try:
+                update_driver_health(driver, success)
+            except DriverUnavailable as e:
+                # İşler kuyrukta kalır, diğer worker'lar devam eder
+                print(f"❌ {e} - worker durduruluyor")
+                break
     
-    for size in expected_sizes:
-        if size.lower() not in variations_text:
-            missing_sizes.append(size)
+    finally:
+        if lease is not None:
+            queue.release(lease)
+        if driver:
+            print("🔚 Tarayıcı kapatılıyor...")
+            driver.quit()
     
-    return missing_sizes
+    return completed
+
+def classify_mockups(results):
+    """
+    Anahtar kelimeyle yakalanmayan görselleri MOCKUP_MODEL ile skorlar
+    ve mockup listelerini günceller
+    """
+    classifier = MockupClassifier(OnnxEmbeddingBackend(MOCKUP_MODEL), load_prototypes(MOCKUP_PROTOTYPES),
+                                  cache_dir=EMBEDDING_CACHE_DIR)
+    try:
+        items = apply_mockup_classifier(results, classifier)
+    finally:
+        classifier.close()
+    return [ProductRecord.from_dict(item) for item in items]
 
 def analyze_all_sizes_in_products(results):
     """
@@ -436,20 +750,294 @@ def save_results_to_json(results, filename="scraped_products.json"):
     """Sonuçları JSON dosyasına kaydeder"""
     try:
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+            json.dump(results, f, ensure_ascii=False, indent=2, default=to_jsonable)
         print(f"💾 Sonuçlar JSON dosyasına kaydedildi: {filename}")
     except Exception as e:
         print(f"❌ JSON kaydetme hatası: {e}")
 
-def main():
+def save_failed_urls(failures, filename="failed_urls.json"):
+    """URL bazında hata nedenlerini JSON dosyasına kaydeder"""
+    if not failures:
+        return
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(failures, f, ensure_ascii=False, indent=2)
+        print(f"💾 Hata kayıtları kaydedildi: {filename}")
+    except Exception as e:
+        print(f"❌ Hata kayıtları kaydedilemedi: {e}")
+
+def save_skipped_urls(skipped, filename="skipped_urls.json"):
+    """Süre bütçesi veya tarayıcı kaybı nedeniyle işlenmeyen URL'leri JSON dosyasına kaydeder"""
+    if not skipped:
+        return
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(skipped, f, ensure_ascii=False, indent=2)
+        print(f"💾 Atlanan URL'ler kaydedildi: {filename}")
+    except Exception as e:
+        print(f"❌ Atlanan URL'ler kaydedilemedi: {e}")
+
+def load_results_from_json(filename="scraped_products.json"):
+    """Daha önce kaydedilmiş scraping sonuçlarını JSON dosyasından okur"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def parse_args(argv=None):
+    """Komut satırı argümanlarını ayrıştırır"""
+    parser = argparse.ArgumentParser(
+        description="Trendyol satıcı sayfasından ürünleri toplayıp Excel raporu oluşturur"
+    )
+    parser.add_argument(
+        "seller_url", nargs="?", default=None,
+        help="Trendyol satıcı URL'si (verilmezse interaktif olarak sorulur)"
+    )
+    parser.add_argument(
+        "--max-runtime", type=float, default=MAX_RUNTIME, metavar="SANIYE",
+        help="Toplam çalışma süresi sınırı; dolunca kısmi rapor oluşturulur"
+    )
+    parser.add_argument(
+        "--page-budget", type=float, default=PAGE_BUDGET, metavar="SANIYE",
+        help="Ürün sayfası başına süre bütçesi"
+    )
+    parser.add_argument(
+        "--parquet", default=None, metavar="KLASOR",
+        help="Sonuçları ayrıca kolon bazlı Parquet tabloları olarak bu klasöre kaydet"
+    )
+    add_profile_arguments(parser)
+    return parser.parse_args(argv)
+
+def report_command(argv):
+    """
+    report alt komutu - mevcut JSON dosyasından Excel raporu oluşturur
+    Selenium yüklenmez, tarayıcı başlatılmaz
+    """
+    parser = argparse.ArgumentParser(
+        prog="scraper_selenium_to_excel.py report",
+        description="Mevcut scraped_products.json dosyasından rapor oluşturur"
+    )
+    parser.add_argument("-i", "--input", default="scraped_products.json",
+                        help="Girdi JSON dosyası veya Parquet tablo klasörü")
+    parser.add_argument("-o", "--output", default="rapor.xlsx", help="Çıktı Excel dosyası")
+    parser.add_argument("--detailed", default=None, metavar="DOSYA",
+                        help="Ayrıca detaylı ürün raporu oluştur (örn: detayli_rapor.xlsx)")
+    parser.add_argument("--only-missing", action="store_true",
+                        help="Sadece eksik ölçüsü olan ürünleri raporla")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    configure_profiling(args.profile, args.profile_stage, args.profile_output)
+
+    with profile_stage("all"):
+        if is_parquet_store(args.input):
+            # Rapor ve ölçü analizleri kolonlardan hesaplanır, filtre Parquet
+            # okumasına iletilir (ürün sözlükleri oluşturulmaz)
+            filters = [("missing_count", ">", 0)] if args.only_missing else None
+            try:
+                with profile_stage("report"):
+                    generate_excel_report_from_parquet(args.input, args.output, filters)
+                    if args.detailed:
+                        create_detailed_product_report(
+                            load_results_from_parquet(args.input, filters=filters), args.detailed
+                        )
+            except ImportError as e:
+                print(f"❌ Veri okuma hatası: {e}")
+            return
+
+        try:
+            results = load_results_from_json(args.input)
+        except (OSError, ValueError) as e:
+            print(f"❌ Veri okuma hatası: {e}")
+            return
+
+        results = dedupe_results(results)
+        if args.only_missing:
+            results = [item for item in results if item.get("missing_sizes")]
+        print(f"📂 {len(results)} ürün okundu: {args.input}")
+        with profile_stage("report"):
+            generate_excel_report(results, args.output)
+            if args.detailed:
+                create_detailed_product_report(results, args.detailed)
+
+def diff_command(argv):
+    """
+    diff alt komutu - iki çalışmanın snapshot'larını karşılaştırır
+    Yeni/kaldırılan ürünleri, yeni eksik ölçüleri ve yeni mockupları raporlar
+    """
+    parser = argparse.ArgumentParser(
+        prog="scraper_selenium_to_excel.py diff",
+        description="İki scraped_products.json snapshot'ını karşılaştırır"
+    )
+    parser.add_argument("old", help="Eski snapshot (JSON veya JSONL)")
+    parser.add_argument("new", help="Yeni snapshot (JSON veya JSONL)")
+    parser.add_argument("--changelog", default="degisiklikler.jsonl", help="JSONL değişiklik günlüğü")
+    parser.add_argument("-o", "--output", default="degisiklikler.xlsx",
+                        help="Excel değişiklik raporu (boş verilirse yazılmaz)")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    configure_profiling(args.profile, args.profile_stage, args.profile_output)
+
+    with profile_stage("all"):
+        try:
+            diff_snapshot_files(args.old, args.new, changelog=args.changelog,
+                                excel=args.output or None)
+        except (OSError, ValueError) as e:
+            print(f"❌ Snapshot karşılaştırma hatası: {e}")
+
+def worker_command(argv):
+    """
+    worker alt komutu - paylaşımlı kuyruktan iş alarak taramaya katılır
+    Aynı kuyruğu kullanan worker'lar (farklı süreç veya makineler) işi
+    tekrar etmeden bölüşür
+    """
+    parser = argparse.ArgumentParser(
+        prog="scraper_selenium_to_excel.py worker",
+        description="Paylaşımlı iş kuyruğundan satıcı ve ürün sayfalarını işler"
+    )
+    parser.add_argument("seller_urls", nargs="*",
+                        help="Kuyruğa eklenecek satıcı URL'leri (zaten varsa tekrar eklenmez)")
+    parser.add_argument("--queue", default=WORK_QUEUE,
+                        help="Kuyruk: SQLite dosyası veya redis://sunucu:6379/0")
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}",
+                        help="Worker adı (lease sahibi olarak kaydedilir)")
+    parser.add_argument("--lease", type=float, default=WORK_LEASE_SECONDS, metavar="SANIYE",
+                        help="Lease süresi; worker çökerse iş bu süreden sonra başkasına verilir")
+    parser.add_argument("--max-runtime", type=float, default=MAX_RUNTIME, metavar="SANIYE",
+                        help="Worker'ın toplam çalışma süresi sınırı")
+    parser.add_argument("--page-budget", type=float, default=PAGE_BUDGET, metavar="SANIYE",
+                        help="Ürün sayfası başına süre bütçesi")
+    parser.add_argument("--export", default=None, metavar="DOSYA",
+                        help="Kuyruk bitince tüm worker'ların sonuçlarını JSON olarak kaydet")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    configure_profiling(args.profile, args.profile_stage, args.profile_output)
+
+    try:
+        queue = open_work_queue(args.queue)
+    except (ImportError, OSError) as e:
+        print(f"❌ Kuyruk açılamadı: {e}")
+        return
+
+    with profile_stage("all"):
+        try:
+            if args.seller_urls:
+                added = queue.enqueue_many("listing", args.seller_urls)
+                print(f"📥 {added} satıcı kuyruğa eklendi")
+            
+            print(f"👷 Worker başlatıldı: {args.worker_id} (kuyruk: {args.queue})")
+            budget = RunBudget(args.max_runtime, args.page_budget)
+            archive = HtmlArchive(HTML_ARCHIVE_DIR) if HTML_ARCHIVE_DIR else None
+            try:
+                completed = run_worker(queue, args.worker_id, budget, lease_seconds=args.lease,
+                                       archive=archive)
+                print(f"✅ Bu worker {completed} iş tamamladı")
+            except KeyboardInterrupt:
+                print("\n⏹️ Worker durduruldu, elindeki iş kuyruğa geri bırakıldı")
+            finally:
+                if archive is not None:
+                    archive.close()
+            
+            stats = queue.stats()
+            print(f"📊 Kuyruk: {stats['done']} tamamlandı, {stats['pending']} bekliyor, "
+                  f"{stats['leased']} işleniyor, {stats['failed']} başarısız")
+            
+            if args.export:
+                if queue.unfinished():
+                    print("⚠️ Kuyrukta bitmemiş işler var, dışa aktarılan sonuçlar kısmi")
+                results = dedupe_results(queue.results())
+                save_results_to_json(results, args.export)
+                save_failed_urls(queue.failures())
+                if CATALOG_DB:
+                    update_catalog(results, CATALOG_DB)
+        finally:
+            queue.close()
+
+def reparse_command(argv):
+    """
+    reparse alt komutu - HTML arşivindeki sayfaları yeniden ayrıştırır
+    Tarayıcı başlatılmaz, ağ kullanılmaz; seçici değişikliklerinden sonra
+    yeniden tarama yapmadan sonuçları günceller
+    """
+    parser = argparse.ArgumentParser(
+        prog="scraper_selenium_to_excel.py reparse",
+        description="HTML arşivinden ürün verilerini yeniden çıkarır"
+    )
+    parser.add_argument("-a", "--archive", default=HTML_ARCHIVE_DIR, help="HTML arşiv klasörü")
+    parser.add_argument("-o", "--output", default="scraped_products.json", help="Çıktı JSON dosyası")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Süreç sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument("--report", default=None, metavar="DOSYA",
+                        help="Ayrıca Excel raporu oluştur (örn: rapor.xlsx)")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    configure_profiling(args.profile, args.profile_stage, args.profile_output)
+
+    if not args.archive or not os.path.isdir(args.archive):
+        print(f"❌ HTML arşivi bulunamadı: {args.archive}")
+        return
+
+    with profile_stage("all"):
+        start = time.perf_counter()
+        with profile_stage("products"):
+            results, failures = reparse_archive(args.archive, EXPECTED_SIZES, workers=args.jobs)
+        results = dedupe_results(results)
+        elapsed = time.perf_counter() - start
+        print(f"✅ {len(results)} ürün {elapsed:.1f} sn'de yeniden işlendi")
+        if failures:
+            print(f"⚠️ {len(failures)} sayfa işlenemedi")
+
+        save_results_to_json(results, args.output)
+        save_failed_urls(failures)
+        if CATALOG_DB:
+            update_catalog(results, CATALOG_DB)
+        if args.report:
+            with profile_stage("report"):
+                generate_excel_report(results, args.report)
+
+def catalog_command(argv):
+    """
+    catalog alt komutu - indeksli ürün kataloğunu sorgular
+    Örn: catalog --missing 50x70 --mockup -o sonuc.xlsx
+    """
+    if not argv or argv[0].startswith("-"):
+        argv = [CATALOG_DB or "katalog.db"] + list(argv)
+    catalog_main(argv, prog="scraper_selenium_to_excel.py catalog")
+
+# Alt komutlar (ilk argüman bunlardan biriyse ilgili fonksiyon çalışır)
+COMMANDS = {
+    "report": report_command,
+    "diff": diff_command,
+    "worker": worker_command,
+    "reparse": reparse_command,
+    "catalog": catalog_command,
+}
+
+def main(argv=None):
     """Ana fonksiyon - tüm akışı çalıştırır"""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+
+    args = parse_args(argv)
+    configure_profiling(args.profile, args.profile_stage, args.profile_output)
+
+    with profile_stage("all"):
+        run_scraper(args.seller_url, parquet_dir=args.parquet,
+                    max_runtime=args.max_runtime, page_budget=args.page_budget)
+
+def run_scraper(seller_url=None, parquet_dir=None, max_runtime=MAX_RUNTIME, page_budget=PAGE_BUDGET):
+    """Satıcı URL'si için link toplama, ürün işleme ve raporlama akışını çalıştırır"""
     print("=" * 60)
     print("*** TRENDYOL SATICI SCRAPER - EXCEL RAPORU ***")
     print("=" * 60)
     
     # Komut satırı argümanlarını kontrol et
-    if len(sys.argv) > 1:
-        seller_url = sys.argv[1].strip()
+    if seller_url:
+        seller_url = seller_url.strip()
         print(f"Komut satirindan URL alindi: {seller_url}")
     else:
         # Kullanıcıdan satıcı URL'si al
@@ -465,41 +1053,84 @@ def main():
         if confirm != 'e':
             return
     
+    # Süre bütçesi (URL girildikten sonra başlar)
+    budget = RunBudget(max_runtime, page_budget)
+    
+    # Link toplama, ürün işleme ve raporlamada ortak tekrar indeksi
+    dedup = DedupIndex()
+    
+    # Ürün sayfalarının ham HTML arşivi (reparse için)
+    archive = HtmlArchive(HTML_ARCHIVE_DIR) if HTML_ARCHIVE_DIR else None
+    
     # ChromeDriver'ı başlat
     driver = None
+    producer = None
     try:
-        driver = init_driver()
+        if PIPELINE_CRAWL:
+            # Link toplama arka planda başlar, linkler bulundukça sınırlı kuyruk
+            # üzerinden ürün işlemeye akar. Üreticinin tarayıcısı yalnızca
+            # sayfalar render edilmesi gerektiğinde açılır (LISTING_API
+            # başarılıysa ikinci Chrome hiç başlatılmaz)
+            def iter_links(link_driver):
+                with profile_stage("links"):
+                    yield from iter_product_links_from_seller(link_driver, seller_url,
+                                                              budget=budget, dedup=dedup)
+            
+            producer = LinkProducer(lambda: create_managed_driver("producer"), iter_links,
+                                    maxsize=LINK_QUEUE_SIZE).start()
+            driver = create_managed_driver("consumer")
+            product_links = producer
+        else:
+            driver = create_managed_driver()
+            
+            # Ürün linklerini topla
+            with profile_stage("links"):
+                product_links = collect_product_links_from_seller(driver, seller_url, budget=budget, dedup=dedup)
+            
+            if not product_links:
+                print("❌ Hiç ürün linki bulunamadı!")
+                return
+            
+            print(f"\n🔍 {len(product_links)} ürün sayfası işlenecek...")
         
-        # Ürün linklerini topla
-        product_links = collect_product_links_from_seller(driver, seller_url)
+        # Her ürün sayfasını işle (başarısız olanlar retry kuyruğuna ertelenir)
+        with profile_stage("products"):
+            results, retry_queue, skipped = crawl_products(driver, product_links, budget=budget,
+                                                           dedup=dedup, archive=archive)
+        results = dedupe_results(results)
         
-        if not product_links:
+        if producer is not None and producer.error is not None:
+            print(f"⚠️ Link toplama yarıda kesildi ({producer.error}), rapor bulunan linklerle sınırlı")
+        if producer is not None and not producer.produced:
             print("❌ Hiç ürün linki bulunamadı!")
             return
         
-        print(f"\n🔍 {len(product_links)} ürün sayfası işlenecek...")
-        
-        # Her ürün sayfasını işle
-        results = []
-        for i, product_url in enumerate(product_links, 1):
-            print(f"\n📦 [{i}/{len(product_links)}] Ürün işleniyor...")
-            
-            product_data = parse_product_page(driver, product_url)
-            if product_data:
-                results.append(product_data)
-            
-            # İlerleme göster
-            if i % 10 == 0:
-                print(f"📊 İlerleme: {i}/{len(product_links)} ürün işlendi")
+        if MOCKUP_MODEL and results:
+            print("🖼️ Görseller mockup modeliyle sınıflandırılıyor...")
+            results = classify_mockups(results)
         
         print(f"\n✅ Toplam {len(results)} ürün başarıyla işlendi!")
+        if retry_queue.given_up:
+            print(f"⚠️ {len(retry_queue.given_up)} ürün sayfası işlenemedi")
+        if skipped:
+            print(f"⚠️ {len(skipped)} ürün atlandı, kısmi rapor (bkz. skipped_urls.json)")
         
         # Sonuçları kaydet
         save_results_to_json(results)
+        save_failed_urls(retry_queue.failure_report())
+        save_skipped_urls(skipped)
+        if CATALOG_DB:
+            update_catalog(results, CATALOG_DB)
+        if parquet_dir:
+            save_results_to_parquet(results, parquet_dir)
         
         # Excel raporu oluştur
         print("📊 Excel raporu oluşturuluyor...")
-        generate_excel_report(results, "rapor.xlsx")
+        with profile_stage("report"):
+            generate_excel_report(results, "rapor.xlsx")
+        
+        if driver.recycle_count:
+            print(f"♻️ Tarayıcı {driver.recycle_count} kez yenilendi (metrikler: {DRIVER_METRICS_FILE})")
         
         print("\n🎉 İşlem tamamlandı!")
         print("📁 Çıktı dosyaları:")
@@ -513,9 +1144,13 @@ def main():
         print(f"\n❌ Genel hata: {e}")
         
     finally:
+        if producer is not None:
+            producer.stop()
         if driver:
             print("🔚 Tarayıcı kapatılıyor...")
             driver.quit()
+        if archive is not None:
+            archive.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snapshot Diff - Çalışmalar Arası Değişiklik Tespiti
+===================================================
+
+İki scraped_products.json (veya .jsonl) snapshot'ını karşılaştırır:
+yeni/kaldırılan ürünler, değişen alanlar, yeni eksik ölçüler ve yeni mockuplar.
+
+Ürünler Trendyol içerik ID'si (-p-<id>) veya kanonik URL ile eşleştirilir.
+Eski snapshot'tan sadece ürün anahtarı -> alan hash'leri indeksi tutulur,
+yeni snapshot akış halinde okunup bu indeks ile hash-join yapılır. Böylece
+bellek kullanımı ürün kayıtlarının tamamına değil, indeks boyutuna bağlıdır.
+
+KULLANIM:
+from snapshot_diff import diff_snapshot_files
+
+summary = diff_snapshot_files("dun.json", "bugun.json",
+                              changelog="degisiklikler.jsonl",
+                              excel="degisiklikler.xlsx")
+"""
+
+import re
+import json
+from collections import Counter
+
+try:
+    from .url_utils import product_key
+except ImportError:
+    from url_utils import product_key
+
+# Karşılaştırılan alanlar
+DIFF_FIELDS = [
+    "title", "sku", "images", "variations",
+    "mockup_images", "missing_sizes", "image_count"
+]
+
+# Sırası anlamsız olan liste alanları (küme olarak karşılaştırılır)
+# images sıralı karşılaştırılır: ilk görsel ürünün kapak görselidir
+_SET_FIELDS = {"variations", "mockup_images", "missing_sizes"}
+
+# Değişiklik sayfası kolonları
+CHANGE_COLUMNS = [
+    "Değişiklik", "Ürün Anahtarı", "Ürün Adı", "Ürün URL", "Değişen Alanlar",
+    "Yeni Eksik Ölçüler", "Giderilen Eksik Ölçüler", "Yeni Mockuplar"
+]
+
+# JSON dizisindeki elemanlar arası boşluk ve virgüller
+_SEPARATORS = re.compile(r"[\s,]*")
+
+# Akış okuma parça boyutu (karakter)
+CHUNK_SIZE = 1 << 20
+
+def iter_snapshot(path, chunk_size=CHUNK_SIZE):
+    """
+    Snapshot dosyasındaki ürünleri tek tek okur (tüm dosyayı belleğe almadan)
+    .jsonl dosyalarında her satır bir üründür, diğerlerinde JSON dizisi beklenir
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        decoder = json.JSONDecoder()
+        buffer = f.read(chunk_size)
+        pos = _SEPARATORS.match(buffer).end()
+        if not buffer.startswith("[", pos):
+            raise ValueError(f"JSON dizisi bekleniyordu: {path}")
+        pos += 1
+
+        while True:
+            pos = _SEPARATORS.match(buffer, pos).end()
+            if buffer.startswith("]", pos):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Eleman parçanın sonunda bölünmüş, devamını oku
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield item
+            pos = end
+
+def snapshot_key(item):
+    """
+    Ürünün snapshot'lar arası anahtarını döndürür
+    Trendyol içerik ID'si veya kanonik URL, URL yoksa SKU
+    """
+    url = item.get("url", "")
+    if url:
+        return product_key(url)
+    return f"sku:{item.get('sku', '')}"
+
+def _field_hash(item, field):
+    """
+    Alan içeriğinin hash'i (sadece aynı süreç içinde karşılaştırma için)
+    _SET_FIELDS alanları sıradan bağımsız, diğer liste alanları sıralı hash'lenir
+    """
+    value = item.get(field)
+    if field in _SET_FIELDS:
+        return hash(frozenset(value or ()))
+    if isinstance(value, list):
+        return hash(tuple(value))
+    return hash(value)
+
+def _index_entry(item):
+    """Eski snapshot indeksinde bir ürün için tutulan özet bilgi"""
+    return (
+        tuple(_field_hash(item, field) for field in DIFF_FIELDS),
+        frozenset(item.get("missing_sizes", [])),
+        frozenset(hash(url) for url in item.get("mockup_images", [])),
+        item.get("url", ""),
+        item.get("title", ""),
+    )
+
+def build_snapshot_index(items):
+    """Snapshot'tan {ürün anahtarı: özet} indeksi oluşturur"""
+    index = {}
+    for item in items:
+        index[snapshot_key(item)] = _index_entry(item)
+    return index
+
+def diff_snapshots(old_items, new_items):
+    """
+    İki snapshot'ı karşılaştırır ve değişiklikleri tek tek üretir
+
+    Args:
+        old_items (iterable): Eski snapshot ürünleri
+        new_items (iterable): Yeni snapshot ürünleri
+
+    Yields:
+        dict: {"change": "added" | "removed" | "changed", "key", "url", "title",
+               "changed_fields", "new_missing_sizes", "resolved_missing_sizes",
+               "new_mockups"}
+    """
+    old_index = build_snapshot_index(old_items)
+    seen = set()
+
+    for item in new_items:
+        key = snapshot_key(item)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        change = {
+            "change": None,
+            "key": key,
+            "url": item.get("url", ""),
+            "title": item.get("title", ""),
+            "changed_fields": [],
+            "new_missing_sizes": [],
+            "resolved_missing_sizes": [],
+            "new_mockups": [],
+        }
+
+        old = old_index.pop(key, None)
+        if old is None:
+            change["change"] = "added"
+            change["new_missing_sizes"] = list(item.get("missing_sizes", []))
+            change["new_mockups"] = list(item.get("mockup_images", []))
+            yield change
+            continue
+
+        old_hashes, old_missing, old_mockups, _, _ = old
+        changed_fields = [
+            field for field, old_hash in zip(DIFF_FIELDS, old_hashes)
+            if _field_hash(item, field) != old_hash
+        ]
+        if not changed_fields:
+            continue
+
+        missing = item.get("missing_sizes", [])
+        change["change"] = "changed"
+        change["changed_fields"] = changed_fields
+        change["new_missing_sizes"] = [s for s in missing if s not in old_missing]
+        change["resolved_missing_sizes"] = sorted(old_missing.difference(missing))
+        change["new_mockups"] = [
+            url for url in item.get("mockup_images", []) if hash(url) not in old_mockups
+        ]
+        yield change
+
+    # Yeni snapshot'ta olmayan ürünler kaldırılmıştır
+    for key, (_, _, _, url, title) in old_index.items():
+        yield {
+            "change": "removed",
+            "key": key,
+            "url": url,
+            "title": title,
+            "changed_fields": [],
+            "new_missing_sizes": [],
+            "resolved_missing_sizes": [],
+            "new_mockups": [],
+        }
+
+def diff_snapshot_files(old_path, new_path, changelog="degisiklikler.jsonl", excel=None):
+    """
+    İki snapshot dosyasını karşılaştırır, JSONL değişiklik günlüğü ve
+    isteğe bağlı olarak Excel "Değişiklikler" sayfası yazar
+
+    Returns:
+        Counter: Değişiklik türüne göre sayılar
+    """
+    print(f"🔍 Snapshot karşılaştırılıyor: {old_path} -> {new_path}")
+
+    workbook = sheet = None
+    if excel:
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Değişiklikler")
+        sheet.append(CHANGE_COLUMNS)
+
+    summary = Counter()
+    with open(changelog, 'w', encoding='utf-8') as log:
+        for change in diff_snapshots(iter_snapshot(old_path), iter_snapshot(new_path)):
+            summary[change["change"]] += 1
+            log.write(json.dumps(change, ensure_ascii=False) + "\n")
+            if sheet is not None:
+                sheet.append([
+                    change["change"],
+                    change["key"],
+                    change["title"],
+                    change["url"],
+                    ", ".join(change["changed_fields"]),
+                    ", ".join(change["new_missing_sizes"]),
+                    ", ".join(change["resolved_missing_sizes"]),
+                    len(change["new_mockups"]),
+                ])
+
+    print(f"💾 Değişiklik günlüğü kaydedildi: {changelog}")
+    if workbook is not None:
+        workbook.save(excel)
+        print(f"💾 Değişiklik raporu kaydedildi: {excel}")
+
+    print(f"📊 Yeni: {summary['added']}, Kaldırılan: {summary['removed']}, "
+          f"Değişen: {summary['changed']}")
+    return summary
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+URL Utils - Ürün URL Normalizasyonu ve Tekrar Önleme
+====================================================
+
+Satıcı sayfalarından toplanan linkler boutiqueId / merchantId gibi sorgu
+parametreleri ve izleme fragment'ları içerir; aynı ürün farklı URL'lerle
+birden fazla kez görünebilir. Bu modül ürün URL'lerini kanonik hale getirir
+ve Trendyol ürün içerik ID'sini (-p-<id>) anahtar olarak kullanır.
+
+KULLANIM:
+from url_utils import canonicalize_product_url, product_key, DedupIndex
+
+canonicalize_product_url("/marka/urun-p-123?boutiqueId=61#yorum")
+# "https://www.trendyol.com/marka/urun-p-123"
+product_key("https://www.trendyol.com/marka/urun-p-123?merchantId=9")
+# "ty:123"
+
+Aynı ürün görseli CDN'de farklı boyut/kalite yollarıyla (küçük resim, liste,
+zoom) birden fazla kez görünür. image_asset_key() bu yol parçalarını yok
+sayarak görseli tek bir varlık anahtarına indirger; collapse_image_variants()
+her varlık için en yüksek çözünürlüklü URL'yi tutar.
+
+image_asset_key("https://cdn.dsmcdn.com/mnresize/128/192/ty1/prod/1_org_zoom.jpg")
+# "cdn.dsmcdn.com/ty1/prod/1.jpg"
+"""
+
+import re
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Göreli linkler için taban adres
+BASE_URL = "https://www.trendyol.com"
+
+# Kanonik URL'de korunacak sorgu parametreleri (diğerleri atılır)
+KEEP_QUERY_PARAMS = set()
+
+# Trendyol ürün içerik ID'si: ".../urun-adi-p-123456"
+_CONTENT_ID = re.compile(r"-p-(\d+)(?:[/?#]|$)")
+
+# CDN görsel yolundaki boyut/kalite parçaları: /mnresize/1200/1800/, /mrsresize/400/-/,
+# /resize/600/0/, /q_80/, /w_500/, /h_700/
+_IMAGE_RESIZE_SEGMENT = re.compile(
+    r"/(?:mn|mrs)?resize/(?P<w>\d+|-)/(?P<h>\d+|-)(?=/)"
+    r"|/(?P<kind>q|w|h)_(?P<value>\d+)(?=/)",
+    re.IGNORECASE
+)
+
+# Sorgu dizesindeki boyut/kalite parametreleri: x.jpg?w=100&h=150, ?width=400, ?q=70
+_IMAGE_SIZE_PARAMS = {"w": "w", "width": "w", "h": "h", "height": "h"}
+_IMAGE_QUALITY_PARAMS = {"q", "quality"}
+
+# Dosya adındaki boyut varyantı sonekleri: 1_org_zoom.jpg, 1_org.jpg, 1_thumb.jpg
+_IMAGE_VARIANT_SUFFIX = re.compile(
+    r"(?:_org)?(?:_(?P<variant>zoom|large|medium|small|thumb|mini))?(?=\.[a-z0-9]+$)",
+    re.IGNORECASE
+)
+
+# Dosya adı soneklerinin göreli büyüklüğü (boyut bilgisi olmadığında sıralama için)
+_VARIANT_RANK = {"zoom": 5, "large": 4, None: 3, "medium": 2, "small": 1, "thumb": 0, "mini": 0}
+
+def extract_content_id(url):
+    """URL'den Trendyol ürün içerik ID'sini çıkarır, yoksa None"""
+    if not url:
+        return None
+    match = _CONTENT_ID.search(url)
+    return match.group(1) if match else None
+
+def is_product_url(url):
+    """URL ürün sayfası gibi görünüyorsa True"""
+    return bool(url) and ("/p/" in url or extract_content_id(url) is not None)
+
+def canonicalize_product_url(url, base_url=BASE_URL):
+    """
+    Ürün URL'sini kanonik hale getirir
+    - Göreli linkler taban adrese bağlanır, şema https yapılır
+    - Host küçük harfe çevrilir, trendyol.com -> www.trendyol.com
+    - Fragment ve KEEP_QUERY_PARAMS dışındaki sorgu parametreleri atılır
+    - Sondaki '/' kaldırılır
+    """
+    if not url:
+        return ""
+
+    url = url.strip()
+    if url.startswith("//"):
+        url = "https:" + url
+    elif url.startswith("/"):
+        url = base_url.rstrip("/") + url
+
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host == "trendyol.com":
+        host = "www.trendyol.com"
+
+    query = ""
+    if KEEP_QUERY_PARAMS and parts.query:
+        kept = [(k, v) for k, v in parse_qsl(parts.query) if k in KEEP_QUERY_PARAMS]
+        query = urlencode(sorted(kept))
+
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, query, ""))
+
+def product_key(url):
+    """
+    Ürünün çalışmalar arası tekil anahtarı
+    İçerik ID'si varsa "ty:<id>", yoksa kanonik URL
+    """
+    content_id = extract_content_id(url)
+    if content_id is not None:
+        return f"ty:{content_id}"
+    return canonicalize_product_url(url)
+
+class DedupIndex:
+    """
+    Link toplama, ürün işleme ve raporlama tarafından paylaşılan tekrar indeksi
+    Bir ürün keşifte birden fazla kez görünse de çalışmada sadece bir kez işlenir
+    Thread-safe: boru hattında link üreticisi add(), ürün işleyici claim() çağırır
+    """
+
+    def __init__(self):
+        self._discovered = {}   # anahtar -> kanonik URL
+        self._fetched = set()   # işlenmek üzere alınmış anahtarlar
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._discovered)
+
+    def __contains__(self, url):
+        key = product_key(url)
+        with self._lock:
+            return key in self._discovered
+
+    def add(self, url):
+        """
+        Keşfedilen linki ekler
+
+        Returns:
+            str: Yeni ürünse kanonik URL, daha önce görüldüyse None
+        """
+        key = product_key(url)
+        canonical = canonicalize_product_url(url)
+        with self._lock:
+            if key in self._discovered:
+                return None
+            self._discovered[key] = canonical
+        return canonical
+
+    def claim(self, url):
+        """
+        Ürünü işlemek için sahiplenir
+
+        Returns:
+            bool: Bu çalışmada ilk kez işlenecekse True
+        """
+        key = product_key(url)
+        canonical = canonicalize_product_url(url)
+        with self._lock:
+            if key in self._fetched:
+                return False
+            self._fetched.add(key)
+            self._discovered.setdefault(key, canonical)
+        return True
+
+def _split_image_url(url):
+    """Görsel URL'sini (host, yol) çiftine ayırır; şema, sorgu ve fragment atılır"""
+    parts = urlsplit(url.strip())
+    return parts.netloc.lower(), parts.path
+
+def _image_query_size(url):
+    """
+    Sorgu dizesindeki boyut/kalite parametreleri
+    Returns:
+        tuple: ({"w": int, "h": int} (verilenler), kalite veya None)
+    """
+    sides = {}
+    quality = None
+    for name, value in parse_qsl(urlsplit(url.strip()).query):
+        name = name.lower()
+        if not value.isdigit():
+            continue
+        if name in _IMAGE_SIZE_PARAMS:
+            sides[_IMAGE_SIZE_PARAMS[name]] = int(value)
+        elif name in _IMAGE_QUALITY_PARAMS:
+            quality = int(value)
+    return sides, quality
+
+def image_asset_key(url):
+    """
+    Görselin boyut/kalite varyantlarından bağımsız varlık anahtarı
+    Boyut ve kalite yol parçaları, dosya adındaki _org/_zoom/_thumb gibi
+    sonekler, şema ve sorgu parametreleri yok sayılır
+    """
+    if not url:
+        return ""
+    host, path = _split_image_url(url)
+    path = _IMAGE_RESIZE_SEGMENT.sub("", path)
+    path = _IMAGE_VARIANT_SUFFIX.sub("", path, count=1)
+    return f"{host}{path}"
+
+def image_resolution_rank(url):
+    """
+    Aynı varlığın varyantlarını karşılaştırmak için çözünürlük sırası
+    Boyut parçası veya boyut parametresi (?w=, ?h=, ?width=) olmayan
+    (orijinal) URL en yüksek sıradadır; sonra piksel sayısı, dosya adı
+    soneki ve kalite değeri karşılaştırılır
+    """
+    _, path = _split_image_url(url)
+    resized = False
+    pixels = 0
+    quality = 100
+    query_sides, query_quality = _image_query_size(url)
+    if query_quality is not None:
+        quality = query_quality
+    if query_sides:
+        resized = True
+        # Tek kenar verildiyse diğeri orantılı ölçeklenir, kare kabul edilir
+        sides = list(query_sides.values())
+        pixels = sides[0] * sides[-1]
+    for match in _IMAGE_RESIZE_SEGMENT.finditer(path):
+        kind = (match.group("kind") or "").lower()
+        if kind == "q":
+            quality = int(match.group("value"))
+            continue
+        resized = True
+        if kind:
+            pixels = (pixels or 1) * int(match.group("value"))
+        else:
+            sides = [int(v) for v in (match.group("w"), match.group("h")) if v != "-"]
+            # Tek kenar verildiyse diğeri orantılı ölçeklenir, kare kabul edilir
+            pixels = sides[0] * sides[-1] if sides else 0
+
+    suffix = _IMAGE_VARIANT_SUFFIX.search(path)
+    variant = suffix.group("variant") if suffix else None
+    variant_rank = _VARIANT_RANK.get(variant.lower() if variant else None, 3)
+    return (not resized, pixels, variant_rank, quality)
+
+def collapse_image_variants(urls):
+    """
+    Aynı görselin boyut varyantlarını tek varlığa indirger
+    Her varlık için en yüksek çözünürlüklü URL tutulur, sıra ilk görülme sırasıdır
+    """
+    best = {}
+    for url in urls:
+        key = image_asset_key(url)
+        current = best.get(key)
+        if current is None or image_resolution_rank(url) > image_resolution_rank(current):
+            best[key] = url
+    return list(best.values())
+
+def dedupe_results(results):
+    """Aynı ürün anahtarına sahip sonuçlardan sadece ilkini tutar"""
+    seen = set()
+    unique = []
+    for item in results:
+        key = product_key(item.get("url", ""))
+        if key and key in seen:
+            continue
+        seen.add(key)
+        unique.append(item)
+    return unique
+
+# ============================================================================
+# TEST
+# ============================================================================
+
+def test_dedup_index():
+    """Eşzamanlı add()/claim() altında her ürünün bir kez işlendiğini test eder"""
+    print("🧪 DedupIndex testleri:")
+    urls = [f"https://www.trendyol.com/marka/urun-p-{i}?boutiqueId={i % 3}" for i in range(2000)]
+    index = DedupIndex()
+    added = []
+    claimed = []
+
+    def producer():
+        for url in urls + urls:
+            if index.add(url):
+                added.append(url)
+
+    def consumer(out):
+        for url in urls:
+            if index.claim(url):
+                out.append(url)
+
+    outputs = [[] for _ in range(3)]
+    threads = [threading.Thread(target=producer)]
+    threads += [threading.Thread(target=consumer, args=(out,)) for out in outputs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for out in outputs:
+        claimed.extend(out)
+
+    test_cases = [
+        ("her ürün bir kez sahiplenilir", sorted(claimed) == sorted(urls), True),
+        ("indeks boyutu", len(index), len(urls)),
+        ("add aynı ürünü bir kez döndürür", len(added) == len(set(added)), True),
+        ("__contains__ (farklı parametre)", "https://www.trendyol.com/marka/urun-p-5?merchantId=1" in index, True),
+    ]
+    for name, result, expected in test_cases:
+        status = "✅" if result == expected else "❌"
+        print(f"{status} {name}: {result!r} (beklenen: {expected!r})")
+
+def test_image_variants():
+    """Sorgu parametreli boyut varyantlarının orijinalin altında sıralandığını test eder"""
+    print("\n🧪 Görsel varyant testleri:")
+    base = "https://cdn.dsmcdn.com/ty1/prod/1.jpg"
+    test_cases = [
+        ("sorgu parametresi aynı varlık", image_asset_key(base + "?w=100") == image_asset_key(base), True),
+        ("?w= orijinalin altında", image_resolution_rank(base + "?w=100") < image_resolution_rank(base), True),
+        ("?width= orijinalin altında", image_resolution_rank(base + "?width=800") < image_resolution_rank(base), True),
+        ("büyük ?w= küçük ?w= üstünde",
+         image_resolution_rank(base + "?w=800") > image_resolution_rank(base + "?w=100"), True),
+        ("boyutsuz parametre orijinal sayılır", image_resolution_rank(base + "?v=2") == image_resolution_rank(base), True),
+        ("orijinal tutulur", collapse_image_variants([base + "?w=100", base, base + "?h=300"]), [base]),
+    ]
+    for name, result, expected in test_cases:
+        status = "✅" if result == expected else "❌"
+        print(f"{status} {name}: {result!r} (beklenen: {expected!r})")
+
+if __name__ == "__main__":
+    test_dedup_index()
+    test_image_variants()
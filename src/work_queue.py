@@ -0,0 +1,1000 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Work Queue - Paylaşımlı Tarama Kuyruğu (Lease / Ack)
+====================================================
+
+Birden fazla worker'ın (farklı süreçler veya makineler) tek bir taramayı
+iş tekrarı olmadan bölüşmesi için paylaşımlı iş kuyruğu. Satıcı listeleme
+ve ürün URL'leri iş olarak tutulur:
+
+- lease: Worker bir işi belirli bir süre (visibility timeout) için sahiplenir
+- ack: İş bitince sonuç yazılır ve iş tamamlandı olarak işaretlenir
+- fail: Hata nedeni kaydedilir, iş backoff süresi sonunda tekrar verilir
+- Süresi dolan lease'ler (çöken worker) başarısız deneme sayılır ve
+  fail() ile aynı backoff / vazgeçme kuralıyla kuyruğa döner (worker'ı
+  düşüren bir iş sonsuza kadar tekrar verilmez)
+- LeaseKeeper iş sürerken lease'i düzenli olarak uzatır
+- Aynı iş (ürün içerik ID'si) iki kez eklenmez, sonuç yazımı idempotenttir
+  (ilk yazılan sonuç kalır)
+
+İki arka uç vardır:
+- SQLiteWorkQueue: Tek makinede birden fazla süreç için (dosya tabanlı)
+- RedisWorkQueue: Birden fazla makine için Redis uyumlu sunucu
+  (testlerde LocalRedis ile değiştirilebilir)
+
+KULLANIM:
+from work_queue import open_work_queue
+
+queue = open_work_queue("tarama.db")        # veya "redis://sunucu:6379/0"
+queue.enqueue("listing", "https://www.trendyol.com/magaza/xxxx")
+lease = queue.lease("worker-1")
+queue.ack(lease, result={"url": lease.url})
+"""
+
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from collections import namedtuple
+
+try:
+    from .retry_queue import backoff_delay
+    from .url_utils import product_key
+except ImportError:
+    from retry_queue import backoff_delay
+    from url_utils import product_key
+
+# İş türleri (lease sırasında bu sırayla denenir)
+JOB_KINDS = ("listing", "product")
+
+# Varsayılan ayarlar
+DEFAULT_LEASE_SECONDS = 300.0   # Visibility timeout (saniye)
+DEFAULT_MAX_ATTEMPTS = 3        # Bir iş için maksimum deneme
+DEFAULT_NAMESPACE = "trendyol"  # Redis anahtar öneki
+ENQUEUE_BATCH_SIZE = 500        # Redis'te tek betik çağrısında eklenen iş sayısı
+
+# Lease süresi dolan işler için kaydedilen hata nedeni
+LEASE_EXPIRED_REASON = "lease expired"
+
+# Worker'a verilen iş
+Lease = namedtuple("Lease", ["job_id", "kind", "url", "token", "attempts"])
+
+def job_id(kind, url):
+    """
+    İşin kuyruk genelinde tekil anahtarı
+    Ürünlerde içerik ID'si kullanılır, böylece aynı ürün farklı URL'lerle
+    iki kez eklenmez
+    """
+    if kind == "product":
+        return f"product:{product_key(url)}"
+    return f"{kind}:{url.strip()}"
+
+class SQLiteWorkQueue:
+    """
+    SQLite tabanlı iş kuyruğu
+    Aynı dosyayı kullanan süreçler arasında lease işlemleri
+    BEGIN IMMEDIATE ile atomiktir
+    """
+
+    def __init__(self, path, max_attempts=DEFAULT_MAX_ATTEMPTS, clock=time.time):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                available_at REAL NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_token TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (kind, status, available_at);
+            CREATE INDEX IF NOT EXISTS jobs_lease ON jobs (status, lease_expires);
+            CREATE TABLE IF NOT EXISTS results (
+                id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                worker TEXT,
+                written_at REAL
+            );
+        """)
+        self._lock = threading.Lock()
+
+    def _transaction(self, func, *args):
+        """Fonksiyonu yazma kilidi alınmış bir transaction içinde çalıştırır"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = func(*args)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return value
+
+    def enqueue(self, kind, url):
+        """
+        İşi kuyruğa ekler
+
+        Returns:
+            bool: Yeni eklendiyse True, zaten varsa False
+        """
+        return self.enqueue_many(kind, [url]) == 1
+
+    def enqueue_many(self, kind, urls):
+        """Birden fazla işi ekler, yeni eklenen iş sayısını döndürür"""
+        rows = [(job_id(kind, url), kind, url) for url in urls]
+
+        def insert():
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (id, kind, url) VALUES (?, ?, ?)", rows
+            )
+            return self._conn.total_changes - before
+
+        return self._transaction(insert)
+
+    def lease(self, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS, kinds=JOB_KINDS):
+        """
+        Hazır ilk işi sahiplenir
+        Süresi dolmuş lease'ler önce başarısız deneme olarak kaydedilir
+
+        Returns:
+            Lease: Verilen iş, hazır iş yoksa None
+        """
+        def claim():
+            now = self._clock()
+            self._expire_leases(now)
+            for kind in kinds:
+                row = self._conn.execute(
+                    "SELECT id, url, attempts FROM jobs WHERE kind = ? AND "
+                    "status = 'pending' AND available_at <= ? "
+                    "ORDER BY available_at LIMIT 1",
+                    (kind, now)
+                ).fetchone()
+                if row is None:
+                    continue
+                token = uuid.uuid4().hex
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_token = ?, "
+                    "lease_expires = ? WHERE id = ?",
+                    (worker_id, token, now + lease_seconds, row[0])
+                )
+                return Lease(row[0], kind, row[1], token, row[2])
+            return None
+
+        return self._transaction(claim)
+
+    def _expire_leases(self, now):
+        """Süresi dolan lease'leri başarısız deneme sayar (transaction içinde çağrılır)"""
+        expired = self._conn.execute(
+            "SELECT id, attempts FROM jobs WHERE status = 'leased' AND lease_expires <= ?", (now,)
+        ).fetchall()
+        for jid, attempts in expired:
+            self._record_failure(jid, attempts + 1, LEASE_EXPIRED_REASON, now)
+
+    def _record_failure(self, jid, attempts, reason, now):
+        """
+        Başarısız denemeyi yazar: hakkı kaldıysa backoff sonrası tekrar
+        verilir, max_attempts'a ulaştıysa vazgeçilir
+
+        Returns:
+            float: Bekleme süresi, vazgeçildiyse None
+        """
+        if attempts >= self.max_attempts:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', attempts = ?, last_error = ?, "
+                "lease_token = NULL, lease_expires = NULL WHERE id = ?",
+                (attempts, reason, jid)
+            )
+            return None
+        delay = backoff_delay(attempts)
+        self._conn.execute(
+            "UPDATE jobs SET status = 'pending', attempts = ?, last_error = ?, "
+            "available_at = ?, lease_token = NULL, lease_expires = NULL WHERE id = ?",
+            (attempts, reason, now + delay, jid)
+        )
+        return delay
+
+    def _owns(self, lease):
+        row = self._conn.execute(
+            "SELECT lease_token FROM jobs WHERE id = ? AND status = 'leased'", (lease.job_id,)
+        ).fetchone()
+        return row is not None and row[0] == lease.token
+
+    def extend(self, lease, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Lease süresini uzatır (uzun işler için), lease kaybedildiyse False"""
+        def renew():
+            if not self._owns(lease):
+                return False
+            self._conn.execute("UPDATE jobs SET lease_expires = ? WHERE id = ?",
+                               (self._clock() + lease_seconds, lease.job_id))
+            return True
+
+        return self._transaction(renew)
+
+    def ack(self, lease, result=None, worker_id=None):
+        """
+        İşi tamamlandı olarak işaretler, varsa sonucu yazar
+        Sonuç yazımı idempotenttir: aynı iş için ilk yazılan sonuç kalır
+
+        Returns:
+            bool: Lease hâlâ bu worker'daysa True (süresi dolup başkasına
+            geçtiyse False; sonuç yine de yazılır)
+        """
+        def complete():
+            if result is not None:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO results (id, data, worker, written_at) VALUES (?, ?, ?, ?)",
+                    (lease.job_id, json.dumps(result, ensure_ascii=False), worker_id, self._clock())
+                )
+            if not self._owns(lease):
+                return False
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', lease_token = NULL, lease_expires = NULL "
+                "WHERE id = ?", (lease.job_id,)
+            )
+            return True
+
+        return self._transaction(complete)
+
+    def fail(self, lease, reason):
+        """
+        Başarısız denemeyi kaydeder; hakkı kaldıysa iş backoff sonrası tekrar verilir
+
+        Returns:
+            float: Tekrar denemeye kadar bekleme süresi, vazgeçildiyse veya
+            lease kaybedildiyse None
+        """
+        def record():
+            if not self._owns(lease):
+                return None
+            return self._record_failure(lease.job_id, lease.attempts + 1, reason, self._clock())
+
+        return self._transaction(record)
+
+    def release(self, lease):
+        """İşi deneme sayılmadan hemen kuyruğa geri bırakır (örn. worker durdurulurken)"""
+        def give_back():
+            if self._owns(lease):
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'pending', lease_token = NULL, lease_expires = NULL "
+                    "WHERE id = ?", (lease.job_id,)
+                )
+
+        self._transaction(give_back)
+
+    def stats(self):
+        """
+        Durum bazında iş sayıları
+
+        Returns:
+            dict: {"pending", "leased", "done", "failed"}
+        """
+        counts = dict.fromkeys(("pending", "leased", "done", "failed"), 0)
+        with self._lock:
+            for status, count in self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ):
+                counts[status] = count
+        return counts
+
+    def unfinished(self):
+        """Bekleyen veya lease'te olan iş sayısı"""
+        counts = self.stats()
+        return counts["pending"] + counts["leased"]
+
+    def results(self):
+        """Yazılmış sonuçları sırayla döndürür (generator)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM results ORDER BY written_at").fetchall()
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def failures(self):
+        """Vazgeçilen işler: [{"url", "attempts", "reasons", "status"}]"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, attempts, last_error FROM jobs WHERE status = 'failed'"
+            ).fetchall()
+        return [{"url": url, "attempts": attempts, "reasons": [error], "status": "failed"}
+                for url, attempts, error in rows]
+
+    def close(self):
+        self._conn.close()
+
+# Redis tarafında atomik çalışan işlemler (Lua). Her betik tek komut gibi
+# çalışır; worker iki adım arasında ölürse iş ne bekleyen listeden ne de
+# lease kümesinden düşebilir. LocalRedis aynı işlemleri Python'da uygular.
+# Betiklerin dokunduğu tüm anahtarlar KEYS ile verilir (Redis Cluster).
+_ENQUEUE_SCRIPT = """
+local added = 0
+for i = 1, #ARGV, 2 do
+    if redis.call('HSETNX', KEYS[1], ARGV[i], ARGV[i + 1]) == 1 then
+        redis.call('RPUSH', KEYS[2], ARGV[i])
+        added = added + 1
+    end
+end
+return added
+"""
+
+_LEASE_SCRIPT = """
+local jid = redis.call('LPOP', KEYS[1])
+while jid and redis.call('SISMEMBER', KEYS[2], jid) == 1 do
+    jid = redis.call('LPOP', KEYS[1])
+end
+if not jid then
+    return false
+end
+redis.call('HSET', KEYS[3], jid, ARGV[1])
+redis.call('ZADD', KEYS[4], ARGV[2], jid)
+return jid
+"""
+
+_REQUEUE_SCRIPT = """
+local pending = {}
+for i = 2, #ARGV do
+    pending[ARGV[i]] = KEYS[i + 2]
+end
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+for _, jid in ipairs(due) do
+    redis.call('ZREM', KEYS[1], jid)
+    redis.call('HDEL', KEYS[2], jid)
+    local job = redis.call('HGET', KEYS[3], jid)
+    local key = job and pending[cjson.decode(job)['kind']]
+    if key then
+        redis.call('RPUSH', key, jid)
+    end
+end
+return #due
+"""
+
+_EXPIRE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+for _, jid in ipairs(due) do
+    redis.call('ZREM', KEYS[1], jid)
+    redis.call('HDEL', KEYS[2], jid)
+    local attempts = redis.call('HINCRBY', KEYS[3], jid, 1)
+    redis.call('HSET', KEYS[4], jid, ARGV[3])
+    if attempts >= tonumber(ARGV[2]) then
+        redis.call('SADD', KEYS[5], jid)
+    else
+        redis.call('ZADD', KEYS[6], tonumber(ARGV[1]) + tonumber(ARGV[3 + attempts]), jid)
+    end
+end
+return #due
+"""
+
+_EXTEND_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+return 1
+"""
+
+_ACK_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[1], ARGV[1])
+redis.call('SADD', KEYS[3], ARGV[1])
+return 1
+"""
+
+_FAIL_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[1], ARGV[1])
+local attempts = redis.call('HINCRBY', KEYS[3], ARGV[1], 1)
+redis.call('HSET', KEYS[4], ARGV[1], ARGV[3])
+if attempts >= tonumber(ARGV[4]) then
+    redis.call('SADD', KEYS[5], ARGV[1])
+    return -1
+end
+redis.call('ZADD', KEYS[6], ARGV[5], ARGV[1])
+return attempts
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[1], ARGV[1])
+redis.call('LPUSH', KEYS[3], ARGV[1])
+return 1
+"""
+
+class RedisWorkQueue:
+    """
+    Redis uyumlu sunucu üzerinde iş kuyruğu (birden fazla makine için)
+
+    Anahtarlar (<ns> = namespace):
+        <ns>:jobs          hash   iş id -> {"kind", "url"}
+        <ns>:pending:<tür> list   hazır işler
+        <ns>:delayed       zset   backoff bekleyen işler (skor: hazır olma zamanı)
+        <ns>:leases        zset   lease'teki işler (skor: lease bitişi)
+        <ns>:tokens        hash   iş id -> lease token
+        <ns>:attempts      hash   iş id -> başarısız deneme sayısı
+        <ns>:errors        hash   iş id -> son hata nedeni
+        <ns>:done / :failed set   tamamlanan / vazgeçilen işler
+        <ns>:results       hash   iş id -> sonuç JSON (HSETNX ile idempotent)
+
+    Durum değiştiren işlemler (ekleme, lease, ack, fail, release, extend ve
+    süresi dolan işlerin geri alınması) Lua betikleriyle atomik çalışır.
+    Redis Cluster'da betiğin anahtarları aynı slot'ta olmalıdır; namespace
+    hash tag ile verilir, örn. "{trendyol}".
+    """
+
+    def __init__(self, client, namespace=DEFAULT_NAMESPACE, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 clock=time.time):
+        self._r = client
+        self._ns = namespace
+        self.max_attempts = max_attempts
+        self._clock = clock
+
+    def _key(self, name):
+        return f"{self._ns}:{name}"
+
+    def enqueue(self, kind, url):
+        """İşi kuyruğa ekler; zaten varsa False"""
+        return self.enqueue_many(kind, [url]) == 1
+
+    def enqueue_many(self, kind, urls):
+        """
+        Birden fazla işi ekler, yeni eklenen iş sayısını döndürür
+        İşler ENQUEUE_BATCH_SIZE'lık gruplar halinde tek betik çağrısıyla eklenir
+        """
+        args = []
+        for url in urls:
+            args.extend((job_id(kind, url), json.dumps({"kind": kind, "url": url})))
+        added = 0
+        step = 2 * ENQUEUE_BATCH_SIZE
+        for start in range(0, len(args), step):
+            added += int(self._eval(_ENQUEUE_SCRIPT,
+                                    [self._key("jobs"), self._key(f"pending:{kind}")],
+                                    args[start:start + step]))
+        return added
+
+    def _job(self, jid):
+        data = self._r.hget(self._key("jobs"), jid)
+        return json.loads(data) if data else None
+
+    def _eval(self, script, keys, args):
+        return self._r.eval(script, len(keys), *keys, *args)
+
+    def _requeue_due(self, now):
+        """
+        Lease'i biten işleri başarısız deneme olarak backoff'a (veya
+        vazgeçilenlere) alır, backoff süresi dolan işleri hazır kuyruğuna taşır
+        """
+        # Deneme sayısına göre bekleme süreleri (jitter Python'da hesaplanır)
+        delays = [backoff_delay(attempt) for attempt in range(1, self.max_attempts + 1)]
+        self._eval(_EXPIRE_SCRIPT,
+                   [self._key("leases"), self._key("tokens"), self._key("attempts"),
+                    self._key("errors"), self._key("failed"), self._key("delayed")],
+                   [now, self.max_attempts, LEASE_EXPIRED_REASON, *delays])
+        pending = [self._key(f"pending:{kind}") for kind in JOB_KINDS]
+        self._eval(_REQUEUE_SCRIPT,
+                   [self._key("delayed"), self._key("tokens"), self._key("jobs")] + pending,
+                   [now, *JOB_KINDS])
+
+    def lease(self, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS, kinds=JOB_KINDS):
+        """Hazır ilk işi sahiplenir, yoksa None"""
+        now = self._clock()
+        self._requeue_due(now)
+        for kind in kinds:
+            token = uuid.uuid4().hex
+            jid = self._eval(_LEASE_SCRIPT,
+                             [self._key(f"pending:{kind}"), self._key("done"),
+                              self._key("tokens"), self._key("leases")],
+                             [token, now + lease_seconds])
+            if not jid:
+                continue
+            job = self._job(jid) or {"url": ""}
+            attempts = int(self._r.hget(self._key("attempts"), jid) or 0)
+            return Lease(jid, kind, job["url"], token, attempts)
+        return None
+
+    def extend(self, lease, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Lease süresini uzatır, lease kaybedildiyse False"""
+        return bool(self._eval(_EXTEND_SCRIPT,
+                               [self._key("tokens"), self._key("leases")],
+                               [lease.job_id, lease.token, self._clock() + lease_seconds]))
+
+    def ack(self, lease, result=None, worker_id=None):
+        """İşi tamamlar; sonuç yazımı idempotenttir (HSETNX)"""
+        if result is not None:
+            self._r.hsetnx(self._key("results"), lease.job_id,
+                           json.dumps(result, ensure_ascii=False))
+        return bool(self._eval(_ACK_SCRIPT,
+                               [self._key("tokens"), self._key("leases"), self._key("done")],
+                               [lease.job_id, lease.token]))
+
+    def fail(self, lease, reason):
+        """Başarısız denemeyi kaydeder, bekleme süresini veya None döndürür"""
+        delay = backoff_delay(lease.attempts + 1)
+        attempts = self._eval(_FAIL_SCRIPT,
+                              [self._key("tokens"), self._key("leases"), self._key("attempts"),
+                               self._key("errors"), self._key("failed"), self._key("delayed")],
+                              [lease.job_id, lease.token, reason, self.max_attempts,
+                               self._clock() + delay])
+        if int(attempts) <= 0:
+            return None
+        return delay
+
+    def release(self, lease):
+        """İşi deneme sayılmadan kuyruğa geri bırakır"""
+        self._eval(_RELEASE_SCRIPT,
+                   [self._key("tokens"), self._key("leases"), self._key(f"pending:{lease.kind}")],
+                   [lease.job_id, lease.token])
+
+    def stats(self):
+        """Durum bazında iş sayıları"""
+        pending = sum(self._r.llen(self._key(f"pending:{kind}")) for kind in JOB_KINDS)
+        return {
+            "pending": pending + self._r.zcard(self._key("delayed")),
+            "leased": self._r.zcard(self._key("leases")),
+            "done": self._r.scard(self._key("done")),
+            "failed": self._r.scard(self._key("failed")),
+        }
+
+    def unfinished(self):
+        """Bekleyen veya lease'te olan iş sayısı"""
+        counts = self.stats()
+        return counts["pending"] + counts["leased"]
+
+    def results(self):
+        """Yazılmış sonuçları döndürür (generator)"""
+        for data in self._r.hgetall(self._key("results")).values():
+            yield json.loads(data)
+
+    def failures(self):
+        """Vazgeçilen işler: [{"url", "attempts", "reasons", "status"}]"""
+        report = []
+        for jid in self._r.smembers(self._key("failed")):
+            job = self._job(jid) or {"url": jid}
+            report.append({
+                "url": job["url"],
+                "attempts": int(self._r.hget(self._key("attempts"), jid) or 0),
+                "reasons": [self._r.hget(self._key("errors"), jid)],
+                "status": "failed"
+            })
+        return report
+
+    def close(self):
+        close = getattr(self._r, "close", None)
+        if close:
+            close()
+
+class LocalRedis:
+    """
+    RedisWorkQueue'nun kullandığı komutların süreç içi karşılığı
+    Testlerde ve tek süreçli denemelerde Redis sunucusu yerine kullanılır
+    (redis-py'nin decode_responses=True davranışıyla aynı şekilde str döndürür)
+
+    Lua betikleri yorumlanmaz; eval() bilinen betiklerin Python karşılığını
+    kilit altında (atomik) çalıştırır.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.RLock()
+        self._scripts = {
+            _ENQUEUE_SCRIPT: self._enqueue_script,
+            _LEASE_SCRIPT: self._lease_script,
+            _REQUEUE_SCRIPT: self._requeue_script,
+            _EXPIRE_SCRIPT: self._expire_script,
+            _EXTEND_SCRIPT: self._extend_script,
+            _ACK_SCRIPT: self._ack_script,
+            _FAIL_SCRIPT: self._fail_script,
+            _RELEASE_SCRIPT: self._release_script,
+        }
+
+    def eval(self, script, numkeys, *keys_and_args):
+        if script not in self._scripts:
+            raise NotImplementedError("LocalRedis bu Lua betiğini desteklemiyor")
+        keys = list(keys_and_args[:numkeys])
+        args = [str(arg) for arg in keys_and_args[numkeys:]]
+        with self._lock:
+            return self._scripts[script](keys, args)
+
+    def _enqueue_script(self, keys, args):
+        jobs, pending = keys
+        added = 0
+        for jid, job in zip(args[::2], args[1::2]):
+            if self.hsetnx(jobs, jid, job):
+                self.rpush(pending, jid)
+                added += 1
+        return added
+
+    def _lease_script(self, keys, args):
+        pending, done, tokens, leases = keys
+        jid = self.lpop(pending)
+        while jid is not None and self.sismember(done, jid):
+            jid = self.lpop(pending)
+        if jid is None:
+            return None
+        self.hset(tokens, jid, args[0])
+        self.zadd(leases, {jid: args[1]})
+        return jid
+
+    def _requeue_script(self, keys, args):
+        zset, tokens, jobs = keys[:3]
+        pending = dict(zip(args[1:], keys[3:]))
+        due = self.zrangebyscore(zset, "-inf", args[0])
+        for jid in due:
+            self.zrem(zset, jid)
+            self.hdel(tokens, jid)
+            job = self.hget(jobs, jid)
+            key = job and pending.get(json.loads(job)["kind"])
+            if key:
+                self.rpush(key, jid)
+        return len(due)
+
+    def _expire_script(self, keys, args):
+        leases, tokens, attempts_key, errors, failed, delayed = keys
+        now, max_attempts, reason = args[:3]
+        due = self.zrangebyscore(leases, "-inf", now)
+        for jid in due:
+            self.zrem(leases, jid)
+            self.hdel(tokens, jid)
+            attempts = self.hincrby(attempts_key, jid, 1)
+            self.hset(errors, jid, reason)
+            if attempts >= int(max_attempts):
+                self.sadd(failed, jid)
+            else:
+                self.zadd(delayed, {jid: float(now) + float(args[2 + attempts])})
+        return len(due)
+
+    def _extend_script(self, keys, args):
+        tokens, leases = keys
+        if self.hget(tokens, args[0]) != args[1]:
+            return 0
+        self.zadd(leases, {args[0]: args[2]})
+        return 1
+
+    def _ack_script(self, keys, args):
+        tokens, leases, done = keys
+        if self.hget(tokens, args[0]) != args[1]:
+            return 0
+        self.zrem(leases, args[0])
+        self.hdel(tokens, args[0])
+        self.sadd(done, args[0])
+        return 1
+
+    def _fail_script(self, keys, args):
+        tokens, leases, attempts_key, errors, failed, delayed = keys
+        jid, token, reason, max_attempts, ready_at = args
+        if self.hget(tokens, jid) != token:
+            return 0
+        self.zrem(leases, jid)
+        self.hdel(tokens, jid)
+        attempts = self.hincrby(attempts_key, jid, 1)
+        self.hset(errors, jid, reason)
+        if attempts >= int(max_attempts):
+            self.sadd(failed, jid)
+            return -1
+        self.zadd(delayed, {jid: ready_at})
+        return attempts
+
+    def _release_script(self, keys, args):
+        tokens, leases, pending = keys
+        if self.hget(tokens, args[0]) != args[1]:
+            return 0
+        self.zrem(leases, args[0])
+        self.hdel(tokens, args[0])
+        self.lpush(pending, args[0])
+        return 1
+
+    def _get(self, key, factory):
+        return self._data.setdefault(key, factory())
+
+    def hsetnx(self, key, field, value):
+        with self._lock:
+            h = self._get(key, dict)
+            if field in h:
+                return 0
+            h[field] = str(value)
+            return 1
+
+    def hset(self, key, field, value):
+        with self._lock:
+            self._get(key, dict)[field] = str(value)
+            return 1
+
+    def hget(self, key, field):
+        with self._lock:
+            return self._data.get(key, {}).get(field)
+
+    def hdel(self, key, field):
+        with self._lock:
+            return 1 if self._data.get(key, {}).pop(field, None) is not None else 0
+
+    def hincrby(self, key, field, amount=1):
+        with self._lock:
+            h = self._get(key, dict)
+            h[field] = str(int(h.get(field, 0)) + amount)
+            return int(h[field])
+
+    def hgetall(self, key):
+        with self._lock:
+            return dict(self._data.get(key, {}))
+
+    def rpush(self, key, value):
+        with self._lock:
+            items = self._get(key, list)
+            items.append(value)
+            return len(items)
+
+    def lpush(self, key, value):
+        with self._lock:
+            items = self._get(key, list)
+            items.insert(0, value)
+            return len(items)
+
+    def lpop(self, key):
+        with self._lock:
+            items = self._data.get(key)
+            return items.pop(0) if items else None
+
+    def llen(self, key):
+        with self._lock:
+            return len(self._data.get(key, []))
+
+    def zadd(self, key, mapping):
+        with self._lock:
+            z = self._get(key, dict)
+            added = sum(1 for member in mapping if member not in z)
+            z.update({member: float(score) for member, score in mapping.items()})
+            return added
+
+    def zrem(self, key, member):
+        with self._lock:
+            return 1 if self._data.get(key, {}).pop(member, None) is not None else 0
+
+    def zrangebyscore(self, key, low, high):
+        low = float(low)
+        high = float(high)
+        with self._lock:
+            z = self._data.get(key, {})
+            return [m for m, s in sorted(z.items(), key=lambda kv: kv[1]) if low <= s <= high]
+
+    def zcard(self, key):
+        with self._lock:
+            return len(self._data.get(key, {}))
+
+    def sadd(self, key, member):
+        with self._lock:
+            s = self._get(key, set)
+            if member in s:
+                return 0
+            s.add(member)
+            return 1
+
+    def sismember(self, key, member):
+        with self._lock:
+            return member in self._data.get(key, set())
+
+    def smembers(self, key):
+        with self._lock:
+            return set(self._data.get(key, set()))
+
+    def scard(self, key):
+        with self._lock:
+            return len(self._data.get(key, set()))
+
+class LeaseKeeper:
+    """
+    İş sürerken lease'i arka planda düzenli olarak uzatır
+
+    Uzun süren işlerde (ör. çok sayfalı satıcı listeleme) lease'in süresi
+    dolup işin başka bir worker'a verilmesini önler. Lease kaybedilirse
+    (ör. worker uzun süre askıda kaldıysa) `lost` True olur.
+
+    KULLANIM:
+        with LeaseKeeper(queue, lease, lease_seconds) as keeper:
+            ...
+    """
+
+    def __init__(self, queue, lease, lease_seconds=DEFAULT_LEASE_SECONDS, interval=None):
+        self.queue = queue
+        self.lease = lease
+        self.lease_seconds = lease_seconds
+        self.interval = interval if interval is not None else lease_seconds / 3
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.queue.extend(self.lease, self.lease_seconds):
+                    self.lost = True
+                    return
+            except Exception as e:
+                # Geçici bağlantı hatası: bir sonraki turda tekrar denenir
+                print(f"⚠️ Lease uzatılamadı ({e}): {self.lease.url}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="lease-keeper", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+def open_work_queue(spec, namespace=DEFAULT_NAMESPACE, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    Kuyruk adresine göre uygun arka ucu açar
+    - "redis://..." / "rediss://..." -> RedisWorkQueue (pip install redis)
+    - "memory://" -> LocalRedis üzerinde RedisWorkQueue (test için)
+    - diğerleri -> SQLite dosya yolu
+    """
+    if spec.startswith(("redis://", "rediss://")):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("Redis kuyruğu için redis paketi gerekli: pip install redis")
+        client = redis.Redis.from_url(spec, decode_responses=True)
+        return RedisWorkQueue(client, namespace, max_attempts)
+    if spec == "memory://":
+        return RedisWorkQueue(LocalRedis(), namespace, max_attempts)
+    return SQLiteWorkQueue(spec, max_attempts)
+
+# ============================================================================
+# TEST
+# ============================================================================
+
+def _test_backends(clock):
+    """Aynı testlerin çalıştırılacağı arka uçlar: (ad, kuyruk)"""
+    import os
+    import tempfile
+    directory = tempfile.mkdtemp()
+    yield "SQLite", SQLiteWorkQueue(os.path.join(directory, "kuyruk.db"), max_attempts=2, clock=clock)
+    yield "LocalRedis", RedisWorkQueue(LocalRedis(), max_attempts=2, clock=clock)
+
+def test_work_queue():
+    """Lease süresi, idempotent ack, backoff/vazgeçme ve unfinished testleri"""
+    print("🧪 Work queue testleri:")
+    url = "https://www.trendyol.com/marka/urun-p-123"
+    now = [1000.0]
+    clock = lambda: now[0]
+    
+    for name, queue in _test_backends(clock):
+        test_cases = []
+        
+        # Aynı ürün tekrar eklenmez
+        test_cases.append(("tekrar ekleme", (queue.enqueue("product", url),
+                                             queue.enqueue("product", url + "?boutiqueId=1")), (True, False)))
+        test_cases.append(("unfinished (bekleyen)", queue.unfinished(), 1))
+        
+        # Lease süresi dolunca iş başka bir worker'a verilir
+        first = queue.lease("w1", lease_seconds=10)
+        test_cases.append(("lease sürerken iş verilmez", queue.lease("w2", lease_seconds=10), None))
+        test_cases.append(("unfinished (lease'te)", queue.unfinished(), 1))
+        now[0] += 5
+        test_cases.append(("extend (sahibi)", queue.extend(first, 10), True))
+        now[0] += 8
+        test_cases.append(("uzatılan lease korunur", queue.lease("w2", lease_seconds=10), None))
+        now[0] += 3
+        test_cases.append(("süresi dolan lease backoff'a alınır", queue.lease("w2", lease_seconds=10), None))
+        test_cases.append(("extend (kaybedilen lease)", queue.extend(first, 10), False))
+        now[0] += 3600
+        second = queue.lease("w2", lease_seconds=10)
+        test_cases.append(("backoff sonrası tekrar verilir (deneme sayıldı)",
+                           second and (second.url, second.attempts), (url, 1)))
+        
+        # Ack idempotent: ilk sonuç kalır, eski lease ack edemez
+        test_cases.append(("ack (yeni sahip)", queue.ack(second, result={"worker": "w2"}, worker_id="w2"), True))
+        test_cases.append(("ack (eski lease)", queue.ack(first, result={"worker": "w1"}, worker_id="w1"), False))
+        test_cases.append(("ack tekrarı", queue.ack(second, result={"worker": "w2-tekrar"}), False))
+        test_cases.append(("ilk sonuç kalır", [r["worker"] for r in queue.results()], ["w2"]))
+        test_cases.append(("unfinished (tamamlandı)", queue.unfinished(), 0))
+        
+        # Fail: backoff süresince iş verilmez, max_attempts'ta vazgeçilir
+        other = "https://www.trendyol.com/marka/baska-urun-p-456"
+        queue.enqueue("product", other)
+        lease = queue.lease("w1")
+        delay = queue.fail(lease, "timeout")
+        test_cases.append(("fail backoff döndürür", delay is not None and delay > 0, True))
+        test_cases.append(("backoff sırasında iş verilmez", queue.lease("w1"), None))
+        test_cases.append(("unfinished (backoff)", queue.unfinished(), 1))
+        now[0] += delay + 0.01
+        lease = queue.lease("w1")
+        test_cases.append(("backoff sonrası deneme sayısı", lease and lease.attempts, 1))
+        test_cases.append(("son denemede vazgeçilir", queue.fail(lease, "http_500"), None))
+        now[0] += 3600
+        test_cases.append(("vazgeçilen iş verilmez", queue.lease("w1"), None))
+        test_cases.append(("failures", [(f["url"], f["attempts"], f["reasons"]) for f in queue.failures()],
+                           [(other, 2, ["http_500"])]))
+        test_cases.append(("unfinished (bitti)", queue.unfinished(), 0))
+        
+        # Worker'ı düşüren iş: her lease dolması deneme sayılır, sonsuza kadar verilmez
+        crash = "https://www.trendyol.com/marka/coken-urun-p-789"
+        queue.enqueue("product", crash)
+        attempts = []
+        for _ in range(queue.max_attempts + 1):
+            lease = queue.lease("w1", lease_seconds=10)
+            attempts.append(lease and lease.attempts)
+            now[0] += 11
+            queue.lease("w2")  # dolan lease deneme olarak kaydedilir, iş backoff'a girer
+            now[0] += 3600
+        test_cases.append(("dolan lease'ler deneme sayılır", attempts, [0, 1, None]))
+        test_cases.append(("lease dolması ile vazgeçilir",
+                           [(f["attempts"], f["reasons"]) for f in queue.failures() if f["url"] == crash],
+                           [(2, [LEASE_EXPIRED_REASON])]))
+        test_cases.append(("unfinished (lease dolması sonrası)", queue.unfinished(), 0))
+        
+        # Toplu ekleme: tekrarlar ve zaten var olan işler sayılmaz
+        sellers = [f"https://www.trendyol.com/magaza/satici-m-{i}" for i in range(3)]
+        test_cases.append(("toplu ekleme", queue.enqueue_many("listing", sellers + sellers[:1]), 3))
+        test_cases.append(("toplu ekleme tekrarı", queue.enqueue_many("listing", sellers), 0))
+        test_cases.append(("unfinished (toplu)", queue.unfinished(), 3))
+        queue.close()
+        
+        for case, result, expected in test_cases:
+            status = "✅" if result == expected else "❌"
+            print(f"{status} {name} / {case}: {result!r} (beklenen: {expected!r})")
+
+def test_lease_keeper():
+    """LeaseKeeper'ın lease'i uzattığı ve kaybı fark ettiği testler"""
+    print("\n🧪 LeaseKeeper testleri:")
+    now = [0.0]
+    
+    for name, queue in _test_backends(lambda: now[0]):
+        queue.enqueue("listing", "https://www.trendyol.com/magaza/xxxx-m-1")
+        lease = queue.lease("w1", lease_seconds=1)
+        with LeaseKeeper(queue, lease, lease_seconds=1, interval=0.02) as keeper:
+            now[0] += 0.9
+            time.sleep(0.1)
+            now[0] += 0.9
+            renewed = queue.lease("w2", lease_seconds=1)
+            time.sleep(0.1)
+            kept = not keeper.lost
+        # Keeper durunca lease dolar, backoff sonrası başka worker alır; eski keeper kaybı görür
+        now[0] += 2
+        in_backoff = queue.lease("w2", lease_seconds=1)
+        now[0] += 3600
+        taken = queue.lease("w2", lease_seconds=1)
+        with LeaseKeeper(queue, lease, lease_seconds=1, interval=0.02) as keeper:
+            time.sleep(0.1)
+            lost = keeper.lost
+        queue.close()
+        
+        test_cases = [
+            ("uzatılan lease başkasına verilmez", renewed, None),
+            ("lease korunuyor", kept, True),
+            ("dolan lease backoff'a girer", in_backoff, None),
+            ("keeper sonrası lease dolar", taken is not None, True),
+            ("kaybedilen lease fark edilir", lost, True),
+        ]
+        for case, result, expected in test_cases:
+            status = "✅" if result == expected else "❌"
+            print(f"{status} {name} / {case}: {result!r} (beklenen: {expected!r})")
+
+if __name__ == "__main__":
+    test_work_queue()
+    test_lease_keeper()